@@ -104,7 +104,7 @@ class MainWindow(QMainWindow):
         dock.setWidget(bottom)
         self.addDockWidget(Qt.BottomDockWidgetArea, dock)
 
-        # Runner: ejecuta cli.py (primero Python local; si falla, Docker)
+        # Runner: mantiene vivo cli.py --serve (si falla: un proceso por Run; luego Docker)
         self.runner = CliRunner(self)
         self.runner.output.connect(self.append_output)
         self.runner.finished.connect(self.on_run_finished)
@@ -124,10 +124,8 @@ class MainWindow(QMainWindow):
         self.append_output(f"[IDE] defaults: program_dir={defs.get('program_dir')}\n")
         self.append_output(f"[IDE] defaults: python={defs.get('python_path')}\n")
 
-        # Procesos para la generación del AST (DOT -> PNG)
-        self._proc_ast_dump: QProcess | None = None
+        # Proceso de Graphviz para el AST (el DOT llega en el JSON del CLI)
         self._proc_dot: QProcess | None = None
-        self._last_dot: str = ""
 
     def _current_editor(self) -> CodeEditor | None:
         w = self.tabs.currentWidget()
@@ -228,10 +226,8 @@ class MainWindow(QMainWindow):
             self.append_output("[IDE] Run clicked\n")
             self.append_output(f"[IDE] Running on {abs_path}\n")
 
-            # orre el checker CLI
+            # corre el checker CLI (trae también el DOT del AST: un solo proceso por Run)
             self.runner.run_file(abs_path)
-            # AST IMAGEN
-            self.generate_ast_image(abs_path)
         except Exception as e:
             self.append_output(f"[IDE] on_run exception: {e!r}\n")
 
@@ -265,6 +261,9 @@ class MainWindow(QMainWindow):
             if data.get("ok") is False:
                 self.tac.setPlainText("(Sin IR: hay errores en el código)")
 
+        # AST IMAGEN
+        self.show_ast_image(data.get("ast_dot") if isinstance(data, dict) else None)
+
         self.status.showMessage("Run finished", 3000)
 
     # Reporte
@@ -323,46 +322,16 @@ class MainWindow(QMainWindow):
 
         self.pretty.setPlainText("\n".join(lines))
 
-    def generate_ast_image(self, cps_path: str):
-        """Lanza dos procesos: (1) python -m src.tools.ast_dump <file.cps>  (2) dot -Tpng"""
-
-        # Cancelar procesos previos
-        if self._proc_ast_dump:
-            self._proc_ast_dump.kill()
+    def show_ast_image(self, dot_text: str | None):
+        """Renderiza con 'dot -Tpng' el DOT del AST que devolvió el CLI."""
         if self._proc_dot:
             self._proc_dot.kill()
-        self._last_dot = ""
-
-        py = self.defaults.get("python_path")
-        workdir = self.program_dir or os.path.dirname(cps_path)
-
-        # Ejecuta el generador DOT del AST
-        self._proc_ast_dump = QProcess(self)
-        self._proc_ast_dump.setWorkingDirectory(workdir)
-        self._proc_ast_dump.setProgram(py)
-        self._proc_ast_dump.setArguments(["-m", "src.tools.ast_dump", cps_path])
-        self._proc_ast_dump.setProcessChannelMode(QProcess.MergedChannels)
-
-        def on_ast_ready():
-            out = bytes(self._proc_ast_dump.readAllStandardOutput()).decode("utf-8", errors="replace")
-            if out:
-                self._last_dot += out
-
-        def on_ast_finished(_code, _status):
-            on_ast_ready()  
-            dot_txt = (self._last_dot or "").strip()
-            if not dot_txt or "digraph" not in dot_txt:
-                self.astLabel.setText("No se pudo generar DOT del AST.\n¿Está correcto el archivo?\n\nSalida:\n" + (self._last_dot or "(vacía)"))
-                return
-            self.render_dot_to_png(dot_txt, workdir)
-
-        self._proc_ast_dump.readyReadStandardOutput.connect(on_ast_ready)
-        self._proc_ast_dump.readyReadStandardError.connect(on_ast_ready)
-        self._proc_ast_dump.finished.connect(on_ast_finished)
-
-        self.append_output(f"[IDE] exec(py ast_dump): \"{py}\" -m src.tools.ast_dump \"{cps_path}\"\n")
-        self.append_output(f"[IDE] cwd(ast): {workdir}\n")
-        self._proc_ast_dump.start()
+        dot_txt = (dot_text or "").strip()
+        if not dot_txt or "digraph" not in dot_txt:
+            self.astLabel.setText("No se pudo generar DOT del AST.\n¿Está correcto el archivo?")
+            return
+        workdir = self.program_dir or os.getcwd()
+        self.render_dot_to_png(dot_txt, workdir)
 
     def render_dot_to_png(self, dot_text: str, workdir: str):
         self._proc_dot = QProcess(self)
@@ -499,6 +468,10 @@ class MainWindow(QMainWindow):
             pass
         self.tabs.removeTab(index)
 
+    def closeEvent(self, event):
+        self.runner.stop()
+        super().closeEvent(event)
+
     def on_toggle_theme(self):
         self.theme = "light" if (self.theme or "dark") == "dark" else "dark"
         apply_theme(QApplication.instance(), self.theme)
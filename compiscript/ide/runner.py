@@ -68,6 +68,13 @@ class CliRunner(QObject):
         self._mode: str = 'python'  
         self._file_path: str = ''
 
+        # Servidor persistente (cli.py --serve): un solo proceso para todos los Run
+        self.server: Optional[QProcess] = None
+        self._server_buf: str = ''
+        self._server_ok: bool = True      # se apaga si el servidor muere; caemos a un proceso por Run
+        self._req_seq: int = 0
+        self._pending_id: Optional[int] = None
+
     def run_file(self, file_path: str) -> None:
         # reset
         if self.proc:
@@ -88,6 +95,99 @@ class CliRunner(QObject):
             self.finished.emit({'ok': False, 'errors': [{'message': 'cli.py no encontrado'}]})
             return
 
+        if self._server_ok:
+            self._run_server(self._file_path)
+            return
+        self._run_python(self._file_path)
+
+    def stop(self) -> None:
+        """Cierra el servidor persistente (llamar al cerrar el IDE)."""
+        if not self.server:
+            return
+        srv, self.server = self.server, None
+        try:
+            srv.finished.disconnect()
+        except Exception:
+            pass
+        if srv.state() != QProcess.NotRunning:
+            srv.write(b'{"cmd": "shutdown"}\n')
+            srv.closeWriteChannel()
+            if not srv.waitForFinished(2000):
+                srv.kill()
+
+    # ---- modo servidor ----
+    def _ensure_server(self) -> QProcess:
+        if self.server and self.server.state() != QProcess.NotRunning:
+            return self.server
+        cli = self.defaults['cli_path']
+        py = self.defaults.get('python_path', sys.executable or 'python3')
+        workdir = os.path.dirname(cli)
+        self.output.emit(
+            f'[IDE] exec(serve): "{py}" "{cli}" --serve\n'
+            f'[IDE] cwd: {workdir}\n'
+        )
+        self._server_buf = ''
+        self.server = QProcess(self)
+        self.server.setWorkingDirectory(workdir)
+        self.server.setProgram(py)
+        self.server.setArguments([cli, '--serve'])
+        # stdout = protocolo (JSON por línea); stderr = logs (p. ej. errores de sintaxis de ANTLR)
+        self.server.setProcessChannelMode(QProcess.SeparateChannels)
+        self.server.readyReadStandardOutput.connect(self._on_server_stdout)
+        self.server.readyReadStandardError.connect(self._on_server_stderr)
+        self.server.finished.connect(self._on_server_finished)
+        self.server.errorOccurred.connect(self._on_server_error)
+        self.server.start()
+        return self.server
+
+    def _run_server(self, file_path: str):
+        srv = self._ensure_server()
+        self._req_seq += 1
+        self._pending_id = self._req_seq
+        req = {'id': self._req_seq, 'cmd': 'analyze', 'file': file_path, 'symbols': True, 'emit_ir': True, 'emit_ast_dot': True}
+        self.output.emit(f'[IDE] request #{self._req_seq} (serve): {file_path}\n')
+        srv.write((json.dumps(req) + '\n').encode('utf-8'))
+
+    def _on_server_stderr(self):
+        if not self.server: return
+        err = bytes(self.server.readAllStandardError()).decode('utf-8', errors='replace')
+        if err:
+            self.output.emit(err)
+
+    def _on_server_stdout(self):
+        if not self.server: return
+        self._server_buf += bytes(self.server.readAllStandardOutput()).decode('utf-8', errors='replace')
+        while '\n' in self._server_buf:
+            line, self._server_buf = self._server_buf.split('\n', 1)
+            if not line.strip():
+                continue
+            try:
+                data = json.loads(line)
+            except Exception:
+                self.output.emit(line + '\n')
+                continue
+            # respuestas de Runs anteriores (ya reemplazados) se descartan
+            if data.get('id') != self._pending_id:
+                continue
+            self._pending_id = None
+            self.output.emit(json.dumps(data, ensure_ascii=False, indent=2) + '\n')
+            self.finished.emit(data)
+            self._file_path = ''
+
+    def _on_server_error(self, err):
+        # FailedToStart no dispara 'finished'; lo tratamos igual que una caída
+        if err == QProcess.FailedToStart:
+            self.output.emit(f'[IDE] serve process error: {err}\n')
+            self._on_server_finished(-1, None)
+
+    def _on_server_finished(self, code: int, _status):
+        self.server = None
+        if self._pending_id is None:
+            return
+        # murió a mitad de una petición: desactivamos el servidor y repetimos en modo clásico
+        self._pending_id = None
+        self._server_ok = False
+        self.output.emit(f'[IDE] serve terminó (exit={code}); usando un proceso por Run\n')
         self._run_python(self._file_path)
 
     def _wire_process(self):
@@ -103,9 +203,9 @@ class CliRunner(QObject):
         py = self.defaults.get('python_path', sys.executable or 'python3')
         workdir = os.path.dirname(cli)
 
-        args = [cli, '--json', '--symbols', '--emit-ir', file_path]
+        args = [cli, '--json', '--symbols', '--emit-ir', '--emit-ast-dot', file_path]
         self.output.emit(
-            f'[IDE] exec(py): "{py}" "{cli}" --json --symbols --emit-ir "{file_path}"\n'
+            f'[IDE] exec(py): "{py}" "{cli}" --json --symbols --emit-ir --emit-ast-dot "{file_path}"\n'
             f'[IDE] cwd: {workdir}\n'
         )
 
@@ -136,7 +236,7 @@ class CliRunner(QObject):
             'docker', 'run', '--rm', '-i',
             '-v', f'{host_dir}:/program',
             '-w', '/program',
-            image, 'python3', '/program/cli.py', '--json', '--symbols', '--emit-ir', container_file
+            image, 'python3', '/program/cli.py', '--json', '--symbols', '--emit-ir', '--emit-ast-dot', container_file
         ]
 
         self.output.emit('[IDE] Fallback a Docker\n')
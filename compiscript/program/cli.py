@@ -1,42 +1,44 @@
 # program/cli.py
-import sys, json, argparse, os
-from typing import Any, Dict, List
+from __future__ import annotations
+import sys, json, argparse, os, contextlib, glob, time
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
 
-# ---- Fase de parseo (tu helper existente) ----
-from src.frontend.parser_util import parse_code
+# Arranque en frío: aquí arriba solo va lo liviano. ANTLR + lexer/parser generados,
+# semántica y backend de IR se importan dentro de la fase que los usa, así que
+# un hit de caché no carga ANTLR y un chequeo sin --emit-ir no carga src.ir.
+# El presupuesto se verifica en src/tests_cli/test_importtime.py.
+from src.frontend.modes import PARSE_MODES, DEFAULT_PARSE_MODE, FRONTENDS, DEFAULT_FRONTEND
 
-# ---- Semántica (ya en tu proyecto) ----
-from src.sema.errors import ErrorReporter
-from src.sema.decl_collector import DeclarationCollector
-from src.sema.type_linker import TypeLinker
-from src.sema.typecheck_visitor import TypeCheckVisitor
-from src.sema.symbols import (
-    Symbol, VariableSymbol, ConstSymbol, FieldSymbol, ParamSymbol,
-    FunctionSymbol, ClassSymbol
-)
+# ---- Caché de resultados en disco ----
+from src.tools.cache import ResultCache, DEFAULT_CACHE_DIR, DEFAULT_MAX_MB
 
-# ---- AST → IR (nuevo en esta fase) ----
-from src.ast.builder_visitor import ASTBuilder
-from src.ir.lower_from_ast import lower_program as ast_lower_to_tuples
-from src.ir.adapter import IRAdapter
-from src.ir.pretty import program_to_str as ir_to_str
+# ---- Instrumentación (--timings / "stats") ----
+from src.tools.stats import CompileStats, NULL_STATS, count_parse_tree, count_ast_nodes
+
+if TYPE_CHECKING:
+    from src.sema.errors import ErrorReporter
+    from src.sema.decl_collector import DeclarationCollector
+    from src.sema.ast_decl_collector import ASTDeclarationCollector
 
 
 def _tostr(t) -> str:
     return str(t) if t is not None else "None"
 
+def _serialize_error(e) -> Dict[str, Any]:
+    return {
+        "code": e.code,
+        "message": e.message,
+        "line": getattr(e, "line", None),
+        "col": getattr(e, "col", None),
+        "column": getattr(e, "column", None),
+    }
+
 def _serialize_errors(rep: ErrorReporter) -> List[Dict[str, Any]]:
-    out = []
-    for e in rep.errors:
-        out.append({
-            "code": e.code,
-            "message": e.message,
-            "line": getattr(e, "line", None),
-            "col": getattr(e, "col", None),
-        })
-    return out
+    return [_serialize_error(e) for e in rep.errors]
+
+def _serialize_symbols(dc: ASTDeclarationCollector | DeclarationCollector) -> Dict[str, Any]:
+    from src.sema.symbols import VariableSymbol, ConstSymbol, FieldSymbol, ParamSymbol, FunctionSymbol, ClassSymbol
 
-def _serialize_symbols(dc: DeclarationCollector) -> Dict[str, Any]:
     # Globales
     g = []
     for name, sym in dc.global_scope.items():
@@ -64,7 +66,7 @@ def _serialize_symbols(dc: DeclarationCollector) -> Dict[str, Any]:
         params = []
         fsym = None
         if fscope.parent:
-            fsym = fscope.parent.resolve_local(fscope.name)
+            fsym = fscope.parent.resolve(fscope.name)  # el padre puede ser un bloque (función anidada)
         for pname, psym in fscope.items():
             if isinstance(psym, ParamSymbol):
                 params.append({"name": pname, "type": _tostr(psym.resolved_type)})
@@ -73,27 +75,657 @@ def _serialize_symbols(dc: DeclarationCollector) -> Dict[str, Any]:
             "return": _tostr(getattr(fsym, "resolved_return", None)) if fsym else None,
             "captured": sorted(list(getattr(fsym, "captured", set()))) if fsym else [],
         }
-    return {"globals": g, "classes": classes, "functions": funcs}
+    return {"globals": g, "classes": classes, "functions": funcs, "refs": _serialize_refs(dc)}
+
+def _serialize_refs(dc: ASTDeclarationCollector | DeclarationCollector) -> List[Dict[str, Any]]:
+    """Cada aparición de identificador resuelta por la pasada de tipos, en orden de fuente."""
+    from src.sema.errors import pos_of
+    table = dc.resolutions
+    if table is None:
+        return []
+    refs = []
+    for node, res in table.items():
+        line, col = pos_of(node)
+        refs.append({
+            "name": res.name, "line": line, "column": col, "kind": res.symbol.kind,
+            "scope": res.scope.name, "depth": res.depth, "slot": res.slot,
+        })
+    refs.sort(key=lambda r: (r["line"], r["column"]))
+    return refs
 
-def analyze_source(source: str):
-    rep = ErrorReporter()
-    _, tree = parse_code(source)
-    dc = DeclarationCollector(rep); dc.visit(tree)
-    TypeLinker(rep, dc).link()
-    TypeCheckVisitor(rep, dc).visit(tree)
-    return rep, dc, tree
+def _ms_since(t0: float) -> float:
+    return round((time.perf_counter() - t0) * 1000.0, 3)
 
-def build_ir_from_tree(tree) -> str:
+def _parse_to_ast(
+    source: str,
+    parse_mode: str,
+    frontend: str,
+    timings: Optional[Dict[str, float]],
+    stats: Optional[CompileStats],
+):
+    """
+    Devuelve (ast, tree). Con frontend "fast" no hay parse tree (tree=None) salvo que el
+    parser rápido rechace la entrada; entonces se usa ANTLR como con "antlr".
+    Si ANTLR reporta errores de sintaxis, ast=None y tree es el árbol recuperado.
     """
-    Construye AST → lowering a tuplas → IR (Program) → pretty string.
+    st = stats or NULL_STATS
+    t0 = time.perf_counter()
+    if frontend == "fast":
+        from src.frontend.fast_lexer import tokenize, FastSyntaxError
+        from src.frontend.fast_parser import parse_tokens
+        try:
+            with st.phase("lex"):
+                toks = tokenize(source)
+            with st.phase("parse"):
+                ast = parse_tokens(toks)
+            st.count("tokens", len(toks))
+            if timings is not None:
+                timings["parse"] = _ms_since(t0)
+            return ast, None
+        except FastSyntaxError:
+            st.count("fast_fallback")
+
+    from src.frontend.parser_util import parse_code
+    parser, tree = parse_code(source, parse_mode, stats)
+    if timings is not None:
+        timings["parse"] = _ms_since(t0)
+    if stats is not None:
+        stats.count("parse_tree_nodes", count_parse_tree(tree))
+    if parser.getNumberOfSyntaxErrors():
+        return None, tree
+    from src.ast.builder_visitor import ASTBuilder
+    t0 = time.perf_counter()
+    try:
+        with st.phase("ast"):
+            ast = ASTBuilder().visit(tree)
+    except Exception:
+        ast = None  # la semántica sigue sobre el parse tree
+    if timings is not None:
+        timings["ast"] = _ms_since(t0)
+    return ast, tree
+
+def analyze_source(
+    source: str,
+    timings: Optional[Dict[str, float]] = None,
+    parse_mode: str = DEFAULT_PARSE_MODE,
+    stats: Optional[CompileStats] = None,
+    frontend: str = DEFAULT_FRONTEND,
+    sema_jobs: int = 1,
+    session=None,
+    max_errors: Optional[int] = None,
+    error_sink=None,
+):
+    """
+    Parseo + semántica. Devuelve (rep, dc, ast, tree).
+    La semántica corre sobre el AST (src/sema/ast_*.py), el mismo que después se baja a IR.
+    Con errores de sintaxis no hay AST: se chequea el parse tree que recuperó ANTLR con
+    los visitors de siempre (DeclarationCollector/TypeCheckVisitor), igual que antes.
+    'sema_jobs' > 1 chequea los cuerpos top-level en procesos (src/sema/parallel.py).
+    Con 'session' (SemaSession) se reanaliza contra el resultado anterior del mismo
+    documento (src/sema/incremental.py); el AST devuelto es el de la sesión.
+    'max_errors' corta la semántica al superar ese número de errores (rep.truncated) y
+    'error_sink' recibe cada SemanticError en cuanto se reporta (ver ErrorReporter).
+    """
+    # ---- Fase de parseo + semántica (carga el frontend elegido) ----
+    from src.sema.errors import ErrorReporter, TooManyErrors
+    from src.sema.type_linker import TypeLinker
+
+    st = stats or NULL_STATS
+    rep = ErrorReporter(max_errors, error_sink)
+    ast, tree = _parse_to_ast(source, parse_mode, frontend, timings, stats)
+    t0 = time.perf_counter()
+    tc = None
+    try:
+        if ast is not None and session is not None:
+            with st.phase("sema"):
+                res = session.update(source, ast)
+            dc, ast = res.decl, res.ast
+            st.count("sema_reused", res.reused)
+            tc = res  # memo_hits / memo_misses
+            # la sesión analiza sin tope (sus resultados se reutilizan): tope y sink van aquí
+            rep.extend(res.rep.errors)
+        elif ast is not None:
+            from src.sema.ast_decl_collector import ASTDeclarationCollector
+            from src.sema.ast_typecheck import ASTTypeChecker
+            dc = ASTDeclarationCollector(rep)
+            with st.phase("decl"):
+                dc.visit_program(ast)
+            with st.phase("link"):
+                TypeLinker(rep, dc).link()
+            tc = ASTTypeChecker(rep, dc)
+            with st.phase("typecheck"):
+                tc.visit_program(ast, workers=sema_jobs)
+        else:
+            from src.sema.decl_collector import DeclarationCollector
+            from src.sema.typecheck_visitor import TypeCheckVisitor
+            dc = DeclarationCollector(rep)
+            with st.phase("decl"):
+                dc.visit(tree)
+            with st.phase("link"):
+                TypeLinker(rep, dc).link()
+            tc = TypeCheckVisitor(rep, dc)
+            with st.phase("typecheck"):
+                tc.visit(tree)
+    except TooManyErrors:
+        # se alcanzó max_errors: el resto de la semántica no corre
+        st.count("sema_aborted")
+    if timings is not None:
+        timings["sema"] = _ms_since(t0)
+    if stats is not None:
+        scopes = [dc.global_scope, *dc.class_scopes.values(), *dc.function_scopes.values()]
+        stats.count("scopes", len(scopes))
+        stats.count("symbols", sum(len(sc) for sc in scopes))
+        if tc is not None:
+            stats.count("type_memo_hits", tc.memo_hits)
+            stats.count("type_memo_misses", tc.memo_misses)
+        if ast is not None:
+            stats.count("ast_nodes", count_ast_nodes(ast))
+    return rep, dc, ast, tree
+
+def _frame_locals(dc, fname: str, params: List[str]) -> List[str]:
+    """Locales de la función IR 'fname' según la tabla de resoluciones de la semántica."""
+    if fname == "main":
+        fscope = None
+    else:
+        fscope = dc.function_scopes.get(fname if "::" in fname else f"::{fname}")
+        if fscope is None:
+            return []
+    # un local de bloque que sombrea a un parámetro (o a otro local) comparte su slot
+    return [v for v in dc.resolutions.frame_locals(fscope) if v not in params]
+
+def build_ir_from_ast(ast, stats: Optional[CompileStats] = None, decl=None, fold: bool = True,
+                      optimize: bool = False) -> str:
+    """
+    Lowering a tuplas → IR (Program) → pretty string, a partir del AST ya construido.
     Lanza excepciones si algo interno falla (no entra aquí si hay errores semánticos).
+    Con 'decl' (colector ya chequeado) los frames salen de su tabla de resoluciones.
+    'fold' pliega constantes al emitir (src/ir/fold.py); --no-fold deja el TAC literal.
+    'optimize' (-O) corre SCCP (src/ir/sccp.py) y poda lo inalcanzable antes de imprimir.
     """
-    ast = ASTBuilder().visit(tree)
-    fn_tuples = ast_lower_to_tuples(ast)  # List[(name, params, body_tuples)]
-    adapter = IRAdapter.new()
+    # ---- AST → IR ----
+    from src.ir.lower_from_ast import lower_program as ast_lower_to_tuples
+    from src.ir.adapter import IRAdapter
+    from src.ir.pretty import program_to_str as ir_to_str
+
+    st = stats or NULL_STATS
+    with st.phase("lower"):
+        fn_tuples = ast_lower_to_tuples(ast)  # List[(name, params, body_tuples)]
+    adapter = IRAdapter.new(fold=fold)
     for fname, params, body in fn_tuples:
-        adapter.emit_function(fname, params, body)
-    return ir_to_str(adapter.program)
+        locals_ = _frame_locals(decl, fname, params) if decl is not None and decl.resolutions is not None else None
+        with st.phase("emit"):
+            adapter.emit_function(fname, params, body, locals=locals_)
+        # los allocators se reinician por función: sumamos lo entregado en cada una
+        st.count("temps", adapter.ctx.temp_alloc.allocated)
+        st.count("labels", adapter.ctx.label_alloc.allocated)
+    if optimize:
+        with st.phase("opt"):
+            removed_instrs, removed_blocks = adapter.optimize(_global_consts(decl), _captured_names(decl))
+        st.count("opt_instrs_removed", removed_instrs)
+        st.count("opt_blocks_removed", removed_blocks)
+    with st.phase("pretty"):
+        text = ir_to_str(adapter.program)
+    if stats is not None:
+        stats.count("ir_functions", len(adapter.program.functions))
+        stats.count("folded", adapter.ctx.folded)
+        stats.count("ir_instrs", sum(len(bb.instrs) for fn in adapter.program.functions for bb in fn.blocks))
+    return text
+
+def _global_consts(decl) -> List[str]:
+    """Nombres de las const globales: se asignan una vez, ninguna llamada las cambia."""
+    if decl is None:
+        return []
+    from src.sema.symbols import ConstSymbol
+    return [name for name, sym in decl.global_scope.items() if isinstance(sym, ConstSymbol)]
+
+def _captured_names(decl) -> List[str]:
+    """Variables que alguna función anidada lee o escribe (FunctionSymbol.captured)."""
+    if decl is None:
+        return []
+    out = set()
+    for fscope in decl.function_scopes.values():
+        fsym = fscope.parent.resolve(fscope.name) if fscope.parent else None
+        out |= set(getattr(fsym, "captured", ()))
+    return sorted(out)
+
+def build_ir_from_tree(tree) -> str:
+    """Construye AST → IR desde el parse tree."""
+    from src.ast.builder_visitor import ASTBuilder
+    return build_ir_from_ast(ASTBuilder().visit(tree))
+
+def build_payload(
+    src: str,
+    *,
+    symbols: bool = False,
+    emit_ir: bool = False,
+    emit_ast_dot: bool = False,
+    timings: Optional[Dict[str, float]] = None,
+    parse_mode: str = DEFAULT_PARSE_MODE,
+    cache: Optional[ResultCache] = None,
+    stats: Optional[CompileStats] = None,
+    frontend: str = DEFAULT_FRONTEND,
+    sema_jobs: int = 1,
+    session=None,
+    max_errors: Optional[int] = None,
+    error_sink=None,
+    fold: bool = True,
+    optimize: bool = False,
+) -> Dict[str, Any]:
+    """
+    Corre el pipeline completo y arma el payload JSON que consume el IDE.
+    Lo comparten el modo de un solo archivo (--json), el servidor (--serve) y --batch.
+    Si se pasa 'timings', se llena con el tiempo (ms) de cada fase.
+    Con 'cache', un fuente ya visto (misma versión del compilador) se responde desde disco
+    sin lexear/parsear; la entrada guarda siempre los símbolos para servir ambos casos.
+    Con 'stats' (CompileStats) se agrega "stats": tiempos/memoria por fase y contadores.
+    'frontend' elige quién construye el AST (ver src/frontend/modes.py); el payload es el mismo.
+    'sema_jobs' tampoco cambia el payload, solo cuántos procesos chequean los cuerpos.
+    'session' (SemaSession) tampoco: reutiliza lo que no cambió desde el análisis anterior.
+    Con 'max_errors' la semántica se corta al superar el tope y el payload lleva "truncated";
+    'error_sink' recibe cada error en cuanto se reporta. Con cualquiera de los dos no se usa
+    la caché (un hit no reportaría nada y una entrada recortada no sirve para otros topes).
+    'fold' y 'optimize' cambian el IR, así que entran en la clave de la caché (y 'parse_mode'
+    si no es el de siempre: las entradas de un modo no se mezclan con las de otro).
+    """
+    if cache is None or max_errors is not None or error_sink is not None:
+        payload, _ = _compute_payload(src, symbols, emit_ir, emit_ast_dot, timings, parse_mode, stats, frontend,
+                                   sema_jobs, session, max_errors, error_sink, fold, optimize)
+        if stats is not None:
+            payload["stats"] = stats.to_dict()
+        return payload
+
+    t0 = time.perf_counter()
+    with (stats or NULL_STATS).phase("cache"):
+        key = cache.key(src, _cache_variant(parse_mode, fold, optimize))
+        need = tuple(f for f, on in (("ir", emit_ir), ("ast_dot", emit_ast_dot)) if on)
+        entry = cache.get(key, need=need)
+    hit = entry is not None
+    if not hit:
+        entry, clean_parse = _compute_payload(src, True, emit_ir, emit_ast_dot, timings, parse_mode, stats,
+                                              frontend, sema_jobs, session, fold=fold, optimize=optimize)
+        for f in need:
+            entry.setdefault(f, None)  # None = no se generó (errores semánticos / de sintaxis)
+        # los errores de sintaxis los imprime ANTLR (no van en el payload): un hit los perdería
+        if clean_parse:
+            cache.put(key, entry)
+    elif timings is not None:
+        timings["cache"] = _ms_since(t0)
+
+    payload = dict(entry)
+    if not symbols:
+        payload["symbols"] = None
+    if not emit_ir or payload.get("ir") is None:
+        payload.pop("ir", None)
+    if not emit_ast_dot:
+        payload.pop("ast_dot", None)
+    if stats is not None:
+        stats.count("cache_hit", int(hit))
+        payload["stats"] = stats.to_dict()
+    return payload
+
+def _cache_variant(parse_mode: str, fold: bool, optimize: bool = False) -> str:
+    """Sufijo de la clave de caché: opciones del IR y, si no es la de siempre, la estrategia de parseo."""
+    ir = _ir_variant(fold, optimize)
+    if parse_mode == DEFAULT_PARSE_MODE:
+        return ir
+    return f"{ir}+{parse_mode}" if ir else parse_mode
+
+def _ir_variant(fold: bool, optimize: bool = False) -> str:
+    """Sufijo de la clave de caché para las opciones que cambian el IR ("" = por defecto)."""
+    return "+".join(v for v, on in (("nofold", not fold), ("O", optimize)) if on)
+
+def _compute_payload(
+    src: str,
+    symbols: bool,
+    emit_ir: bool,
+    emit_ast_dot: bool,
+    timings: Optional[Dict[str, float]],
+    parse_mode: str,
+    stats: Optional[CompileStats] = None,
+    frontend: str = DEFAULT_FRONTEND,
+    sema_jobs: int = 1,
+    session=None,
+    max_errors: Optional[int] = None,
+    error_sink=None,
+    fold: bool = True,
+    optimize: bool = False,
+) -> Tuple[Dict[str, Any], bool]:
+    """Devuelve (payload, clean_parse); clean_parse=False si el parser reportó errores de sintaxis."""
+    rep, dc, ast, tree = analyze_source(src, timings, parse_mode, stats, frontend, sema_jobs, session,
+                                        max_errors, error_sink)
+    # sin AST pero con parse tree = ANTLR se recuperó de errores de sintaxis (o el AST falló)
+    clean_parse = ast is not None or tree is None
+    payload = {
+        "ok": not rep.has_errors(),
+        "errors": _serialize_errors(rep),
+        "symbols": _serialize_symbols(dc) if symbols else None,
+    }
+    if max_errors is not None:
+        payload["truncated"] = rep.truncated
+    want_ir = emit_ir and not rep.has_errors()
+    if not (want_ir or emit_ast_dot):
+        return payload, clean_parse
+
+    # el AST de la semántica sirve para el DOT y el IR; con errores de sintaxis se intenta
+    # armarlo desde el árbol recuperado (el IDE muestra el DOT igual)
+    ast_error: Optional[Exception] = None
+    if ast is None:
+        from src.ast.builder_visitor import ASTBuilder
+        try:
+            ast = ASTBuilder().visit(tree)
+        except Exception as ex:
+            ast_error = ex
+
+    if emit_ast_dot:
+        # el DOT se entrega aunque haya errores semánticos (el IDE lo muestra igual)
+        from src.ast.dot_export import ASTDotExporter
+        payload["ast_dot"] = ASTDotExporter().to_dot(ast) if ast is not None else None
+
+    # si piden IR y no hay errores, lo agregamos
+    if want_ir:
+        t0 = time.perf_counter()
+        try:
+            if ast is None:
+                raise ast_error
+            payload["ir"] = build_ir_from_ast(ast, stats, dc, fold, optimize)
+            if timings is not None:
+                timings["ir"] = _ms_since(t0)
+        except Exception as ex:
+            # protegemos al IDE: reportamos el fallo del backend de IR como error suave
+            payload["ok"] = False
+            payload["errors"].append({"code": "IRGEN", "message": f"Fallo generando IR: {ex}", "line": None, "col": None, "column": None})
+    return payload, clean_parse
+
+# ---- Modo servidor (--serve) ----
+# Protocolo: una petición JSON por línea en stdin, una respuesta JSON por línea en stdout.
+#   {"id": 1, "cmd": "analyze", "file": "samples/ok_all.cps", "symbols": true, "emit_ir": true}
+#   {"id": 2, "cmd": "emit-ir", "source": "let a: integer = 1;", "emit_ast_dot": true, "stats": true}
+#   {"id": 3, "cmd": "shutdown"}
+# cmd: analyze | symbols | emit-ir | ping | shutdown.  'symbols' y 'emit-ir' encienden
+# el flag correspondiente; 'analyze' respeta los flags que vengan en la petición.
+# La respuesta es el mismo payload de --json más el "id" de la petición.
+# "stats": true agrega el objeto "stats" (como --timings); "memory": true mide también tracemalloc.
+# "frontend": "antlr" | "fast" elige quién construye el AST (como --frontend).
+# "session": "<nombre>" reanaliza contra el análisis anterior de esa sesión (p. ej. la ruta
+# del documento en el IDE): solo se vuelven a chequear las funciones/clases que cambiaron o
+# que dependen de una firma que cambió (src/sema/incremental.py). El payload es el mismo.
+# "max_errors": N corta la semántica al superar N errores (el payload trae "truncated").
+# "stream": true escribe cada error en cuanto se reporta, antes de la respuesta:
+#   {"id": 1, "event": "error", "error": {"code": ..., "line": ..., ...}}
+# "fold": false genera el IR sin plegar constantes (como --no-fold).
+# "optimize": true corre SCCP y poda las ramas muertas (como -O).
+# Lexer/parser (ATN + DFAs de predicción) viven a nivel de clase en los módulos
+# generados, así que quedan calientes entre peticiones mientras el proceso siga vivo.
+
+_SERVE_CMDS = ("analyze", "symbols", "emit-ir")
+
+_WARMUP_SOURCE = """
+class W { let v: integer; function constructor(v: integer) { this.v = v; } }
+function f(a: integer, xs: integer[]): integer {
+  let w: W = new W(a);
+  if (a > 0 && !false) { return w.v + xs[0] * 2; }
+  while (a < 10) { a = a + 1; }
+  foreach (x in xs) { a = a + x; }
+  return a > 1 ? a : 0;
+}
+let s: string = "x";
+"""
+
+def _request_error(req_id: Any, message: str) -> Dict[str, Any]:
+    return {
+        "id": req_id,
+        "ok": False,
+        "errors": [{"code": "REQUEST", "message": message, "line": None, "col": None, "column": None}],
+        "symbols": None,
+    }
+
+def handle_request(req: Dict[str, Any], cache: Optional[ResultCache] = None,
+                   sessions: Optional[Dict[str, Any]] = None,
+                   emit: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+    """
+    Atiende una petición del modo servidor y devuelve la respuesta (sin serializar).
+    'sessions' guarda la SemaSession de cada "session" entre peticiones; 'emit' escribe
+    los eventos de "stream" (una línea cada uno).
+    """
+    req_id = req.get("id")
+    cmd = req.get("cmd", "analyze")
+    if cmd == "ping":
+        return {"id": req_id, "ok": True}
+    if cmd not in _SERVE_CMDS:
+        return _request_error(req_id, f"Comando desconocido: {cmd}")
+
+    if "source" in req:
+        src = req["source"]
+    elif "file" in req:
+        try:
+            with open(req["file"], "r", encoding="utf-8") as fh:
+                src = fh.read()
+        except OSError as ex:
+            return _request_error(req_id, f"No se pudo leer {req['file']}: {ex}")
+    else:
+        return _request_error(req_id, "La petición requiere 'file' o 'source'")
+
+    symbols = bool(req.get("symbols")) or cmd == "symbols"
+    emit_ir = bool(req.get("emit_ir")) or cmd == "emit-ir"
+    emit_ast_dot = bool(req.get("emit_ast_dot"))
+    frontend = req.get("frontend", DEFAULT_FRONTEND)
+    if frontend not in FRONTENDS:
+        return _request_error(req_id, f"Frontend desconocido: {frontend}")
+    max_errors = req.get("max_errors")
+    if max_errors is not None and (not isinstance(max_errors, int) or max_errors < 1):
+        return _request_error(req_id, f"max_errors inválido: {max_errors!r}")
+    sink = None
+    if req.get("stream") and emit is not None:
+        sink = lambda e: emit({"id": req_id, "event": "error", "error": _serialize_error(e)})
+    session = None
+    if sessions is not None and req.get("session") is not None:
+        from src.sema.incremental import SemaSession
+        session = sessions.setdefault(str(req["session"]), SemaSession())
+    stats = CompileStats(trace_memory=bool(req.get("memory"))) if req.get("stats") else None
+    try:
+        payload = build_payload(src, symbols=symbols, emit_ir=emit_ir, emit_ast_dot=emit_ast_dot,
+                                cache=cache, stats=stats, frontend=frontend, session=session,
+                                max_errors=max_errors, error_sink=sink, fold=bool(req.get("fold", True)),
+                                optimize=bool(req.get("optimize", False)))
+    except Exception as ex:
+        # un fallo interno no debe tumbar el servidor: lo reportamos y seguimos atendiendo
+        payload = {
+            "ok": False,
+            "errors": [{"code": "INTERNAL", "message": f"Fallo interno: {ex}", "line": None, "col": None, "column": None}],
+            "symbols": None,
+        }
+    finally:
+        if stats is not None:
+            stats.close()
+    return {"id": req_id, **payload}
+
+def serve(inp=None, out=None, cache: Optional[ResultCache] = None) -> int:
+    """Bucle del modo servidor: lee peticiones NDJSON hasta EOF o 'shutdown'."""
+    inp = inp if inp is not None else sys.stdin
+    out = out if out is not None else sys.stdout
+
+    # Calentamos lexer/parser una vez para que la primera petición real no pague los DFAs
+    with contextlib.redirect_stdout(sys.stderr):
+        try:
+            build_payload(_WARMUP_SOURCE, symbols=True, emit_ir=True, emit_ast_dot=True)
+        except Exception:
+            pass
+
+    sessions: Dict[str, Any] = {}  # "session" → SemaSession (ver handle_request)
+
+    def emit(event: Dict[str, Any]) -> None:
+        out.write(json.dumps(event, ensure_ascii=False) + "\n")
+        out.flush()
+
+    for line in inp:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            req = json.loads(line)
+            if not isinstance(req, dict):
+                raise ValueError("se esperaba un objeto")
+        except ValueError as ex:
+            resp = _request_error(None, f"Petición JSON inválida: {ex}")
+        else:
+            if req.get("cmd") == "shutdown":
+                out.write(json.dumps({"id": req.get("id"), "ok": True}) + "\n")
+                out.flush()
+                break
+            # stdout queda reservado para el protocolo; cualquier print accidental va a stderr
+            with contextlib.redirect_stdout(sys.stderr):
+                resp = handle_request(req, cache, sessions, emit)
+        out.write(json.dumps(resp, ensure_ascii=False) + "\n")
+        out.flush()
+    return 0
+
+# ---- Modo batch (--batch) ----
+# Reparte muchos .cps entre procesos (ProcessPoolExecutor) y emite un JSON por archivo
+# (NDJSON, en el orden de entrada) seguido de una línea de resumen.
+
+def expand_batch_spec(spec: str) -> List[str]:
+    """
+    Resuelve la especificación de --batch a una lista de archivos:
+      - directorio  → todos los *.cps debajo (recursivo)
+      - @lista.txt  → un path por línea (se ignoran vacías y las que empiezan con '#')
+      - glob        → patrón estilo shell (admite **)
+    """
+    if spec.startswith("@"):
+        with open(spec[1:], "r", encoding="utf-8") as fh:
+            return [ln.strip() for ln in fh if ln.strip() and not ln.lstrip().startswith("#")]
+    if os.path.isdir(spec):
+        out = []
+        for root, _dirs, files in os.walk(spec):
+            out.extend(os.path.join(root, f) for f in files if f.endswith(".cps"))
+        return sorted(out)
+    return sorted(glob.glob(spec, recursive=True))
+
+def _batch_worker_init(atn_settings: Tuple[str, bool]) -> None:
+    # Cada worker importa y calienta lexer/parser una sola vez, con la caché de DFAs del padre
+    from src.frontend import atn_cache
+    atn_cache.configure(*atn_settings)
+    with contextlib.redirect_stdout(sys.stderr):
+        try:
+            build_payload(_WARMUP_SOURCE, emit_ir=True)
+        except Exception:
+            pass
+    atn_cache.save_on_worker_exit()
+
+_worker_caches: Dict[Any, ResultCache] = {}
+
+def _cache_for(cache_cfg: Optional[tuple]) -> Optional[ResultCache]:
+    # una instancia por proceso: conserva el tamaño estimado entre archivos
+    if cache_cfg is None:
+        return None
+    if cache_cfg not in _worker_caches:
+        _worker_caches[cache_cfg] = ResultCache(*cache_cfg)
+    return _worker_caches[cache_cfg]
+
+def compile_file(
+    path: str,
+    symbols: bool = False,
+    emit_ir: bool = False,
+    cache_cfg: Optional[tuple] = None,
+    with_stats: bool = False,
+    frontend: str = DEFAULT_FRONTEND,
+    fold: bool = True,
+    optimize: bool = False,
+    parse_mode: str = DEFAULT_PARSE_MODE,
+    sema_jobs: int = 1,
+    max_errors: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Compila un archivo y devuelve su resultado de batch (nunca lanza).
+    'cache_cfg' = (dir, max_bytes) de la caché en disco, o None para no usarla.
+    'with_stats' agrega el objeto "stats" (tiempos por fase y contadores, sin tracemalloc).
+    El resto de las opciones son las de build_payload (mismo resultado que un solo archivo).
+    """
+    t0 = time.perf_counter()
+    timings: Dict[str, float] = {}
+    stats = CompileStats() if with_stats else None
+    try:
+        with open(path, "r", encoding="utf-8") as fh:
+            src = fh.read()
+    except OSError as ex:
+        payload = {
+            "ok": False,
+            "errors": [{"code": "IO", "message": f"No se pudo leer {path}: {ex}", "line": None, "col": None, "column": None}],
+            "symbols": None,
+        }
+    else:
+        try:
+            payload = build_payload(src, symbols=symbols, emit_ir=emit_ir, timings=timings,
+                                    cache=_cache_for(cache_cfg), stats=stats, frontend=frontend, fold=fold,
+                                    optimize=optimize, parse_mode=parse_mode, sema_jobs=sema_jobs,
+                                    max_errors=max_errors)
+        except Exception as ex:
+            payload = {
+                "ok": False,
+                "errors": [{"code": "INTERNAL", "message": f"Fallo interno: {ex}", "line": None, "col": None, "column": None}],
+                "symbols": None,
+            }
+    if not symbols:
+        payload.pop("symbols", None)
+    timings["total"] = _ms_since(t0)
+    return {"file": path, **payload, "timings": timings}
+
+def run_batch(
+    files: List[str],
+    *,
+    jobs: int,
+    symbols: bool = False,
+    emit_ir: bool = False,
+    out=None,
+    cache_cfg: Optional[tuple] = None,
+    with_stats: bool = False,
+    frontend: str = DEFAULT_FRONTEND,
+    fold: bool = True,
+    optimize: bool = False,
+    parse_mode: str = DEFAULT_PARSE_MODE,
+    sema_jobs: int = 1,
+    max_errors: Optional[int] = None,
+) -> int:
+    """Compila 'files' con 'jobs' procesos; escribe NDJSON en 'out'. Devuelve el exit code."""
+    out = out if out is not None else sys.stdout
+    t0 = time.perf_counter()
+    n_ok = n_errors = 0
+
+    def _emit(res: Dict[str, Any]) -> None:
+        nonlocal n_ok, n_errors
+        n_ok += 1 if res["ok"] else 0
+        n_errors += len(res["errors"])
+        out.write(json.dumps(res, ensure_ascii=False) + "\n")
+        out.flush()
+
+    if jobs <= 1 or len(files) <= 1:
+        for path in files:
+            _emit(compile_file(path, symbols, emit_ir, cache_cfg, with_stats, frontend, fold, optimize,
+                               parse_mode, sema_jobs, max_errors))
+    else:
+        # chunks pequeños: pocas idas y vueltas por IPC sin perder el streaming
+        chunk = max(1, min(16, len(files) // (jobs * 8)))
+        from concurrent.futures import ProcessPoolExecutor
+        from src.frontend import atn_cache
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_batch_worker_init,
+                                 initargs=(atn_cache.settings(),)) as pool:
+            n = len(files)
+            results = pool.map(compile_file, files, [symbols] * n, [emit_ir] * n, [cache_cfg] * n,
+                               [with_stats] * n, [frontend] * n, [fold] * n, [optimize] * n,
+                               [parse_mode] * n, [sema_jobs] * n, [max_errors] * n, chunksize=chunk)
+            for res in results:
+                _emit(res)
+
+    summary = {
+        "files": len(files),
+        "ok": n_ok,
+        "failed": len(files) - n_ok,
+        "errors": n_errors,
+        "jobs": jobs,
+        "elapsed_ms": _ms_since(t0),
+    }
+    out.write(json.dumps({"summary": summary}, ensure_ascii=False) + "\n")
+    out.flush()
+    return 0 if n_ok == len(files) else 1
 
 def main():
     ap = argparse.ArgumentParser(description="Compilador (semántica + IR) de Compiscript")
@@ -101,41 +733,95 @@ def main():
     ap.add_argument("--json", action="store_true", help="Salida JSON (para IDE/tools)")
     ap.add_argument("--symbols", action="store_true", help="Incluir tabla de símbolos")
     ap.add_argument("--emit-ir", action="store_true", help="Generar y devolver IR (TAC) si no hay errores")
+    ap.add_argument("--emit-ast-dot", action="store_true", help="Incluir el AST en formato Graphviz DOT (\"ast_dot\")")
+    ap.add_argument("--serve", action="store_true", help="Modo servidor: peticiones JSON por línea en stdin/stdout")
+    ap.add_argument("--batch", metavar="SPEC", help="Compilar muchos archivos: <dir> | <glob> | @<lista.txt> (salida NDJSON)")
+    ap.add_argument("--jobs", "-j", type=int, default=os.cpu_count() or 1, help="Procesos para --batch (default: núcleos)")
+    ap.add_argument("--parse-mode", choices=PARSE_MODES, default=DEFAULT_PARSE_MODE,
+                    help="Estrategia del parser: two-stage (SLL y LL si falla) | ll (default: two-stage)")
+    ap.add_argument("--frontend", choices=FRONTENDS, default=DEFAULT_FRONTEND,
+                    help="Constructor del AST: antlr (ASTBuilder) | fast (parser Pratt propio) (default: antlr)")
+    ap.add_argument("--sema-jobs", type=int, default=1,
+                    help="Procesos para chequear cuerpos de funciones/clases (default: 1, secuencial)")
+    ap.add_argument("--max-errors", type=int, default=None, metavar="N",
+                    help="Cortar la semántica al superar N errores (el JSON trae \"truncated\")")
+    ap.add_argument("--stream-errors", action="store_true",
+                    help="Escribir cada error apenas se reporta (con --json: NDJSON, el payload va en la última línea)")
+    ap.add_argument("--no-fold", action="store_true",
+                    help="No plegar constantes al generar el IR (TAC literal, como en los tests golden)")
+    ap.add_argument("-O", "--optimize", action="store_true",
+                    help="Propagar constantes (SCCP) y podar ramas/bloques inalcanzables en el IR")
+    ap.add_argument("--timings", action="store_true", help="Tiempos por fase y contadores (\"stats\" en JSON)")
+    ap.add_argument("--memory", action="store_true", help="Con --timings: pico de memoria por fase (tracemalloc, más lento)")
+    ap.add_argument("--no-cache", action="store_true", help="No leer ni escribir la caché de resultados")
+    ap.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="Directorio de la caché (default: program/.cpscache)")
+    ap.add_argument("--cache-max-mb", type=float, default=DEFAULT_MAX_MB, help="Tamaño máximo de la caché en MB (LRU)")
     args = ap.parse_args()
 
+    cache_cfg = None if args.no_cache else (args.cache_dir, int(args.cache_max_mb * 1024 * 1024))
+    # DFAs del parser precalentados desde disco: opt-in, se aplica al importar parser_util
+    from src.frontend import atn_cache
+    atn_cache.configure(args.cache_dir, enabled=not args.no_cache)
+    cache = ResultCache(*cache_cfg) if cache_cfg else None
+
+    if args.max_errors is not None and args.max_errors < 1:
+        ap.error("--max-errors debe ser >= 1")
+
+    if args.serve:
+        sys.exit(serve(cache=cache))
+
+    if args.batch:
+        files = expand_batch_spec(args.batch)
+        sys.exit(run_batch(files, jobs=args.jobs, symbols=args.symbols, emit_ir=args.emit_ir,
+                           cache_cfg=cache_cfg, with_stats=args.timings, frontend=args.frontend,
+                           fold=not args.no_fold, optimize=args.optimize, parse_mode=args.parse_mode,
+                           sema_jobs=args.sema_jobs, max_errors=args.max_errors))
+
     src = open(args.file, "r", encoding="utf-8").read() if args.file else sys.stdin.read()
-    rep, dc, tree = analyze_source(src)
+    stats = CompileStats(trace_memory=args.memory) if args.timings else None
 
     # JSON (consumido por tu IDE)
     if args.json:
-        payload = {
-            "ok": not rep.has_errors(),
-            "errors": _serialize_errors(rep),
-            "symbols": _serialize_symbols(dc) if args.symbols else None,
-        }
-        # si piden IR y no hay errores, lo agregamos
-        if args.emit_ir and not rep.has_errors():
-            try:
-                payload["ir"] = build_ir_from_tree(tree)
-            except Exception as ex:
-                # protegemos al IDE: reportamos el fallo del backend de IR como error suave
-                payload["ok"] = False
-                payload["errors"].append({"code": "IRGEN", "message": f"Fallo generando IR: {ex}", "line": None, "col": None})
-        print(json.dumps(payload, ensure_ascii=False, indent=2))
+        sink = None
+        if args.stream_errors:
+            def sink(e) -> None:
+                print(json.dumps({"event": "error", "error": _serialize_error(e)}, ensure_ascii=False), flush=True)
+        payload = build_payload(src, symbols=args.symbols, emit_ir=args.emit_ir, emit_ast_dot=args.emit_ast_dot,
+                                parse_mode=args.parse_mode, cache=cache, stats=stats, frontend=args.frontend,
+                                sema_jobs=args.sema_jobs, max_errors=args.max_errors, error_sink=sink,
+                                fold=not args.no_fold, optimize=args.optimize)
+        print(json.dumps(payload, ensure_ascii=False, indent=None if args.stream_errors else 2))
         # Conserva convención de salida
-        sys.exit(0 if not rep.has_errors() else 1)
+        sys.exit(0 if payload["ok"] else 1)
 
     # Modo humano (stdout)
-    if rep.has_errors():
-        print(rep.summary())
+    def _line(e: Dict[str, Any]) -> str:
+        return f"{e['code']} @ {e['line']}:{e['column']} - {e['message']}"
+    sink = (lambda e: print(_line(_serialize_error(e)), flush=True)) if args.stream_errors else None
+    payload = build_payload(src, symbols=args.symbols, emit_ir=args.emit_ir, emit_ast_dot=args.emit_ast_dot,
+                            parse_mode=args.parse_mode, cache=cache, stats=stats, frontend=args.frontend,
+                            sema_jobs=args.sema_jobs, max_errors=args.max_errors, error_sink=sink,
+                            fold=not args.no_fold, optimize=args.optimize)
+    if not payload["ok"]:
+        if sink is None:
+            print("\n".join(_line(e) for e in payload["errors"]))
+        if payload.get("truncated"):
+            print(f"... (se alcanzó --max-errors {args.max_errors}; semántica interrumpida)")
+        if stats is not None:
+            print("\n" + stats.format())
         sys.exit(1)
     else:
         print("OK ✅  (sin errores)")
         if args.symbols:
-            print(json.dumps(_serialize_symbols(dc), ensure_ascii=False, indent=2))
+            print(json.dumps(payload["symbols"], ensure_ascii=False, indent=2))
         if args.emit_ir:
             print("\n--- IR (TAC) ---")
-            print(build_ir_from_tree(tree))
+            print(payload["ir"])
+        if args.emit_ast_dot:
+            print("\n--- AST (DOT) ---")
+            print(payload["ast_dot"])
+        if stats is not None:
+            print("\n" + stats.format())
 
 if __name__ == "__main__":
     main()
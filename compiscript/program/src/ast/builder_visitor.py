@@ -18,6 +18,15 @@ def _pos(ctx) -> A.Pos:
 class ASTBuilder(CompiscriptVisitor):
     """Convierte el parse tree de ANTLR a un AST propio (src/ast/nodes.py)."""
 
+    def __init__(self) -> None:
+        super().__init__()
+        # tabla de nombres de esta compilación (como en fast_lexer): un str por identificador
+        self._names = {}
+
+    def _name(self, node) -> str:
+        text = node.getText()
+        return self._names.setdefault(text, text)
+
     # ===== Programa y sentencias =====
 
     def visitProgram(self, ctx: CompiscriptParser.ProgramContext):
@@ -37,35 +46,35 @@ class ASTBuilder(CompiscriptVisitor):
         return self.visitChildren(ctx)
 
     def visitVariableDeclaration(self, ctx: CompiscriptParser.VariableDeclarationContext):
-        name = ctx.Identifier().getText()
+        name = self._name(ctx.Identifier())
         type_ann = None
         if ctx.typeAnnotation():
             ta = ctx.typeAnnotation()
             tctx = getattr(ta, "type_", None)() if hasattr(ta, "type_") else (ta.type() if hasattr(ta, "type") else None)
-            type_ann = tctx.getText() if tctx else None
+            type_ann = self._name(tctx) if tctx else None
         init = self.visit(ctx.initializer().expression()) if ctx.initializer() else None
         return A.VarDecl(name=name, type_ann=type_ann, init=init, is_const=False, pos=_pos(ctx))
 
     def visitConstantDeclaration(self, ctx: CompiscriptParser.ConstantDeclarationContext):
-        name = ctx.Identifier().getText()
+        name = self._name(ctx.Identifier())
         type_ann = None
         if ctx.typeAnnotation():
             ta = ctx.typeAnnotation()
             tctx = getattr(ta, "type_", None)() if hasattr(ta, "type_") else (ta.type() if hasattr(ta, "type") else None)
-            type_ann = tctx.getText() if tctx else None
+            type_ann = self._name(tctx) if tctx else None
         init = self.visit(ctx.expression())
         return A.VarDecl(name=name, type_ann=type_ann, init=init, is_const=True, pos=_pos(ctx))
 
     def visitAssignment(self, ctx: CompiscriptParser.AssignmentContext):
         # 'Identifier' '=' expr
         if ctx.Identifier() and len(ctx.expression()) == 1:
-            target = A.Identifier(name=ctx.Identifier().getText(), pos=_pos(ctx))
+            target = A.Identifier(name=self._name(ctx.Identifier()), pos=_pos(ctx))
             value = self.visit(ctx.expression(0))
             return A.Assign(target=target, value=value, pos=_pos(ctx))
 
         # expr '.' Identifier '=' expr
         obj = self.visit(ctx.expression(0))
-        prop = A.PropertyAccessExpr(obj=obj, prop=ctx.Identifier().getText(), pos=_pos(ctx))
+        prop = A.PropertyAccessExpr(obj=obj, prop=self._name(ctx.Identifier()), pos=_pos(ctx))
         value = self.visit(ctx.expression(1))
         return A.Assign(target=prop, value=value, pos=_pos(ctx))
 
@@ -100,7 +109,7 @@ class ASTBuilder(CompiscriptVisitor):
         return A.ForStmt(init=init_stmt, cond=cond, update=update, body=body, pos=_pos(ctx))
 
     def visitForeachStatement(self, ctx: CompiscriptParser.ForeachStatementContext):
-        name = ctx.Identifier().getText()
+        name = self._name(ctx.Identifier())
         iterable = self.visit(ctx.expression())
         body = self.visit(ctx.block())
         return A.ForeachStmt(var_name=name, iterable=iterable, body=body, pos=_pos(ctx))
@@ -118,7 +127,7 @@ class ASTBuilder(CompiscriptVisitor):
     def visitTryCatchStatement(self, ctx: CompiscriptParser.TryCatchStatementContext):
         return A.TryCatchStmt(
             try_block=self.visit(ctx.block(0)),
-            err_name=ctx.Identifier().getText(),
+            err_name=self._name(ctx.Identifier()),
             catch_block=self.visit(ctx.block(1)),
             pos=_pos(ctx)
         )
@@ -136,7 +145,7 @@ class ASTBuilder(CompiscriptVisitor):
         return A.SwitchStmt(expr=expr, cases=cases, default_body=default_body, pos=_pos(ctx))
 
     def visitFunctionDeclaration(self, ctx: CompiscriptParser.FunctionDeclarationContext):
-        name = ctx.Identifier().getText()
+        name = self._name(ctx.Identifier())
         is_ctor = (name == "constructor")
 
         # --- params ---
@@ -151,8 +160,8 @@ class ASTBuilder(CompiscriptVisitor):
                     tgetter_ = getattr(p, "type_", None)
                     tctx = tgetter_() if callable(tgetter_) else None
                 if tctx:
-                    pann = tctx.getText()
-                params.append(A.Param(name=p.Identifier().getText(), type_ann=pann, pos=_pos(p)))
+                    pann = self._name(tctx)
+                params.append(A.Param(name=self._name(p.Identifier()), type_ann=pann, pos=_pos(p)))
 
         # --- return type ---
         tgetter = getattr(ctx, "type", None)
@@ -160,14 +169,14 @@ class ASTBuilder(CompiscriptVisitor):
         if tctx is None:
             tgetter_ = getattr(ctx, "type_", None)
             tctx = tgetter_() if callable(tgetter_) else None
-        ret_ann = tctx.getText() if tctx else None
+        ret_ann = self._name(tctx) if tctx else None
 
         body = self.visit(ctx.block())
         return A.FunctionDecl(name=name, params=params, return_type=ret_ann, body=body, is_constructor=is_ctor, pos=_pos(ctx))
 
     def visitClassDeclaration(self, ctx: CompiscriptParser.ClassDeclarationContext):
-        name = ctx.Identifier(0).getText()
-        base = ctx.Identifier(1).getText() if len(ctx.Identifier()) > 1 else None
+        name = self._name(ctx.Identifier(0))
+        base = self._name(ctx.Identifier(1)) if len(ctx.Identifier()) > 1 else None
         members: List[A.ClassMember] = []
         for m in ctx.classMember():
             if m.functionDeclaration():
@@ -192,7 +201,7 @@ class ASTBuilder(CompiscriptVisitor):
 
     def visitPropertyAssignExpr(self, ctx: CompiscriptParser.PropertyAssignExprContext):
         base = self.visit(ctx.lhs)
-        target = A.PropertyAccessExpr(obj=base, prop=ctx.Identifier().getText(), pos=_pos(ctx))
+        target = A.PropertyAccessExpr(obj=base, prop=self._name(ctx.Identifier()), pos=_pos(ctx))
         rhs = self.visit(ctx.assignmentExpr())
         return A.Assign(target=target, value=rhs, pos=_pos(ctx))
 
@@ -256,7 +265,10 @@ class ASTBuilder(CompiscriptVisitor):
             return self.visit(ctx.literalExpr())
         if ctx.leftHandSide():
             return self.visit(ctx.leftHandSide())
-        return self.visit(ctx.expression())
+        e = self.visit(ctx.expression())
+        if e is not None:
+            e.paren_pos = _pos(ctx)
+        return e
 
     def visitLiteralExpr(self, ctx: CompiscriptParser.LiteralExprContext):
         # array literal primero
@@ -311,19 +323,19 @@ class ASTBuilder(CompiscriptVisitor):
             elif isinstance(s, P.IndexExprContext):
                 cur = A.IndexExpr(array=cur, index=self.visit(s.expression()), pos=_pos(s))
             elif isinstance(s, P.PropertyAccessExprContext):
-                cur = A.PropertyAccessExpr(obj=cur, prop=s.Identifier().getText(), pos=_pos(s))
+                cur = A.PropertyAccessExpr(obj=cur, prop=self._name(s.Identifier()), pos=_pos(s))
         return cur
 
     # primaryAtom alts
     def visitIdentifierExpr(self, ctx: CompiscriptParser.IdentifierExprContext):
-        return A.Identifier(name=ctx.Identifier().getText(), pos=_pos(ctx))
+        return A.Identifier(name=self._name(ctx.Identifier()), pos=_pos(ctx))
 
     def visitNewExpr(self, ctx: CompiscriptParser.NewExprContext):
         args = []
         if ctx.arguments():
             for a in ctx.arguments().expression():
                 args.append(self.visit(a))
-        return A.NewExpr(class_name=ctx.Identifier().getText(), args=args, pos=_pos(ctx))
+        return A.NewExpr(class_name=self._name(ctx.Identifier()), args=args, pos=_pos(ctx))
 
     def visitThisExpr(self, ctx: CompiscriptParser.ThisExprContext):
         return A.ThisExpr(pos=_pos(ctx))
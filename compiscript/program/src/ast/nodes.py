@@ -10,6 +10,9 @@ Pos = Tuple[int, int]  # (line, column)
 @dataclass
 class Node:
     pos: Optional[Pos] = None
+    # '(' más externo si la expresión venía entre paréntesis: inicio real en el fuente,
+    # para reportar errores donde empieza la expresión. No participa de ==.
+    paren_pos: Optional[Pos] = field(default=None, compare=False, repr=False, kw_only=True)
 
 # ====== Programa y sentencias ======
 
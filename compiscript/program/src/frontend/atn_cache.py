@@ -0,0 +1,231 @@
+# program/src/frontend/atn_cache.py
+# Caché en disco de los DFAs de predicción del lexer/parser generados.
+# Los DFAs arrancan vacíos en cada proceso y se llenan parseando: el primer parse paga
+# la simulación del ATN en cada decisión. Aquí se guardan ya "calientes" (pickle) en
+#   <cache_dir>/atn/<clave>.pickle   (una línea "cps-atn <clave>" y después el pickle)
+# Los estados del ATN no se serializan: se guardan como (recognizer, stateNumber) y al
+# cargar se enlazan al ATN que el módulo generado ya deserializó (más chico y rápido
+# que picklear el grafo completo, y sin deserializar el ATN dos veces).
+# clave = sha256(Compiscript.g4 + ATN serializado de lexer y parser + runtime ANTLR + Python)
+# Si la gramática cambia (o se regenera el parser) la clave cambia y el archivo viejo se ignora.
+#
+# Es opt-in: install() se llama al importar parser_util pero no hace nada si el punto de
+# entrada (cli.py: archivo, --batch, --serve) no llamó antes a configure(). Así importar el
+# frontend desde otro código no lee pickles ni agenda escrituras al salir. Si no había caché,
+# al salir del proceso (o del worker, en --batch -j N) se guarda lo aprendido;
+# `python -m src.frontend.atn_cache` la construye calentando con samples/. Antes de unpicklear
+# se compara la cabecera con la clave esperada y el unpickler solo acepta las clases de DFA /
+# configuraciones / contextos del runtime de ANTLR que listamos en _SAFE_GLOBALS.
+from __future__ import annotations
+import atexit, glob, hashlib, os, pickle, sys
+from typing import List, Optional, Tuple
+
+from src.tools.cache import DEFAULT_CACHE_DIR, PROGRAM_DIR
+
+_FORMAT = "2"
+_MAGIC = b"cps-atn "
+
+_cache_dir: str = DEFAULT_CACHE_DIR
+_enabled: bool = False  # lo activa configure()
+_save_pending = False
+loaded = False  # True si install() tomó los DFAs de disco
+
+def configure(cache_dir: Optional[str] = None, enabled: bool = True) -> None:
+    """Lo llama cli.py según --cache-dir / --no-cache (antes de importar parser_util)."""
+    global _cache_dir, _enabled
+    if cache_dir:
+        _cache_dir = cache_dir
+    _enabled = enabled and os.environ.get("CPS_NO_ATN_CACHE") != "1"
+
+def _runtime_tag() -> str:
+    # el runtime no expone su versión sin importlib.metadata (caro); usamos tamaño+mtime del simulador
+    import antlr4.atn.ParserATNSimulator as sim
+    st = os.stat(sim.__file__)
+    return f"{st.st_size}:{int(st.st_mtime)}"
+
+def cache_key(lexer_mod, parser_mod) -> str:
+    h = hashlib.sha256(_FORMAT.encode())
+    try:
+        with open(os.path.join(PROGRAM_DIR, "Compiscript.g4"), "rb") as fh:
+            h.update(fh.read())
+    except OSError:
+        pass
+    h.update(str(lexer_mod.serializedATN()).encode())
+    h.update(str(parser_mod.serializedATN()).encode())
+    h.update(_runtime_tag().encode())
+    h.update(sys.version.encode())
+    return h.hexdigest()
+
+def cache_path(key: str, cache_dir: Optional[str] = None) -> str:
+    return os.path.join(cache_dir or _cache_dir, "atn", key + ".pickle")
+
+def _classes():
+    import CompiscriptLexer as lexer_mod
+    import CompiscriptParser as parser_mod
+    return lexer_mod, parser_mod
+
+def _singletons():
+    # el runtime compara estos objetos por identidad (`is`): no se copian, se re-enlazan
+    from antlr4.PredictionContext import PredictionContext
+    from antlr4.RuleContext import RuleContext
+    from antlr4.atn.ATNSimulator import ATNSimulator
+    from antlr4.atn.LexerATNSimulator import LexerATNSimulator
+    from antlr4.atn.SemanticContext import SemanticContext
+    return {
+        "parser_error": ATNSimulator.ERROR,
+        "lexer_error": LexerATNSimulator.ERROR,
+        "empty_ctx": PredictionContext.EMPTY,
+        "empty_rule": RuleContext.EMPTY,
+        "no_pred": SemanticContext.NONE,
+    }
+
+class _DFAPickler(pickle.Pickler):
+    def __init__(self, fh, lexer_atn, parser_atn):
+        super().__init__(fh, protocol=pickle.HIGHEST_PROTOCOL)
+        from antlr4.atn.ATNState import ATNState
+        self._state_cls = ATNState
+        self._atns = {id(lexer_atn): "L", id(parser_atn): "P"}
+        self._singletons = {id(obj): name for name, obj in _singletons().items()}
+
+    def persistent_id(self, obj):
+        if isinstance(obj, self._state_cls):
+            return (self._atns[id(obj.atn)], obj.stateNumber)
+        name = self._singletons.get(id(obj))
+        return ("K", name) if name is not None else None
+
+# Las únicas clases que puede nombrar el pickle de los DFAs (el resto son contenedores
+# nativos del protocolo); cualquier otro global hace fallar la carga.
+_SAFE_GLOBALS = {(mod, name) for mod, names in {
+    "antlr4.dfa.DFA": ("DFA",),
+    "antlr4.dfa.DFAState": ("DFAState", "PredPrediction"),
+    "antlr4.atn.ATNConfig": ("ATNConfig", "LexerATNConfig"),
+    "antlr4.atn.ATNConfigSet": ("ATNConfigSet", "OrderedATNConfigSet"),
+    "antlr4.PredictionContext": ("PredictionContext", "SingletonPredictionContext", "EmptyPredictionContext",
+                                 "ArrayPredictionContext", "PredictionContextCache"),
+    "antlr4.atn.SemanticContext": ("SemanticContext", "Predicate", "PrecedencePredicate", "AND", "OR"),
+    "antlr4.atn.LexerActionExecutor": ("LexerActionExecutor",),
+    "antlr4.atn.LexerAction": ("LexerActionType", "LexerSkipAction", "LexerTypeAction", "LexerPushModeAction",
+                               "LexerPopModeAction", "LexerMoreAction", "LexerModeAction", "LexerChannelAction",
+                               "LexerCustomAction", "LexerIndexedCustomAction"),
+}.items() for name in names}
+
+class _DFAUnpickler(pickle.Unpickler):
+    def __init__(self, fh, lexer_atn, parser_atn):
+        super().__init__(fh)
+        self._tables = {"L": lexer_atn.states, "P": parser_atn.states, "K": _singletons()}
+
+    def persistent_load(self, pid):
+        which, ref = pid
+        return self._tables[which][ref]
+
+    def find_class(self, module, name):
+        if (module, name) in _SAFE_GLOBALS:
+            return super().find_class(module, name)
+        raise pickle.UnpicklingError(f"clase no permitida en la caché de DFAs: {module}.{name}")
+
+def _header(key: str) -> bytes:
+    return _MAGIC + key.encode() + b"\n"
+
+def install() -> bool:
+    """
+    Reemplaza los DFAs de CompiscriptLexer/CompiscriptParser por los de la caché.
+    Devuelve True si cargó; si no había caché, agenda guardarla al salir.
+    """
+    global _save_pending, loaded
+    if not _enabled:
+        return False
+    lexer_mod, parser_mod = _classes()
+    L, P = lexer_mod.CompiscriptLexer, parser_mod.CompiscriptParser
+    key = cache_key(lexer_mod, parser_mod)
+    try:
+        with open(cache_path(key), "rb") as fh:
+            # la cabecera se valida antes de unpicklear nada
+            if fh.readline() != _header(key):
+                raise ValueError("caché de DFAs de otra versión")
+            data = _DFAUnpickler(fh, L.atn, P.atn).load()
+        if data.get("key") != key or len(data["parser_dfa"]) != len(P.atn.decisionToState):
+            raise ValueError("caché de DFAs incompatible")
+    except Exception:
+        # no existe o es corrupta/incompatible: se (re)escribe al salir con lo aprendido
+        if not _save_pending:
+            _save_pending = True
+            atexit.register(_save_at_exit, key)
+        return False
+    L.decisionsToDFA = data["lexer_dfa"]
+    P.decisionsToDFA = data["parser_dfa"]
+    P.sharedContextCache = data["parser_ctx"]
+    loaded = True
+    return True
+
+def save(key: Optional[str] = None, cache_dir: Optional[str] = None) -> Optional[str]:
+    """Guarda los DFAs actuales (escritura atómica). Devuelve el path o None si falló."""
+    import tempfile
+    lexer_mod, parser_mod = _classes()
+    key = key or cache_key(lexer_mod, parser_mod)
+    L, P = lexer_mod.CompiscriptLexer, parser_mod.CompiscriptParser
+    data = {
+        "key": key,
+        "lexer_dfa": L.decisionsToDFA,
+        "parser_dfa": P.decisionsToDFA,
+        "parser_ctx": P.sharedContextCache,
+    }
+    path = cache_path(key, cache_dir)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(_header(key))
+            _DFAPickler(fh, L.atn, P.atn).dump(data)
+        os.replace(tmp, path)
+    except (OSError, pickle.PicklingError):
+        return None
+    return path
+
+def _save_at_exit(key: Optional[str]) -> None:
+    if _enabled:
+        save(key)
+
+def settings() -> Tuple[str, bool]:
+    """(cache_dir, enabled) actuales: para repetir configure() en otro proceso."""
+    return _cache_dir, _enabled
+
+def save_on_worker_exit() -> None:
+    """
+    Para workers de multiprocessing (--batch -j N): salen con os._exit y atexit no corre.
+    Si no se cargó caché, guarda lo aprendido con un Finalize de multiprocessing, que sí corre
+    cuando el pool cierra el worker. Varios workers pueden escribir: el último reemplaza al resto.
+    """
+    if _enabled and not loaded:
+        from multiprocessing import util
+        util.Finalize(None, _save_at_exit, args=(None,), exitpriority=0)
+
+def warm(files: List[str]) -> int:
+    """Parsea 'files' en ambos modos para poblar los DFAs. Devuelve cuántos se parsearon."""
+    import contextlib, io
+    from .parser_util import parse_code, PARSE_MODES
+    n = 0
+    for path in files:
+        with open(path, "r", encoding="utf-8") as fh:
+            text = fh.read()
+        with contextlib.redirect_stderr(io.StringIO()):
+            for mode in PARSE_MODES:
+                parse_code(text, mode)
+        n += 1
+    return n
+
+def main() -> None:
+    import argparse
+    ap = argparse.ArgumentParser(description="Construye la caché de ATN/DFAs calentando con un corpus")
+    ap.add_argument("files", nargs="*", help="Corpus .cps (default: samples/*.cps)")
+    ap.add_argument("--cache-dir", default=None, help="Directorio de la caché (default: program/.cpscache)")
+    args = ap.parse_args()
+    configure(args.cache_dir, enabled=False)  # partimos de DFAs vacíos y no cargamos la vieja
+    files = args.files or sorted(glob.glob(os.path.join(PROGRAM_DIR, "samples", "*.cps")))
+    n = warm(files)
+    path = save(cache_dir=args.cache_dir)
+    _, parser_mod = _classes()
+    states = sum(len(d._states) for d in parser_mod.CompiscriptParser.decisionsToDFA)
+    print(f"{n} archivos, {states} estados DFA del parser → {path}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+# program/src/frontend/fast_lexer.py
+# Tokenizador de Compiscript con una sola regex (sin el runtime de ANTLR).
+# Reproduce los tokens de Compiscript.g4: mismas palabras clave, literales, operadores y
+# skips (espacios y comentarios). Posiciones como en el AST: (línea 1-based, columna 1-based).
+# Cualquier carácter que el lexer de ANTLR no reconocería levanta FastSyntaxError.
+from __future__ import annotations
+import re
+from typing import List, Tuple
+
+# (kind, text, pos). kind es el propio texto para palabras clave y operadores;
+# "id", "int_lit", "float_lit", "str_lit" para el resto y "eof" al final.
+Token = Tuple[str, str, Tuple[int, int]]
+
+KEYWORDS = frozenset((
+    "let", "var", "const", "function", "class", "print", "if", "else", "while", "do",
+    "for", "foreach", "in", "try", "catch", "switch", "case", "default", "break",
+    "continue", "return", "new", "this", "null", "true", "false",
+    "boolean", "integer", "float", "string",
+))
+
+_TOKEN_RE = re.compile(r"""
+    (?P<skip>[ \t\r\n]+|//[^\r\n]*|/\*.*?\*/)
+  | (?P<float_lit>[0-9]+\.[0-9]+(?:[eE][+\-]?[0-9]+)?|[0-9]+[eE][+\-]?[0-9]+)
+  | (?P<int_lit>[0-9]+)
+  | (?P<str_lit>"[^"\r\n]*")
+  | (?P<id>[a-zA-Z_][a-zA-Z0-9_]*)
+  | (?P<op>==|!=|<=|>=|&&|\|\||[{}()\[\];:,.=<>+\-*/%!?])
+""", re.VERBOSE | re.DOTALL)
+
+class FastSyntaxError(Exception):
+    """Entrada que el frontend rápido no acepta; el llamador recurre a ANTLR para diagnosticar."""
+    def __init__(self, message: str, pos: Tuple[int, int]):
+        super().__init__(f"{pos[0]}:{pos[1]} {message}")
+        self.pos = pos
+
+def tokenize(text: str) -> List[Token]:
+    """Lista de tokens terminada en ("eof", "<EOF>", pos). Los identificadores iguales son el mismo str."""
+    out: List[Token] = []
+    append = out.append
+    match = _TOKEN_RE.match
+    intern = {}.setdefault
+    line, line_start, i, n = 1, 0, 0, len(text)
+    while i < n:
+        m = match(text, i)
+        if m is None:
+            raise FastSyntaxError(f"carácter inesperado {text[i]!r}", (line, i - line_start + 1))
+        kind = m.lastgroup
+        end = m.end()
+        if kind == "skip":
+            nl = text.count("\n", i, end)
+            if nl:
+                line += nl
+                line_start = text.rfind("\n", i, end) + 1
+        else:
+            tok = m.group()
+            if kind == "op" or (kind == "id" and tok in KEYWORDS):
+                kind = tok
+            elif kind == "id":
+                # tabla de nombres de esta compilación: cada identificador vive una sola vez
+                # (nodos del AST y símbolos comparten el mismo str)
+                tok = intern(tok, tok)
+            append((kind, tok, (line, i - line_start + 1)))
+        i = end
+    append(("eof", "<EOF>", (line, n - line_start + 1)))
+    return out
@@ -0,0 +1,467 @@
+# program/src/frontend/fast_parser.py
+# Frontend alternativo: descenso recursivo para sentencias + Pratt para expresiones,
+# construyendo src/ast/nodes directamente (sin parse tree ni ASTBuilder).
+# Produce el mismo A.Program que ASTBuilder sobre el árbol de ANTLR, posiciones incluidas:
+#   - sentencias, Param, SwitchCase, ClassMember: primer token
+#   - BinaryOp / TernaryOp / Assign: inicio del operando izquierdo (con paréntesis)
+#   - UnaryOp: el operador; Call/Index/PropertyAccess: su '(' '[' '.'
+# Ante un error de sintaxis (o una sentencia que la gramática deja ambigua y no imitamos)
+# levanta FastSyntaxError: el llamador vuelve a ANTLR, que da el diagnóstico de siempre.
+from __future__ import annotations
+from typing import List, Optional
+
+from src.ast import nodes as A
+from .fast_lexer import FastSyntaxError, tokenize
+
+# binding power de los operadores binarios (todos asociativos a izquierda)
+_BINARY_BP = {
+    "||": 1,
+    "&&": 2,
+    "==": 3, "!=": 3,
+    "<": 4, "<=": 4, ">": 4, ">=": 4,
+    "+": 5, "-": 5,
+    "*": 6, "/": 6, "%": 6,
+}
+
+_BASE_TYPES = frozenset(("boolean", "integer", "float", "string", "id"))
+
+# nodos que vienen de leftHandSide (primaryAtom suffixOp*): los únicos asignables
+_LHS_NODES = (A.Identifier, A.ThisExpr, A.NewExpr, A.CallExpr, A.IndexExpr, A.PropertyAccessExpr)
+
+def parse_program(text: str) -> A.Program:
+    """Tokeniza y parsea 'text'. Levanta FastSyntaxError si no puede producir el AST."""
+    return _Parser(tokenize(text)).program()
+
+def parse_tokens(toks) -> A.Program:
+    """Como parse_program pero sobre tokens ya producidos por tokenize() (para medir lex aparte)."""
+    return _Parser(toks).program()
+
+class _Parser:
+    def __init__(self, toks):
+        self.toks = toks
+        self.i = 0
+        self.kind = toks[0][0]
+        self._anns = {}
+
+    # ===== utilidades =====
+
+    def _advance(self):
+        tok = self.toks[self.i]
+        self.i += 1
+        self.kind = self.toks[self.i][0] if self.i < len(self.toks) else "eof"
+        return tok
+
+    def _expect(self, kind: str):
+        if self.kind != kind:
+            self._fail(f"se esperaba {kind!r}")
+        return self._advance()
+
+    def _pos(self):
+        return self.toks[self.i][2]
+
+    def _fail(self, message: str):
+        kind, text, pos = self.toks[self.i]
+        raise FastSyntaxError(f"{message}, se encontró {text!r}", pos)
+
+    # ===== programa y sentencias =====
+
+    def program(self) -> A.Program:
+        out = A.Program(pos=self._pos())
+        stmts = out.statements
+        while self.kind != "eof":
+            stmts.append(self._statement())
+        return out
+
+    def _block(self) -> A.Block:
+        blk = A.Block(pos=self._expect("{")[2])
+        stmts = blk.statements
+        while self.kind != "}":
+            if self.kind == "eof":
+                self._fail("bloque sin cerrar")
+            stmts.append(self._statement())
+        self._advance()
+        return blk
+
+    def _statement(self) -> A.Stmt:
+        k = self.kind
+        handler = _STATEMENTS.get(k)
+        if handler is not None:
+            return handler(self)
+        return self._expression_statement()
+
+    def _type(self) -> str:
+        if self.kind not in _BASE_TYPES:
+            self._fail("se esperaba un tipo")
+        parts = [self._advance()[1]]
+        while self.kind == "[":
+            self._advance()
+            self._expect("]")
+            parts.append("[]")
+        ann = "".join(parts)
+        return self._anns.setdefault(ann, ann)  # una anotación igual, un solo str
+
+    def _var_decl(self) -> A.VarDecl:
+        pos = self._advance()[2]  # let | var
+        name = self._expect("id")[1]
+        type_ann = None
+        if self.kind == ":":
+            self._advance()
+            type_ann = self._type()
+        init = None
+        if self.kind == "=":
+            self._advance()
+            init = self._expression()
+        self._expect(";")
+        return A.VarDecl(name=name, type_ann=type_ann, init=init, is_const=False, pos=pos)
+
+    def _const_decl(self) -> A.VarDecl:
+        pos = self._advance()[2]
+        name = self._expect("id")[1]
+        type_ann = None
+        if self.kind == ":":
+            self._advance()
+            type_ann = self._type()
+        self._expect("=")
+        init = self._expression()
+        self._expect(";")
+        return A.VarDecl(name=name, type_ann=type_ann, init=init, is_const=True, pos=pos)
+
+    def _assignment_or_expr(self, allow_expr: bool) -> A.Stmt:
+        """
+        'assignment' de la gramática o, si allow_expr, 'expressionStatement'.
+        ANTLR prefiere assignment cuando ambas derivan la entrada:
+          x = e;      -> Assign(Identifier x, e)                     (alt 1)
+          o.p = e;    -> Assign(PropertyAccess(o, p) @inicio, e)     (alt 2)
+        Si el lado derecho tiene otra asignación "a la vista" (p. ej. a.b = c.d = 1;) la
+        gramática es ambigua de otra forma; no la imitamos y dejamos que decida ANTLR.
+        """
+        pos = self._pos()
+        e = self._expression()
+        self._expect(";")
+        if isinstance(e, A.Assign) and e.paren_pos is None:  # `(x = 1);` es expressionStatement
+            t = e.target
+            if isinstance(t, A.Identifier):
+                return e
+            if _assign_on_spine(e.value):
+                raise FastSyntaxError("asignación encadenada ambigua", pos)
+            if isinstance(t, A.PropertyAccessExpr):
+                t.pos = pos
+                return e
+        elif _assign_on_spine(e):
+            raise FastSyntaxError("asignación encadenada ambigua", pos)
+        if not allow_expr:
+            raise FastSyntaxError("se esperaba una asignación", pos)
+        return A.ExprStmt(expr=e, pos=pos)
+
+    def _expression_statement(self) -> A.Stmt:
+        return self._assignment_or_expr(allow_expr=True)
+
+    def _function_decl(self) -> A.FunctionDecl:
+        pos = self._advance()[2]
+        name = self._expect("id")[1]
+        self._expect("(")
+        params: List[A.Param] = []
+        if self.kind != ")":
+            while True:
+                ptok = self._expect("id")
+                pann = None
+                if self.kind == ":":
+                    self._advance()
+                    pann = self._type()
+                params.append(A.Param(name=ptok[1], type_ann=pann, pos=ptok[2]))
+                if self.kind != ",":
+                    break
+                self._advance()
+        self._expect(")")
+        ret_ann = None
+        if self.kind == ":":
+            self._advance()
+            ret_ann = self._type()
+        body = self._block()
+        return A.FunctionDecl(name=name, params=params, return_type=ret_ann, body=body,
+                              is_constructor=(name == "constructor"), pos=pos)
+
+    def _class_decl(self) -> A.ClassDecl:
+        pos = self._advance()[2]
+        name = self._expect("id")[1]
+        base = None
+        if self.kind == ":":
+            self._advance()
+            base = self._expect("id")[1]
+        self._expect("{")
+        members: List[A.ClassMember] = []
+        while self.kind != "}":
+            k = self.kind
+            mpos = self._pos()
+            if k == "function":
+                m = self._function_decl()
+            elif k == "let" or k == "var":
+                m = self._var_decl()
+            elif k == "const":
+                m = self._const_decl()
+            else:
+                self._fail("miembro de clase inválido")
+            members.append(A.ClassMember(member=m, pos=mpos))
+        self._advance()
+        return A.ClassDecl(name=name, base=base, members=members, pos=pos)
+
+    def _paren_expr(self) -> A.Expr:
+        self._expect("(")
+        e = self._expression()
+        self._expect(")")
+        return e
+
+    def _print(self) -> A.PrintStmt:
+        pos = self._advance()[2]
+        e = self._paren_expr()
+        self._expect(";")
+        return A.PrintStmt(expr=e, pos=pos)
+
+    def _if(self) -> A.IfStmt:
+        pos = self._advance()[2]
+        cond = self._paren_expr()
+        then_b = self._block()
+        else_b = None
+        if self.kind == "else":
+            self._advance()
+            else_b = self._block()
+        return A.IfStmt(cond=cond, then_block=then_b, else_block=else_b, pos=pos)
+
+    def _while(self) -> A.WhileStmt:
+        pos = self._advance()[2]
+        cond = self._paren_expr()
+        return A.WhileStmt(cond=cond, body=self._block(), pos=pos)
+
+    def _do_while(self) -> A.DoWhileStmt:
+        pos = self._advance()[2]
+        body = self._block()
+        self._expect("while")
+        cond = self._paren_expr()
+        self._expect(";")
+        return A.DoWhileStmt(body=body, cond=cond, pos=pos)
+
+    def _for(self) -> A.ForStmt:
+        pos = self._advance()[2]
+        self._expect("(")
+        k = self.kind
+        init = None
+        if k == "let" or k == "var":
+            init = self._var_decl()
+        elif k == ";":
+            self._advance()
+        else:
+            init = self._assignment_or_expr(allow_expr=False)
+        cond = self._expression() if self.kind != ";" else None
+        self._expect(";")
+        update = self._expression() if self.kind != ")" else None
+        self._expect(")")
+        if cond is None:
+            # ASTBuilder toma ctx.expression(0) como condición: `for (;; e)` deja 'e' en cond
+            cond, update = update, None
+        body = self._block()
+        return A.ForStmt(init=init, cond=cond, update=update, body=body, pos=pos)
+
+    def _foreach(self) -> A.ForeachStmt:
+        pos = self._advance()[2]
+        self._expect("(")
+        name = self._expect("id")[1]
+        self._expect("in")
+        iterable = self._expression()
+        self._expect(")")
+        return A.ForeachStmt(var_name=name, iterable=iterable, body=self._block(), pos=pos)
+
+    def _try(self) -> A.TryCatchStmt:
+        pos = self._advance()[2]
+        try_b = self._block()
+        self._expect("catch")
+        self._expect("(")
+        err = self._expect("id")[1]
+        self._expect(")")
+        return A.TryCatchStmt(try_block=try_b, err_name=err, catch_block=self._block(), pos=pos)
+
+    def _case_body(self) -> List[A.Stmt]:
+        body = []
+        while self.kind not in ("case", "default", "}"):
+            if self.kind == "eof":
+                self._fail("switch sin cerrar")
+            body.append(self._statement())
+        return body
+
+    def _switch(self) -> A.SwitchStmt:
+        pos = self._advance()[2]
+        expr = self._paren_expr()
+        self._expect("{")
+        cases: List[A.SwitchCase] = []
+        while self.kind == "case":
+            cpos = self._advance()[2]
+            ce = self._expression()
+            self._expect(":")
+            cases.append(A.SwitchCase(expr=ce, body=self._case_body(), pos=cpos))
+        default_body = None
+        if self.kind == "default":
+            self._advance()
+            self._expect(":")
+            default_body = self._case_body()
+        self._expect("}")
+        return A.SwitchStmt(expr=expr, cases=cases, default_body=default_body, pos=pos)
+
+    def _break(self) -> A.BreakStmt:
+        pos = self._advance()[2]
+        self._expect(";")
+        return A.BreakStmt(pos=pos)
+
+    def _continue(self) -> A.ContinueStmt:
+        pos = self._advance()[2]
+        self._expect(";")
+        return A.ContinueStmt(pos=pos)
+
+    def _return(self) -> A.ReturnStmt:
+        pos = self._advance()[2]
+        val = self._expression() if self.kind != ";" else None
+        self._expect(";")
+        return A.ReturnStmt(value=val, pos=pos)
+
+    # ===== expresiones =====
+
+    def _expression(self) -> A.Expr:
+        # assignmentExpr: lhs '=' assignmentExpr | conditionalExpr (asociativa a derecha)
+        start = self.i
+        e = self._conditional()
+        if self.kind == "=" and isinstance(e, _LHS_NODES) and self.toks[start][0] != "(":
+            self._advance()
+            return A.Assign(target=e, value=self._expression(), pos=self.toks[start][2])
+        return e
+
+    def _conditional(self) -> A.Expr:
+        pos = self._pos()
+        cond = self._binary(1)
+        if self.kind != "?":
+            return cond
+        self._advance()
+        then = self._expression()
+        self._expect(":")
+        other = self._expression()
+        return A.TernaryOp(cond=cond, then=then, other=other, pos=pos)
+
+    def _binary(self, min_bp: int) -> A.Expr:
+        pos = self._pos()
+        left = self._unary()
+        while True:
+            op = self.kind
+            bp = _BINARY_BP.get(op)
+            if bp is None or bp < min_bp:
+                return left
+            self._advance()
+            right = self._binary(bp + 1)
+            left = A.BinaryOp(op=op, left=left, right=right, pos=pos)
+
+    def _unary(self) -> A.Expr:
+        k = self.kind
+        if k == "-" or k == "!":
+            pos = self._advance()[2]
+            return A.UnaryOp(op=k, expr=self._unary(), pos=pos)
+        return self._primary()
+
+    def _primary(self) -> A.Expr:
+        k = self.kind
+        if k == "id":
+            _, name, pos = self._advance()
+            return self._suffixes(A.Identifier(name=name, pos=pos))
+        if k == "int_lit":
+            _, text, pos = self._advance()
+            return A.IntLiteral(value=int(text), pos=pos)
+        if k == "str_lit":
+            _, text, pos = self._advance()
+            return A.StringLiteral(value=text[1:-1], pos=pos)
+        if k == "float_lit":
+            _, text, pos = self._advance()
+            return A.FloatLiteral(value=float(text), pos=pos)
+        if k == "true" or k == "false":
+            _, _, pos = self._advance()
+            return A.BoolLiteral(value=(k == "true"), pos=pos)
+        if k == "null":
+            return A.NullLiteral(pos=self._advance()[2])
+        if k == "this":
+            return self._suffixes(A.ThisExpr(pos=self._advance()[2]))
+        if k == "new":
+            pos = self._advance()[2]
+            cname = self._expect("id")[1]
+            self._expect("(")
+            args = self._arguments(")")
+            return self._suffixes(A.NewExpr(class_name=cname, args=args, pos=pos))
+        if k == "(":
+            # los paréntesis no dejan nodo (solo paren_pos) y no admiten sufijos
+            pos = self._advance()[2]
+            e = self._expression()
+            self._expect(")")
+            e.paren_pos = pos
+            return e
+        if k == "[":
+            pos = self._advance()[2]
+            return A.ArrayLiteral(elements=self._arguments("]"), pos=pos)
+        self._fail("se esperaba una expresión")
+
+    def _arguments(self, close: str) -> List[A.Expr]:
+        """expression (',' expression)* opcional, consumiendo el cierre."""
+        args: List[A.Expr] = []
+        if self.kind != close:
+            args.append(self._expression())
+            while self.kind == ",":
+                self._advance()
+                args.append(self._expression())
+        self._expect(close)
+        return args
+
+    def _suffixes(self, cur: A.Expr) -> A.Expr:
+        while True:
+            k = self.kind
+            if k == "(":
+                pos = self._advance()[2]
+                cur = A.CallExpr(func=cur, args=self._arguments(")"), pos=pos)
+            elif k == "[":
+                pos = self._advance()[2]
+                idx = self._expression()
+                self._expect("]")
+                cur = A.IndexExpr(array=cur, index=idx, pos=pos)
+            elif k == ".":
+                pos = self._advance()[2]
+                cur = A.PropertyAccessExpr(obj=cur, prop=self._expect("id")[1], pos=pos)
+            else:
+                return cur
+
+def _assign_on_spine(e: Optional[A.Expr]) -> bool:
+    """¿Hay una asignación en el borde derecho de 'e' (donde un `.p = v` la partiría)?"""
+    while e is not None and e.paren_pos is None:  # entre paréntesis no se puede partir
+        if isinstance(e, A.Assign):
+            return True
+        if isinstance(e, A.BinaryOp):
+            e = e.right
+        elif isinstance(e, A.UnaryOp):
+            e = e.expr
+        elif isinstance(e, A.TernaryOp):
+            if _assign_on_spine(e.then):
+                return True
+            e = e.other
+        else:
+            return False
+    return False
+
+_STATEMENTS = {
+    "let": _Parser._var_decl,
+    "var": _Parser._var_decl,
+    "const": _Parser._const_decl,
+    "function": _Parser._function_decl,
+    "class": _Parser._class_decl,
+    "print": _Parser._print,
+    "{": _Parser._block,
+    "if": _Parser._if,
+    "while": _Parser._while,
+    "do": _Parser._do_while,
+    "for": _Parser._for,
+    "foreach": _Parser._foreach,
+    "try": _Parser._try,
+    "switch": _Parser._switch,
+    "break": _Parser._break,
+    "continue": _Parser._continue,
+    "return": _Parser._return,
+}
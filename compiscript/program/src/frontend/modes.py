@@ -0,0 +1,14 @@
+# program/src/frontend/modes.py
+# Modos de parseo (sin dependencias: cli.py los usa en argparse antes de cargar ANTLR).
+#   two-stage: primero SLL + BailErrorStrategy (rápido, sin reporte); si aborta,
+#              se reparsea con LL completo y reporte/recuperación normal de errores.
+#   ll:        solo LL completo (comportamiento original de ANTLR).
+PARSE_MODES = ("two-stage", "ll")
+DEFAULT_PARSE_MODE = "two-stage"
+
+# Frontends que construyen el AST (src/ast/nodes.py) sobre el que corren semántica e IR:
+#   antlr: parse tree de ANTLR + ASTBuilder.
+#   fast:  tokenizador por regex + parser Pratt (fast_parser.py), sin runtime de ANTLR;
+#          si no acepta la entrada se usa antlr, que reporta los errores de sintaxis.
+FRONTENDS = ("antlr", "fast")
+DEFAULT_FRONTEND = "antlr"
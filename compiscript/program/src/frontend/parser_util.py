@@ -1,13 +1,71 @@
 # program/src/frontend/parser_util.py
 from __future__ import annotations
-from antlr4 import InputStream, CommonTokenStream
+from antlr4 import InputStream, CommonTokenStream, BailErrorStrategy, PredictionMode
+from antlr4.error.ErrorStrategy import DefaultErrorStrategy
+from antlr4.error.ErrorListener import ConsoleErrorListener
+from antlr4.error.Errors import ParseCancellationException
 from CompiscriptLexer import CompiscriptLexer
 from CompiscriptParser import CompiscriptParser
 
-def parse_code(text: str):
+from .modes import PARSE_MODES, DEFAULT_PARSE_MODE
+from . import atn_cache
+
+# ATN + DFAs ya calientes desde disco si el punto de entrada lo pidió (ver atn_cache.py)
+atn_cache.install()
+
+_T_DOT = CompiscriptParser.literalNames.index("'.'")
+_T_ASSIGN = CompiscriptParser.literalNames.index("'='")
+
+def _has_property_assignment(tokens: CommonTokenStream) -> bool:
+    """
+    `obj.p = v;` tiene dos derivaciones en la gramática (assignment alt 2 y PropertyAssignExpr).
+    SLL no ve el contexto de `assignment` y siempre elige mal ahí, así que en esos archivos
+    la etapa SLL es trabajo perdido: mejor ir directo a LL.
+    """
+    tokens.fill()
+    toks = tokens.tokens
+    for i in range(len(toks) - 2):
+        if toks[i].type == _T_DOT and toks[i + 1].type == CompiscriptParser.Identifier and toks[i + 2].type == _T_ASSIGN:
+            return True
+    return False
+
+def parse_code(text: str, mode: str = DEFAULT_PARSE_MODE, stats=None):
+    """
+    Lexea y parsea 'text'. Devuelve (parser, tree).
+    parser.parse_stage indica qué predicción produjo el árbol: "sll" o "ll".
+    Con 'stats' (CompileStats) se miden "lex" y "parse" por separado y se cuentan los tokens.
+    """
+    if mode not in PARSE_MODES:
+        raise ValueError(f"Modo de parseo desconocido: {mode}")
     inp = InputStream(text)
     lexer = CompiscriptLexer(inp)
     tokens = CommonTokenStream(lexer)
+    if stats is not None:
+        with stats.phase("lex"):
+            tokens.fill()
+        stats.count("tokens", len(tokens.tokens))
+        with stats.phase("parse"):
+            return _parse_tokens(tokens, mode)
+    return _parse_tokens(tokens, mode)
+
+def _parse_tokens(tokens: CommonTokenStream, mode: str):
     parser = CompiscriptParser(tokens)
-    tree = parser.program()
+    parser.parse_stage = "ll"
+    if mode == "ll" or _has_property_assignment(tokens):
+        return parser, parser.program()
+
+    # Etapa 1: SLL. Para entradas válidas casi siempre basta y evita la predicción LL completa.
+    parser._interp.predictionMode = PredictionMode.SLL
+    parser.removeErrorListeners()
+    parser._errHandler = BailErrorStrategy()
+    try:
+        tree = parser.program()
+        parser.parse_stage = "sll"
+    except ParseCancellationException:
+        # Etapa 2: LL completo sobre los mismos tokens, con recuperación y reporte normal
+        parser.reset()
+        parser.addErrorListener(ConsoleErrorListener.INSTANCE)
+        parser._errHandler = DefaultErrorStrategy()
+        parser._interp.predictionMode = PredictionMode.LL
+        tree = parser.program()
     return parser, tree
@@ -1,9 +1,9 @@
 # program/src/ir/adapter.py
 from __future__ import annotations
 from dataclasses import dataclass, field
-from typing import List, Tuple, Any, Optional, Dict
+from typing import Callable, List, Tuple, Any, Optional, Dict, Iterable, Set
 
-from .model import Program
+from .model import Program, Function, Name, Operand, Const, Call, NewObject
 from .context import IRGenContext
 from .temps import TempAllocator, LabelAllocator
 from .gen_stmt import gen_stmt
@@ -20,16 +20,24 @@ class IRAdapter:
     Adaptador fino: tu visitor semántico/AST traduce nodos a tuplas
     y llama a este adaptador para emitir IR.
     Además, aquí gestionamos un FrameLayout por función (opcional).
+    Con fold=True gen_expr pliega constantes (fold.py); por defecto el TAC sale literal.
+    Con ssa=True cada función pasa por SSA (ssa.py) al emitirse: to_ssa, las pasadas de
+    'ssa_passes' (reciben la Function en SSA) y from_ssa.
+    optimize() corre la propagación de constantes condicional (sccp.py) sobre lo ya emitido.
     """
     program: Program
     ctx: IRGenContext
     frames: Dict[str, FrameLayout] = field(default_factory=dict)   # <-- NUEVO
+    ssa: bool = False
+    ssa_passes: List[Callable[[Function], Any]] = field(default_factory=list)
 
     @classmethod
-    def new(cls) -> IRAdapter:
+    def new(cls, *, fold: bool = False, ssa: bool = False,
+            ssa_passes: Optional[List[Callable[[Function], Any]]] = None) -> IRAdapter:
         prog = Program()
-        ctx = IRGenContext(program=prog, temp_alloc=TempAllocator(), label_alloc=LabelAllocator())
-        return cls(program=prog, ctx=ctx)
+        ctx = IRGenContext(program=prog, temp_alloc=TempAllocator(), label_alloc=LabelAllocator(),
+                           fold=fold)
+        return cls(program=prog, ctx=ctx, ssa=ssa, ssa_passes=list(ssa_passes or []))
 
     def emit_function(
         self,
@@ -66,14 +74,96 @@ class IRAdapter:
         self.ctx.temp_alloc.reset()
         self.ctx.label_alloc.reset()
 
-        self.ctx.begin_function(name, params)
+        fn = self.ctx.begin_function(name, params)
         if body and isinstance(body, tuple) and body[0] == 'block':
             gen_stmt(body, self.ctx)
         else:
             gen_stmt(('block', body if isinstance(body, list) else [body]), self.ctx)
         self.ctx.end_function()
+        if self.ssa:
+            self._through_ssa(fn, params, locals)
         # (Opcional) podrías usar self.frames[name].frame_size_bytes() para prolog/epilog en ASM.
-        
+
+    def _through_ssa(self, fn: Function, params: List[str], locals: List[str]) -> None:
+        from .ssa import to_ssa, from_ssa, base_name
+        # se renombran parámetros, locales y los contadores que inventa el lowering (__fe_*);
+        # las globales no (otra función las puede tocar en un call)
+        to_ssa(fn, _local_names(fn, [*params, *locals]))
+        for run in self.ssa_passes:
+            run(fn)
+        from_ssa(fn)
+        # versiones que interfieren y no volvieron a su nombre: necesitan slot propio
+        fl = self.frames[fn.name]
+        extra = sorted({d.name for bb in fn.blocks for ins in bb.instrs
+                        for d in [getattr(ins, "dst", None)]
+                        if isinstance(d, Name) and base_name(d.name) != d.name
+                        and d.name not in fl.locals})
+        if extra:
+            grown = FrameLayout(name=fl.name)
+            for p in fl.params:
+                grown.add_param(p)
+            for v in [*fl.locals, *extra]:
+                grown.add_local(v)
+            grown.seal()
+            self.frames[fn.name] = grown
+
+    def optimize(self, consts: Iterable[str] = (), captured: Iterable[str] = ()) -> Tuple[int, int]:
+        """
+        SCCP sobre cada función emitida. 'consts' son las const globales: una llamada no las
+        cambia y, si main las inicializa con una constante antes de cualquier llamada, ese
+        valor vale desde la entrada de las demás funciones. 'captured' son los locales que una
+        función anidada puede leer o escribir: se tratan como globales (un call los cambia).
+        Devuelve (instrucciones quitadas, bloques quitados).
+        """
+        from .sccp import sccp
+        consts = set(consts)
+        captured = set(captured)
+        inits: Dict[str, List[Operand]] = {}
+        for fn in self.program.functions:
+            for bb in fn.blocks:
+                for ins in bb.instrs:
+                    d = getattr(ins, "dst", None)
+                    if isinstance(d, Name) and d.name in consts:
+                        inits.setdefault(d.name, []).append(getattr(ins, "src", None))
+        known = {k: v[0] for k, v in inits.items() if len(v) == 1 and isinstance(v[0], Const)}
+        known = {k: c for k, c in known.items() if k in _initialized_before_calls(self.program)}
+        instrs = blocks = 0
+        for fn in self.program.functions:
+            fl = self.frames.get(fn.name)
+            own = [*fl.params, *fl.locals] if fl is not None else list(fn.params)
+            # main corre los inicializadores: ahí la const vale recién después de asignarse
+            i, b = sccp(fn, _local_names(fn, own) - captured, consts,
+                        None if fn.name == "main" else known)
+            instrs += i
+            blocks += b
+        return instrs, blocks
+
+
+def _initialized_before_calls(program: Program) -> Set[str]:
+    """Globales que main asigna antes de su primer call/new (ninguna otra función corrió aún)."""
+    main = next((fn for fn in program.functions if fn.name == "main"), None)
+    out: Set[str] = set()
+    if main is None:
+        return out
+    for bb in main.blocks:
+        for ins in bb.instrs:
+            if isinstance(ins, (Call, NewObject)):
+                return out
+            d = getattr(ins, "dst", None)
+            if isinstance(d, Name):
+                out.add(d.name)
+    return out
+
+def _local_names(fn: Function, names: Iterable[str]) -> Set[str]:
+    """'names' más los contadores que inventa el lowering (__fe_*): nadie más los ve."""
+    out = set(names)
+    for bb in fn.blocks:
+        for ins in bb.instrs:
+            d = getattr(ins, "dst", None)
+            if isinstance(d, Name) and d.name.startswith("__fe_"):
+                out.add(d.name)
+    return out
+
 
 def lower_program(functions: List[Tuple[str, List[str], Stmt]]) -> Program:
     """
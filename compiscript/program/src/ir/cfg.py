@@ -0,0 +1,139 @@
+# program/src/ir/cfg.py
+# Grafo de flujo de control de una Function.
+#
+# El generador emite LabelInstr/Goto/IfGoto en línea, así que un BasicBlock de Function.blocks
+# puede contener varios bloques básicos. build_cfg corta en cada LabelInstr y después de cada
+# terminador (Goto, IfGoto, Return): lo que empieza con LabelInstr toma esa etiqueta y lo que
+# queda tras un terminador sin etiqueta es un bloque 'implicit' (solo se llega por fallthrough
+# o es código muerto). Un bloque que no hace falta cortar se reutiliza tal cual.
+#
+# Los bloques se numeran en orden de layout; succs/preds son listas de índices y hay un nodo
+# de salida virtual con índice len(blocks) al que llegan los Return y el final de la función.
+# Function.cfg() lo cachea; add/new_block/set_blocks/invalidate lo tiran.
+from __future__ import annotations
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set
+
+from .model import (
+    Function, BasicBlock, Label, Instr, LabelInstr, Goto, IfGoto, Return, TERMINATORS,
+)
+
+@dataclass
+class CFG:
+    fn: Function
+    blocks: List[BasicBlock]
+    succs: List[List[int]]          # len(blocks) + 1: el último es la salida
+    preds: List[List[int]]
+    index: Dict[str, int]           # nombre de etiqueta → bloque
+    entry: int = 0
+    _rpo: Optional[List[int]] = field(default=None, repr=False)
+
+    @property
+    def exit(self) -> int:
+        return len(self.blocks)
+
+    def __len__(self) -> int:
+        return len(self.blocks)
+
+    def block_of(self, label: Label) -> int:
+        return self.index[label.name]
+
+    def rpo(self) -> List[int]:
+        """Postorden inverso desde la entrada (solo nodos alcanzables; incluye la salida si se llega)."""
+        if self._rpo is None:
+            succs = self.succs
+            seen = [False] * len(succs)
+            post: List[int] = []
+            seen[self.entry] = True
+            stack = [(self.entry, iter(succs[self.entry]))]
+            while stack:
+                b, it = stack[-1]
+                for s in it:
+                    if not seen[s]:
+                        seen[s] = True
+                        stack.append((s, iter(succs[s])))
+                        break
+                else:
+                    stack.pop()
+                    post.append(b)
+            post.reverse()
+            self._rpo = post
+        return self._rpo
+
+    def reachable(self) -> Set[int]:
+        return set(self.rpo())
+
+    def commit(self, blocks: Optional[List[BasicBlock]] = None) -> None:
+        """Escribe 'blocks' (o los bloques ya cortados) en la función; el CFG queda invalidado."""
+        self.fn.set_blocks(list(self.blocks if blocks is None else blocks))
+
+
+def _leaders(instrs: List[Instr]) -> List[int]:
+    out = [0]
+    prev: Optional[Instr] = None
+    for i, ins in enumerate(instrs):
+        if i and (isinstance(ins, LabelInstr) or isinstance(prev, TERMINATORS)):
+            out.append(i)
+        prev = ins
+    return out
+
+def split_blocks(fn: Function) -> List[BasicBlock]:
+    """Bloques básicos reales de 'fn' en orden de layout (no modifica la función)."""
+    out: List[BasicBlock] = []
+    fresh = 0
+    for bb in fn.blocks:
+        cuts = _leaders(bb.instrs)
+        if len(cuts) == 1:
+            out.append(bb)
+            continue
+        cuts.append(len(bb.instrs))
+        base = bb.label.name
+        for a, b in zip(cuts, cuts[1:]):
+            first = bb.instrs[a]
+            if isinstance(first, LabelInstr):
+                lab, implicit = first.label, False
+                base = lab.name
+            elif a == 0:
+                lab, implicit = bb.label, bb.implicit
+            else:
+                # nombre derivado de la última etiqueta real: L1_then.2, L0.1, ...
+                fresh += 1
+                lab, implicit = Label(f"{base}.{fresh}"), True
+            out.append(BasicBlock(label=lab, instrs=bb.instrs[a:b], implicit=implicit, owner=fn))
+    return out
+
+def build_cfg(fn: Function) -> CFG:
+    blocks = split_blocks(fn)
+    n = len(blocks)
+    index: Dict[str, int] = {}
+    for i, bb in enumerate(blocks):
+        index.setdefault(bb.label.name, i)
+        # un bloque puede traer más de una etiqueta si alguien armó los bloques a mano
+        for ins in bb.instrs:
+            if isinstance(ins, LabelInstr):
+                index.setdefault(ins.label.name, i)
+
+    def target(lab: Label) -> int:
+        try:
+            return index[lab.name]
+        except KeyError:
+            raise ValueError(f"Salto a etiqueta desconocida '{lab.name}' en {fn.name}") from None
+
+    succs: List[List[int]] = [[] for _ in range(n + 1)]
+    preds: List[List[int]] = [[] for _ in range(n + 1)]
+    for i, bb in enumerate(blocks):
+        last = bb.instrs[-1] if bb.instrs else None
+        if isinstance(last, Goto):
+            out = [target(last.target)]
+        elif isinstance(last, IfGoto):
+            out = [target(last.target), i + 1]
+        elif isinstance(last, Return):
+            out = [n]
+        else:
+            out = [i + 1]
+        if len(out) == 2 and out[0] == out[1]:
+            out.pop()
+        succs[i] = out
+        for s in out:
+            preds[s].append(i)
+    return CFG(fn=fn, blocks=blocks, succs=succs, preds=preds, index=index)
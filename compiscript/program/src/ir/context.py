@@ -16,6 +16,10 @@ class IRGenContext:
     current_function: Optional[Function] = None
     current_block: Optional[BasicBlock] = None
 
+    # plegado de constantes en gen_expr (fold.py); apagado deja el TAC literal (tests golden)
+    fold: bool = False
+    folded: int = 0   # operaciones que no se emitieron
+
     # pila para manejar break y continue: (label_break, label_continue)
     _loop_stack: List[Tuple[Label, Label]] = field(default_factory=list)
 
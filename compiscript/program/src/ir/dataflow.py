@@ -0,0 +1,365 @@
+# program/src/ir/dataflow.py
+# Análisis de flujo de datos sobre el CFG (cfg.py) con conjuntos como bitsets (int de Python).
+#
+# Universe numera densamente lo que se analiza (variables, definiciones, expresiones o
+# bloques): el elemento i es el bit 1 << i, así que unión/intersección/diferencia son una
+# operación sobre enteros, sin sets ni dicts por bloque.
+# solve() es el solver genérico gen/kill con worklist, hacia adelante o hacia atrás y con
+# meet unión o intersección. Clientes: liveness, reaching_definitions, available_expressions
+# y dominators. Variables: Temp y Name por nombre (el type_hint no cuenta).
+from __future__ import annotations
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Generic, Hashable, Iterable, List, Optional, Tuple, TypeVar
+
+from .cfg import CFG
+from .model import (
+    Function, Instr, Operand, Temp, Name,
+    Assign, UnaryOp, BinOp, IfGoto, Call, Return, Load, Store, GetProp, SetProp, NewObject, Phi,
+)
+
+K = TypeVar("K", bound=Hashable)
+
+class Universe(Generic[K]):
+    """Numeración densa elemento ↔ bit."""
+    __slots__ = ("items", "index")
+
+    def __init__(self, items: Iterable[K] = ()) -> None:
+        self.items: List[K] = []
+        self.index: Dict[K, int] = {}
+        for x in items:
+            self.add(x)
+
+    def add(self, x: K) -> int:
+        i = self.index.get(x)
+        if i is None:
+            i = self.index[x] = len(self.items)
+            self.items.append(x)
+        return i
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    @property
+    def full(self) -> int:
+        return (1 << len(self.items)) - 1
+
+    def bits(self, xs: Iterable[K]) -> int:
+        b = 0
+        for x in xs:
+            b |= 1 << self.index[x]
+        return b
+
+    def decode(self, b: int) -> List[K]:
+        out: List[K] = []
+        items = self.items
+        while b:
+            low = b & -b
+            out.append(items[low.bit_length() - 1])
+            b ^= low
+        return out
+
+
+# ---------- usos y definiciones por instrucción ----------
+
+def _is_var(o: Any) -> bool:
+    return isinstance(o, (Temp, Name))
+
+def instr_uses(ins: Instr) -> Tuple[Operand, ...]:
+    """Operandos leídos por 'ins' (incluye Const; filtrar con isinstance si hace falta)."""
+    t = type(ins)
+    if t is Assign:    return (ins.src,)
+    if t is BinOp:     return (ins.left, ins.right)
+    if t is UnaryOp:   return (ins.value,)
+    if t is IfGoto:    return (ins.cond,)
+    if t is Call:      return tuple(ins.args)
+    if t is Return:    return () if ins.value is None else (ins.value,)
+    if t is Load:      return (ins.array, ins.index)
+    if t is Store:     return (ins.array, ins.index, ins.value)
+    if t is GetProp:   return (ins.obj,)
+    if t is SetProp:   return (ins.obj, ins.value)
+    if t is NewObject: return tuple(ins.args)
+    if t is Phi:       return tuple(o for _, o in ins.args)
+    return ()
+
+# campos de operando leídos, por tipo de instrucción (Call/NewObject/Phi van aparte)
+_USE_FIELDS = {
+    Assign: ("src",), BinOp: ("left", "right"), UnaryOp: ("value",), IfGoto: ("cond",),
+    Return: ("value",), Load: ("array", "index"), Store: ("array", "index", "value"),
+    GetProp: ("obj",), SetProp: ("obj", "value"),
+}
+
+def rewrite_uses(ins: Instr, f: Callable[[Operand], Operand]) -> None:
+    """Reemplaza en su lugar cada operando leído 'o' por f(o) (los φ no: sus args van por arista)."""
+    t = type(ins)
+    if t is Call or t is NewObject:
+        ins.args = [f(o) for o in ins.args]
+        return
+    for name in _USE_FIELDS.get(t, ()):
+        o = getattr(ins, name)
+        if o is not None:
+            setattr(ins, name, f(o))
+
+def instr_def(ins: Instr) -> Optional[Operand]:
+    """Variable escrita por 'ins' (Store/SetProp escriben memoria, no una variable)."""
+    d = getattr(ins, "dst", None)
+    return d if _is_var(d) else None
+
+
+class VarNumbering(Universe[Operand]):
+    """Universe de variables: Temp/Name normalizados sin type_hint."""
+    __slots__ = ("_keys",)
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._keys: Dict[Tuple[type, str], int] = {}
+
+    def var(self, o: Operand) -> int:
+        k = (o.__class__, o.name)
+        i = self._keys.get(k)
+        if i is None:
+            i = self._keys[k] = self.add(o.__class__(o.name))
+        return i
+
+
+# ---------- solver ----------
+
+@dataclass
+class Solution:
+    ins: List[int]             # por nodo del CFG (incluida la salida virtual)
+    outs: List[int]
+    iterations: int = 0        # nodos procesados por el worklist
+
+def solve(cfg: CFG, gen: List[int], kill: List[int], *, forward: bool = True,
+          union: bool = True, boundary: int = 0, top: int = 0) -> Solution:
+    """
+    Punto fijo de out = gen | (in & ~kill) (hacia atrás se intercambian in/out).
+    'boundary' es el valor en la entrada (o en la salida si forward=False); 'top' es el
+    valor inicial con meet intersección (el universo completo) y lo ignora la unión.
+    """
+    n = len(cfg.succs)
+    if forward:
+        src_of, dst_of, start = cfg.preds, cfg.succs, cfg.entry
+    else:
+        src_of, dst_of, start = cfg.succs, cfg.preds, cfg.exit
+    init = 0 if union else top
+    # 'before' es lo que entra a la transferencia (in si forward) y 'after' lo que sale
+    before = [init] * n
+    after = [init] * n
+    before[start] = boundary
+    # orden: RPO (y lo inalcanzable al final) hacia adelante; al revés hacia atrás
+    order = cfg.rpo()
+    if len(order) < n:
+        seen = set(order)
+        order = order + [b for b in range(n) if b not in seen]
+    if not forward:
+        order = order[::-1]
+    for b in range(n):
+        after[b] = gen[b] | (before[b] & ~kill[b])
+    # todo nodo pasa al menos una vez; después solo vuelve si cambió algo que lee
+    work = deque(order)
+    queued = [True] * n
+    iters = 0
+    while work:
+        b = work.popleft()
+        queued[b] = False
+        iters += 1
+        # el nodo inicial parte de 'boundary' (y aún así junta sus predecesores, si tiene)
+        if union:
+            x = boundary if b == start else 0
+            for p in src_of[b]:
+                x |= after[p]
+        else:
+            x = boundary if b == start else top
+            for p in src_of[b]:
+                x &= after[p]
+        before[b] = x
+        y = gen[b] | (x & ~kill[b])
+        if y != after[b]:
+            after[b] = y
+            for s in dst_of[b]:
+                if not queued[s]:
+                    queued[s] = True
+                    work.append(s)
+    if forward:
+        return Solution(before, after, iters)
+    return Solution(after, before, iters)
+
+
+@dataclass
+class Analysis(Generic[K]):
+    universe: Universe
+    solution: Solution
+    extra: Dict[str, Any] = field(default_factory=dict)
+
+    def in_set(self, b: int) -> List[K]:
+        return self.universe.decode(self.solution.ins[b])
+
+    def out_set(self, b: int) -> List[K]:
+        return self.universe.decode(self.solution.outs[b])
+
+
+# ---------- clientes ----------
+
+def liveness(fn: Function, live_out: Iterable[Operand] = ()) -> Analysis[Operand]:
+    """
+    Variables vivas a la entrada/salida de cada bloque. 'live_out': vivas al salir de la función.
+    Un argumento de φ se usa al final de su predecesor, no a la entrada del bloque del φ:
+    extra["phi_uses"][p] son los que p entrega a sus sucesores (vivos a su salida, aunque
+    no estén en outs[p]).
+    """
+    cfg = fn.cfg()
+    vn = VarNumbering()
+    n = len(cfg.succs)
+    gen = [0] * n
+    kill = [0] * n
+    phi_uses = [0] * n
+    for b, bb in enumerate(cfg.blocks):
+        use = dfn = 0
+        for ins in bb.instrs:
+            if type(ins) is Phi:
+                for lab, o in ins.args:
+                    if _is_var(o):
+                        p = cfg.index.get(lab.name)
+                        if p is not None:
+                            phi_uses[p] |= 1 << vn.var(o)
+                dfn |= 1 << vn.var(ins.dst)
+                continue
+            for o in instr_uses(ins):
+                if _is_var(o):
+                    bit = 1 << vn.var(o)
+                    if not dfn & bit:
+                        use |= bit
+            d = instr_def(ins)
+            if d is not None:
+                dfn |= 1 << vn.var(d)
+        gen[b], kill[b] = use, dfn
+    for p in range(n):
+        gen[p] |= phi_uses[p] & ~kill[p]
+    boundary = 0
+    for o in live_out:
+        boundary |= 1 << vn.var(o)
+    return Analysis(vn, solve(cfg, gen, kill, forward=False, boundary=boundary), {"phi_uses": phi_uses})
+
+def _upward_exposed(cfg: CFG, vn: VarNumbering) -> int:
+    """Variables leídas en algún bloque antes de definirse en él (las que cruzan bloques)."""
+    out = 0
+    for bb in cfg.blocks:
+        dfn = 0
+        for ins in bb.instrs:
+            for o in instr_uses(ins):
+                if _is_var(o):
+                    bit = 1 << vn.var(o)
+                    if not dfn & bit:
+                        out |= bit
+            d = instr_def(ins)
+            if d is not None:
+                dfn |= 1 << vn.var(d)
+    return out
+
+def reaching_definitions(fn: Function, all_defs: bool = False) -> Analysis[Tuple[int, int]]:
+    """
+    Definiciones (bloque, posición) que llegan a cada bloque. Por defecto solo las de
+    variables que algún bloque lee sin definirlas antes (los temporales de una expresión
+    nacen y mueren en su bloque: meterlos haría crecer cada bitset con el tamaño del
+    programa). all_defs=True las numera todas.
+    """
+    cfg = fn.cfg()
+    vn = VarNumbering()
+    wanted = -1 if all_defs else _upward_exposed(cfg, vn)
+    defs: Universe[Tuple[int, int]] = Universe()
+    def_var: List[int] = []
+    per_block: List[List[int]] = []     # defs de cada bloque, en orden
+    for b, bb in enumerate(cfg.blocks):
+        row: List[int] = []
+        for k, ins in enumerate(bb.instrs):
+            d = instr_def(ins)
+            if d is not None:
+                v = vn.var(d)
+                if wanted >> v & 1:
+                    row.append(defs.add((b, k)))
+                    def_var.append(v)
+        per_block.append(row)
+    # defs de cada variable como máscara
+    of_var = [0] * len(vn)
+    for i, v in enumerate(def_var):
+        of_var[v] |= 1 << i
+    n = len(cfg.succs)
+    gen = [0] * n
+    kill = [0] * n
+    for b, row in enumerate(per_block):
+        g = kl = 0
+        for i in row:
+            m = of_var[def_var[i]]
+            g = (g & ~m) | (1 << i)
+            kl |= m
+        gen[b], kill[b] = g, kl & ~g
+    return Analysis(defs, solve(cfg, gen, kill), {"vars": vn, "def_var": def_var, "of_var": of_var})
+
+def _expr_key(ins: Instr, vn: VarNumbering) -> Optional[Tuple[Any, ...]]:
+    def k(o: Operand) -> Any:
+        return ("v", vn.var(o)) if _is_var(o) else o
+    t = type(ins)
+    if t is BinOp:
+        return (ins.op, k(ins.left), k(ins.right))
+    if t is UnaryOp:
+        return (ins.op, k(ins.value))
+    return None
+
+def available_expressions(fn: Function) -> Analysis[Tuple[Any, ...]]:
+    """Expresiones BinOp/UnaryOp ya calculadas en todo camino y sin operandos redefinidos."""
+    cfg = fn.cfg()
+    vn = VarNumbering()
+    exprs: Universe[Tuple[Any, ...]] = Universe()
+    mentions: List[int] = []       # variable → máscara de expresiones que la leen
+    per_instr: List[List[Tuple[int, int]]] = []   # por bloque: (expr o -1, var definida o -1)
+    for bb in cfg.blocks:
+        row = []
+        for ins in bb.instrs:
+            key = _expr_key(ins, vn)
+            e = -1
+            if key is not None:
+                e = exprs.add(key)
+                for part in key[1:]:
+                    if isinstance(part, tuple) and part[0] == "v":
+                        while len(mentions) <= part[1]:
+                            mentions.append(0)
+                        mentions[part[1]] |= 1 << e
+            d = instr_def(ins)
+            row.append((e, vn.var(d) if d is not None else -1))
+        per_instr.append(row)
+    mentions.extend([0] * (len(vn) - len(mentions)))
+    n = len(cfg.succs)
+    gen = [0] * n
+    kill = [0] * n
+    for b, row in enumerate(per_instr):
+        g = kl = 0
+        for e, v in row:
+            if e >= 0:
+                g |= 1 << e
+            if v >= 0:
+                m = mentions[v]
+                g &= ~m
+                kl |= m
+        gen[b], kill[b] = g, kl
+    return Analysis(exprs, solve(cfg, gen, kill, union=False, top=exprs.full), {"vars": vn})
+
+def dominators(fn: Function) -> Analysis[int]:
+    """Dom(b) como conjunto de índices de bloque; 'idom' en extra (None para la entrada)."""
+    cfg = fn.cfg()
+    n = len(cfg.succs)
+    # bits en orden RPO: un dominador siempre va antes que lo que domina, así que el
+    # dominador inmediato es el bit más alto de los dominadores estrictos
+    rpo = cfg.rpo()
+    blocks: Universe[int] = Universe(rpo)
+    for b in range(n):
+        blocks.add(b)
+    gen = [1 << blocks.index[b] for b in range(n)]
+    kill = [0] * n
+    sol = solve(cfg, gen, kill, union=False, top=blocks.full)
+    idom: List[Optional[int]] = [None] * n
+    for b in rpo:
+        strict = sol.outs[b] & ~gen[b]
+        if strict:
+            idom[b] = blocks.items[strict.bit_length() - 1]
+    return Analysis(blocks, sol, {"idom": idom})
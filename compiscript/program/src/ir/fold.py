@@ -0,0 +1,132 @@
+# program/src/ir/fold.py
+# Plegado de constantes y simplificaciones algebraicas sobre operandos del TAC.
+#
+# fold_binary/fold_unary devuelven el Operand que reemplaza a la operación (una Const o uno
+# de los operandos) o None si hay que emitirla. Los tipos salen de sema/types.py: la
+# combinación tiene que ser válida en BINARY_OPS (integer + string no se pliega: eso ya es un
+# error semántico). Semántica de ejecución (words de 64 bits, ver runtime/frame.py):
+#   - integer / integer trunca hacia cero y % toma el signo del dividendo (como idiv);
+#   - un resultado entero fuera de 64 bits, una división por cero o un float no finito no
+#     se pliega: queda para tiempo de ejecución.
+# Identidades: x + 0, x - 0, x * 1, x / 1 (valen para integer y float, salvo el signo de un
+# -0.0 + 0), x * 0 y x % 1 solo si x es integer conocido (type_hint), y las de && / || con
+# una constante booleana (el otro operando ya está evaluado: no se pierde ningún efecto).
+from __future__ import annotations
+import math
+from typing import Any, Optional
+
+from src.sema.types import (
+    Type, INTEGER, FLOAT, STRING, BOOLEAN, NULL, binary_result, unary_result,
+)
+from .model import Operand, Const
+
+_I64_MIN, _I64_MAX = -(1 << 63), (1 << 63) - 1
+
+def const_type(c: Const) -> Type:
+    v = c.value
+    if v is None:
+        return NULL
+    t = type(v)
+    if t is bool:
+        return BOOLEAN
+    if t is int:
+        return INTEGER
+    if t is float:
+        return FLOAT
+    if t is str:
+        return STRING
+    raise TypeError(f"Constante no soportada: {v!r}")
+
+def _known_type(o: Operand) -> Optional[Type]:
+    if isinstance(o, Const):
+        return const_type(o)
+    return INTEGER if getattr(o, "type_hint", None) == "integer" else None
+
+def _is(o: Operand, v: Any, t: Type) -> bool:
+    return isinstance(o, Const) and const_type(o) is t and o.value == v
+
+def _result(v: Any, t: Type) -> Optional[Const]:
+    if t is INTEGER:
+        if not _I64_MIN <= v <= _I64_MAX:
+            return None
+        return Const(int(v))
+    if t is FLOAT:
+        v = float(v)
+        return Const(v) if math.isfinite(v) else None
+    return Const(v)
+
+def _int_div(a: int, b: int) -> int:
+    q = abs(a) // abs(b)
+    return q if (a < 0) == (b < 0) else -q
+
+def eval_binary(op: str, a: Const, b: Const) -> Optional[Const]:
+    """Valor de 'a op b' con dos constantes, o None si no se puede/debe plegar."""
+    t = binary_result(op, const_type(a), const_type(b))
+    if t is None:
+        return None
+    x, y = a.value, b.value
+    if op == "+":  return _result(x + y, t)
+    if op == "-":  return _result(x - y, t)
+    if op == "*":  return _result(x * y, t)
+    if op == "/":
+        if y == 0:
+            return None
+        return _result(_int_div(x, y) if t is INTEGER else x / y, t)
+    if op == "%":
+        if y == 0:
+            return None
+        return _result(x - y * _int_div(x, y) if t is INTEGER else math.fmod(x, y), t)
+    if op == "<":  return Const(x < y)
+    if op == "<=": return Const(x <= y)
+    if op == ">":  return Const(x > y)
+    if op == ">=": return Const(x >= y)
+    if op == "==": return Const(x == y)
+    if op == "!=": return Const(x != y)
+    if op == "&&": return Const(x and y)
+    if op == "||": return Const(x or y)
+    return None
+
+def eval_unary(op: str, a: Const) -> Optional[Const]:
+    t = unary_result(op, const_type(a))
+    if t is None:
+        return None
+    if op == "!":
+        return Const(not a.value)
+    if op == "-":
+        return _result(-a.value, t)
+    return None
+
+def fold_binary(op: str, left: Operand, right: Operand) -> Optional[Operand]:
+    if isinstance(left, Const) and isinstance(right, Const):
+        return eval_binary(op, left, right)
+    # identidades: 'x' es el operando no constante
+    if op == "+":
+        if _is(right, 0, INTEGER): return left
+        if _is(left, 0, INTEGER):  return right
+    elif op == "-":
+        if _is(right, 0, INTEGER): return left
+    elif op == "*":
+        if _is(right, 1, INTEGER): return left
+        if _is(left, 1, INTEGER):  return right
+        if _is(right, 0, INTEGER) and _known_type(left) is INTEGER: return right
+        if _is(left, 0, INTEGER) and _known_type(right) is INTEGER: return left
+    elif op == "/":
+        if _is(right, 1, INTEGER): return left
+    elif op == "%":
+        if _is(right, 1, INTEGER) and _known_type(left) is INTEGER: return Const(0)
+    elif op == "&&":
+        if _is(right, True, BOOLEAN):  return left
+        if _is(left, True, BOOLEAN):   return right
+        if _is(right, False, BOOLEAN): return right
+        if _is(left, False, BOOLEAN):  return left
+    elif op == "||":
+        if _is(right, False, BOOLEAN): return left
+        if _is(left, False, BOOLEAN):  return right
+        if _is(right, True, BOOLEAN):  return right
+        if _is(left, True, BOOLEAN):   return left
+    return None
+
+def fold_unary(op: str, value: Operand) -> Optional[Operand]:
+    if isinstance(value, Const):
+        return eval_unary(op, value)
+    return None
@@ -3,6 +3,7 @@ from __future__ import annotations
 from typing import Tuple, Any
 
 from .context import IRGenContext
+from .fold import fold_binary, fold_unary
 from .model import (
     Operand, Temp, Name, Const, Label, LabelInstr,
     Assign, UnaryOp, BinOp, IfGoto, Goto, Return,
@@ -58,6 +59,11 @@ def gen_expr(node: Expr, ctx: IRGenContext) -> Operand:
     if tag == 'un':
         _, op, sub = node
         v = _as_operand(sub, ctx)
+        if ctx.fold:
+            r = fold_unary(op, v)
+            if r is not None:
+                ctx.folded += 1
+                return r
         dst = ctx.temp_alloc.new_temp()
         ctx.emit(UnaryOp(dst=dst, op=op, value=v))
         return dst
@@ -67,6 +73,11 @@ def gen_expr(node: Expr, ctx: IRGenContext) -> Operand:
         _, op, l, r = node
         lo = _as_operand(l, ctx)
         ro = _as_operand(r, ctx)
+        if ctx.fold:
+            f = fold_binary(op, lo, ro)
+            if f is not None:
+                ctx.folded += 1
+                return f
         dst = ctx.temp_alloc.new_temp()
         ctx.emit(BinOp(dst=dst, op=op, left=lo, right=ro))
         return dst
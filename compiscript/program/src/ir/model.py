@@ -1,7 +1,10 @@
 # program/src/ir/model.py
 from __future__ import annotations
 from dataclasses import dataclass, field
-from typing import List, Optional, Sequence, Union
+from typing import TYPE_CHECKING, List, Optional, Sequence, Tuple, Union
+
+if TYPE_CHECKING:
+    from .cfg import CFG
 
 
 @dataclass(frozen=True)
@@ -104,13 +107,29 @@ class NewObject(Instr):
     class_name: str
     args: List[Operand] = field(default_factory=list)
 
+# SSA (ver ssa.py): dst = φ(args), un argumento por predecesor (etiqueta del bloque de origen).
+# Solo existe entre to_ssa y from_ssa; va al principio del bloque, después del LabelInstr.
+@dataclass
+class Phi(Instr):
+    dst: Operand
+    args: List[Tuple[Label, Operand]] = field(default_factory=list)
+
+# terminadores: cierran un bloque básico
+TERMINATORS = (Goto, IfGoto, Return)
+
 @dataclass
 class BasicBlock:
     label: Label
     instrs: List[Instr] = field(default_factory=list)
+    # implicit: bloque de fallthrough sin LabelInstr (nadie salta a él por nombre)
+    implicit: bool = False
+    # función dueña: add() invalida su CFG cacheado
+    owner: Optional["Function"] = field(default=None, repr=False, compare=False)
 
     def add(self, instr: Instr) -> None:
         self.instrs.append(instr)
+        if self.owner is not None:
+            self.owner._cfg = None
 
 @dataclass
 class Function:
@@ -120,11 +139,33 @@ class Function:
 
     frame_size: int = 0
 
+    # CFG cacheado (ver cfg.py); None = hay que reconstruirlo
+    _cfg: Optional["CFG"] = field(default=None, init=False, repr=False, compare=False)
+
     def new_block(self, label: Label) -> BasicBlock:
-        bb = BasicBlock(label=label)
+        bb = BasicBlock(label=label, owner=self)
         self.blocks.append(bb)
+        self._cfg = None
         return bb
 
+    def set_blocks(self, blocks: List[BasicBlock]) -> None:
+        """Reemplaza los bloques (lo usan las pasadas que reescriben el CFG)."""
+        for bb in blocks:
+            bb.owner = self
+        self.blocks = blocks
+        self._cfg = None
+
+    def invalidate(self) -> None:
+        """Para quien toque bb.instrs directamente (sin add)."""
+        self._cfg = None
+
+    def cfg(self) -> "CFG":
+        """CFG de la función, construido una vez y cacheado hasta la próxima mutación."""
+        if self._cfg is None:
+            from .cfg import build_cfg
+            self._cfg = build_cfg(self)
+        return self._cfg
+
     def entry_block(self) -> BasicBlock:
         if not self.blocks:
             self.new_block(Label("L0"))
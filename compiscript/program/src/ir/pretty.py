@@ -4,7 +4,7 @@ from typing import List
 from .model import (
     Program, Function, BasicBlock, Instr,
     LabelInstr, Assign, UnaryOp, BinOp, IfGoto, Goto, Call, Return,
-    Load, Store, GetProp, SetProp, NewObject,
+    Load, Store, GetProp, SetProp, NewObject, Phi,
     Operand, Temp, Name, Const, Label
 )
 
@@ -41,6 +41,9 @@ def _p_instr(i: Instr) -> List[str]:
     if isinstance(i, NewObject):
         args = ", ".join(_p_oprnd(a) for a in i.args)
         return [f"{_p_oprnd(i.dst)} = new {i.class_name}({args})"]
+    if isinstance(i, Phi):
+        args = ", ".join(f"[{lab.name}: {_p_oprnd(o)}]" for lab, o in i.args)
+        return [f"{_p_oprnd(i.dst)} = phi {args}"]
     return [f"; <unknown instr {i!r}>"]
 
 def function_to_str(fn: Function) -> str:
@@ -52,9 +55,10 @@ def function_to_str(fn: Function) -> str:
     first_output_emitted = False
 
     for bb in fn.blocks:
-        has_label = any(isinstance(x, LabelInstr) for x in bb.instrs)
-        # Si el bloque NO trae LabelInstr, imprimimos su label
-        if not has_label:
+        has_label = bool(bb.instrs) and isinstance(bb.instrs[0], LabelInstr)
+        # Si el bloque NO empieza con LabelInstr, imprimimos su label
+        # (salvo los de fallthrough que arma cfg.split_blocks: nadie salta a ellos)
+        if not has_label and not bb.implicit:
             # si es la PRIMERA cosa tras el header, no dejes línea en blanco
             lines.append(f"{bb.label.name}:")
             first_output_emitted = True
@@ -0,0 +1,207 @@
+# program/src/ir/sccp.py
+# Propagación de constantes condicional (Wegman–Zadeck) sobre el CFG, sin pasar por SSA.
+#
+# Cada bloque ejecutable tiene un entorno {variable: Const} (lo que no está es "no constante");
+# el de entrada es el meet de las salidas de los predecesores por aristas ya marcadas como
+# ejecutables, así que un bucle arranca optimista con los valores de antes de entrar y baja si
+# la arista de vuelta trae otro. Assign/BinOp/UnaryOp se evalúan con fold.py (mismas reglas que
+# el plegado al emitir); un IfGoto con condición booleana conocida marca una sola arista.
+#
+# Las Name que no son locales (globales) las puede cambiar cualquier Call/NewObject: ahí se
+# olvidan, salvo las de 'consts' (const globales: se asignan una sola vez). Los Temp y las
+# 'locals' sobreviven a las llamadas (sin los que captura una función anidada: esos van como
+# globales). 'known' trae el valor de las const globales que main inicializa con una constante
+# antes de cualquier llamada (IRAdapter.optimize): vale desde la entrada de las demás funciones.
+#
+# Al aplicar: los usos constantes se reemplazan por la Const, las operaciones con resultado
+# conocido quedan como Assign, un IfGoto resuelto pasa a Goto (o desaparece y se cae al bloque
+# siguiente), se borran los bloques no ejecutables, los Goto al bloque que queda justo después
+# y las copias de constantes a temporales que ya nadie lee; un bloque cuya etiqueta quedó sin
+# saltos se fusiona con el anterior.
+from __future__ import annotations
+import heapq
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from .model import (
+    Function, BasicBlock, Instr, Operand, Temp, Name, Const,
+    Assign, BinOp, UnaryOp, IfGoto, Goto, Call, NewObject, LabelInstr,
+)
+from .dataflow import instr_def, instr_uses, rewrite_uses
+from .fold import fold_binary, fold_unary
+
+Key = Tuple[type, str]
+Env = Dict[Key, Const]
+
+def _key(o: Operand) -> Optional[Key]:
+    return (type(o), o.name) if isinstance(o, (Temp, Name)) else None
+
+def _same(a: Const, b: Const) -> bool:
+    # Const(1) == Const(1.0) == Const(True) para dataclass: hay que mirar el tipo
+    return type(a.value) is type(b.value) and a.value == b.value
+
+def _meet(envs: List[Env]) -> Env:
+    out = dict(envs[0])
+    for env in envs[1:]:
+        for k, v in list(out.items()):
+            w = env.get(k)
+            if w is None or not _same(v, w):
+                del out[k]
+    return out
+
+def _value(o: Operand, env: Env) -> Operand:
+    """La Const que vale 'o' en 'env', o el mismo operando si no se conoce."""
+    k = _key(o)
+    if k is None:
+        return o
+    return env.get(k, o)
+
+def _evaluate(ins: Instr, env: Env) -> Optional[Operand]:
+    """Operando equivalente al resultado de un Assign/BinOp/UnaryOp (None = no se simplifica)."""
+    t = type(ins)
+    if t is Assign:
+        return _value(ins.src, env)
+    if t is BinOp:
+        return fold_binary(ins.op, _value(ins.left, env), _value(ins.right, env))
+    if t is UnaryOp:
+        return fold_unary(ins.op, _value(ins.value, env))
+    return None
+
+class _Transfer:
+    def __init__(self, safe: Set[str]) -> None:
+        self.safe = safe
+
+    def __call__(self, ins: Instr, env: Env) -> None:
+        t = type(ins)
+        if t is Call or t is NewObject:
+            for k in [k for k in env if k[0] is Name and k[1] not in self.safe]:
+                del env[k]
+        d = instr_def(ins)
+        if d is None:
+            return
+        k = _key(d)
+        r = _evaluate(ins, env)
+        if isinstance(r, Const):
+            env[k] = r
+        else:
+            env.pop(k, None)
+
+def _branch(ins: Instr, env: Env) -> Optional[bool]:
+    if isinstance(ins, IfGoto):
+        c = _value(ins.cond, env)
+        if isinstance(c, Const) and type(c.value) is bool:
+            return c.value
+    return None
+
+def sccp(fn: Function, locals: Iterable[str] = (), consts: Iterable[str] = (),
+         known: Optional[Dict[str, Const]] = None) -> Tuple[int, int]:
+    """
+    Propaga constantes en 'fn' y poda lo inalcanzable; deja los bloques cortados en la función.
+    'known' son valores de globales válidos en toda la función (no se aplican a un local que
+    la sombrea). Devuelve (instrucciones quitadas, bloques quitados).
+    """
+    cfg = fn.cfg()
+    blocks, succs, preds = cfg.blocks, cfg.succs, cfg.preds
+    n = len(blocks)
+    locals = set(locals)
+    transfer = _Transfer(locals | set(consts) | set(known or ()))
+    start: Env = {(Name, k): c for k, c in (known or {}).items() if k not in locals}
+    before = sum(len(bb.instrs) for bb in blocks)
+
+    ins_env: List[Optional[Env]] = [None] * n      # None = todavía no ejecutable
+    outs: List[Optional[Env]] = [None] * n
+    live_edges: Set[Tuple[int, int]] = set()
+    # worklist por orden RPO: una junta con muchos predecesores (el final de un switch) se
+    # evalúa una vez por vuelta y no una vez por cada caso que cambia
+    order = [0] * n
+    for pos, b in enumerate(cfg.rpo()):
+        if b < n:
+            order[b] = pos
+    work = [(order[cfg.entry], cfg.entry)]
+    queued = [False] * n
+    queued[cfg.entry] = True
+    while work:
+        _, b = heapq.heappop(work)
+        queued[b] = False
+        incoming = [outs[p] for p in preds[b] if (p, b) in live_edges]
+        env = dict(start) if b == cfg.entry else _meet(incoming)
+        ins_env[b] = dict(env)
+        for ins in blocks[b].instrs:
+            transfer(ins, env)
+        changed = outs[b] is None or env.keys() != outs[b].keys() or \
+            not all(_same(v, outs[b][k]) for k, v in env.items())
+        outs[b] = env
+
+        last = blocks[b].instrs[-1] if blocks[b].instrs else None
+        taken = _branch(last, env) if last is not None else None
+        if taken is None:
+            out = succs[b]
+        else:
+            out = [cfg.index[last.target.name] if taken else b + 1]
+        for s in out:
+            if s >= n:
+                continue
+            new = (b, s) not in live_edges
+            live_edges.add((b, s))
+            if (new or changed) and not queued[s]:
+                queued[s] = True
+                heapq.heappush(work, (order[s], s))
+
+    # ---- reescritura ----
+    kept: List[BasicBlock] = []
+    for b, bb in enumerate(blocks):
+        env = ins_env[b]
+        if env is None:
+            continue
+        out: List[Instr] = []
+        for ins in bb.instrs:
+            taken = _branch(ins, env)
+            if taken is not None:
+                if taken:
+                    out.append(Goto(ins.target))
+                continue
+            rewrite_uses(ins, lambda o: _value(o, env))
+            r = _evaluate(ins, env)
+            if r is not None and not isinstance(ins, Assign):
+                ins = Assign(ins.dst, r)
+            transfer(ins, env)
+            out.append(ins)
+        bb.instrs = out
+        kept.append(bb)
+
+    # copias de constantes a temporales sin lectores (quedan tras propagar)
+    read = {o.name for bb in kept for ins in bb.instrs for o in instr_uses(ins) if isinstance(o, Temp)}
+    for bb in kept:
+        bb.instrs = [ins for ins in bb.instrs
+                     if not (type(ins) is Assign and isinstance(ins.dst, Temp)
+                             and isinstance(ins.src, Const) and ins.dst.name not in read)]
+    kept = _drop_empty(kept)
+    # goto al bloque siguiente: basta con caer
+    for bb, nxt in zip(kept, kept[1:]):
+        last = bb.instrs[-1] if bb.instrs else None
+        if isinstance(last, Goto) and last.target.name in _labels(nxt):
+            bb.instrs.pop()
+    kept = _merge_unlabeled(_drop_empty(kept))
+    cfg.commit(kept)
+    return before - sum(len(bb.instrs) for bb in kept), n - len(kept)
+
+def _labels(bb: BasicBlock) -> Set[str]:
+    names = {bb.label.name}
+    for ins in bb.instrs:
+        if isinstance(ins, LabelInstr):
+            names.add(ins.label.name)
+    return names
+
+def _merge_unlabeled(blocks: List[BasicBlock]) -> List[BasicBlock]:
+    """Un bloque cuya etiqueta ya nadie salta solo se alcanza cayendo: se pega al anterior."""
+    targets = {ins.target.name for bb in blocks for ins in bb.instrs if isinstance(ins, (Goto, IfGoto))}
+    out = blocks[:1]
+    for bb in blocks[1:]:
+        if _labels(bb) & targets:
+            out.append(bb)
+        else:
+            out[-1].instrs.extend(ins for ins in bb.instrs if not isinstance(ins, LabelInstr))
+    return out
+
+def _drop_empty(blocks: List[BasicBlock]) -> List[BasicBlock]:
+    # un bloque implícito vacío no aporta nada: se cae al siguiente igual
+    return [bb for i, bb in enumerate(blocks) if bb.instrs or not bb.implicit or i == 0]
@@ -0,0 +1,332 @@
+# program/src/ir/ssa.py
+# Forma SSA para el TAC (opcional: IRAdapter(ssa=True)).
+#
+# to_ssa(fn, names):
+#   - Deja la función con bloques básicos reales (cfg.commit) y calcula dominadores y
+#     fronteras de dominancia (Cooper-Harvey-Kennedy sobre el idom de dataflow.dominators).
+#   - Pone φ en la frontera de dominancia iterada de los bloques que definen cada variable,
+#     solo donde la variable está viva a la entrada (SSA podada).
+#   - Renombra recorriendo el árbol de dominadores: la versión 0 es el nombre original
+#     (valor de entrada: parámetro o global) y cada definición crea x.1, x.2, ...
+#   Se renombran los Temp y los Name de 'names' (parámetros y locales de la función): una
+#   global la puede leer o escribir otra función a través de un call, así que se deja quieta.
+#
+# from_ssa(fn):
+#   - Con liveness consciente de φ se ve, por variable, si dos versiones están vivas a la vez.
+#     Si no (lo normal si nadie movió código en SSA) todas vuelven al nombre original y los φ
+#     y las copias x = x desaparecen: el IR queda como antes de to_ssa.
+#   - Las que sí interfieren conservan sus versiones; sus φ se reemplazan por copias paralelas
+#     en cada arista (partiendo las aristas críticas) que se secuencializan con un temporal
+#     para los ciclos (Boissinot et al., "Revisiting Out-of-SSA Translation", alg. 1).
+from __future__ import annotations
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from .model import (
+    Function, BasicBlock, Instr, Operand, Temp, Name, Label,
+    LabelInstr, Assign, IfGoto, Goto, Phi,
+)
+from .dataflow import VarNumbering, dominators, liveness, instr_uses, instr_def, rewrite_uses, _is_var
+
+VarKey = Tuple[type, str]
+
+def _key(o: Operand) -> VarKey:
+    return (o.__class__, o.name)
+
+def base_name(name: str) -> str:
+    """'x.3' → 'x' (los nombres de usuario no tienen puntos)."""
+    base, dot, k = name.rpartition(".")
+    return base if dot and k.isdigit() else name
+
+def dominance_frontiers(succs: List[List[int]], preds: List[List[int]],
+                        idom: List[Optional[int]], reach: Set[int]) -> List[Set[int]]:
+    df: List[Set[int]] = [set() for _ in succs]
+    for b in reach:
+        ps = [p for p in preds[b] if p in reach]
+        if len(ps) < 2:
+            continue
+        for p in ps:
+            r: Optional[int] = p
+            while r is not None and r != idom[b]:
+                df[r].add(b)
+                r = idom[r]
+    return df
+
+def _phi_end(bb: BasicBlock) -> int:
+    """Posición después del LabelInstr y de los φ del bloque."""
+    i = 0
+    n = len(bb.instrs)
+    if n and isinstance(bb.instrs[0], LabelInstr):
+        i = 1
+    while i < n and type(bb.instrs[i]) is Phi:
+        i += 1
+    return i
+
+
+# ---------- construcción ----------
+
+def to_ssa(fn: Function, names: Iterable[str] = ()) -> int:
+    """Pasa 'fn' a SSA en su lugar; devuelve cuántos φ puso."""
+    allowed = set(names)
+
+    def renamable(o: Operand) -> bool:
+        return isinstance(o, Temp) or (isinstance(o, Name) and o.name in allowed)
+
+    fn.cfg().commit()
+    cfg = fn.cfg()
+    n = len(cfg.blocks)
+    reach = cfg.reachable()
+    reach.discard(cfg.exit)
+    idom = dominators(fn).extra["idom"]
+    df = dominance_frontiers(cfg.succs, cfg.preds, idom, reach)
+    lv = liveness(fn)
+    vn: VarNumbering = lv.universe
+
+    # bloques (alcanzables) que definen cada variable renombrable
+    defsites: Dict[int, Set[int]] = {}
+    proto: Dict[int, Operand] = {}
+    for b in reach:
+        for ins in cfg.blocks[b].instrs:
+            d = instr_def(ins)
+            if d is not None and renamable(d):
+                v = vn.var(d)
+                defsites.setdefault(v, set()).add(b)
+                proto.setdefault(v, d)
+
+    # φ en la frontera iterada, si la variable está viva ahí
+    rpreds = [[p for p in cfg.preds[b] if p in reach] for b in range(n)]
+    phis: List[List[Tuple[int, Phi]]] = [[] for _ in range(n)]
+    n_phi = 0
+    for v, sites in defsites.items():
+        bit = 1 << v
+        has: Set[int] = set()
+        work = list(sites)
+        while work:
+            b = work.pop()
+            for f in df[b]:
+                if f in has or f >= n or not lv.solution.ins[f] & bit:
+                    continue
+                has.add(f)
+                o = proto[v]
+                base = o.__class__(o.name, o.type_hint)
+                phis[f].append((v, Phi(dst=base, args=[(cfg.blocks[p].label, base) for p in rpreds[f]])))
+                n_phi += 1
+                if f not in sites:
+                    work.append(f)
+    for b, lst in enumerate(phis):
+        if lst:
+            bb = cfg.blocks[b]
+            at = _phi_end(bb)
+            bb.instrs[at:at] = [phi for _, phi in lst]
+
+    # renombrado sobre el árbol de dominadores
+    children: List[List[int]] = [[] for _ in range(n)]
+    for b in sorted(reach):
+        d = idom[b]
+        if d is not None and d < n:
+            children[d].append(b)
+    stacks: Dict[int, List[str]] = {}
+    counter: Dict[int, int] = {}
+    pred_pos = [{p: i for i, p in enumerate(rpreds[b])} for b in range(n)]
+
+    def top(o: Operand) -> Operand:
+        if not renamable(o):
+            return o
+        st = stacks.get(vn.var(o))
+        if not st or st[-1] == o.name:
+            return o
+        return o.__class__(st[-1], o.type_hint)
+
+    def fresh(o: Operand, v: int) -> Operand:
+        k = counter.get(v, 0) + 1
+        counter[v] = k
+        name = f"{o.name}.{k}"
+        stacks.setdefault(v, [o.name]).append(name)
+        return o.__class__(name, o.type_hint)
+
+    stack: List[Tuple[int, Optional[List[int]]]] = [(cfg.entry, None)]
+    while stack:
+        b, pushed = stack.pop()
+        if pushed is not None:          # salida del bloque: deshace sus versiones
+            for v in pushed:
+                stacks[v].pop()
+            continue
+        pushed = []
+        for ins in cfg.blocks[b].instrs:
+            if type(ins) is Phi:
+                v = vn.var(ins.dst)
+                ins.dst = fresh(ins.dst, v)
+                pushed.append(v)
+                continue
+            rewrite_uses(ins, top)
+            d = instr_def(ins)
+            if d is not None and renamable(d):
+                v = vn.var(d)
+                ins.dst = fresh(d, v)
+                pushed.append(v)
+        for s in cfg.succs[b]:
+            if s < n:
+                at = pred_pos[s].get(b)
+                for v, phi in phis[s]:
+                    lab, o = phi.args[at]
+                    phi.args[at] = (lab, top(o))
+        stack.append((b, pushed))
+        for c in reversed(children[b]):
+            stack.append((c, None))
+    fn.invalidate()
+    return n_phi
+
+
+# ---------- destrucción ----------
+
+def sequentialize(copies: List[Tuple[Operand, Operand]], tmp: Callable[[], Operand]) -> List[Assign]:
+    """Copias paralelas dst ← src (dst distintos) como secuencia de Assign."""
+    out: List[Assign] = []
+    loc: Dict[object, Operand] = {}       # dónde está hoy el valor original de cada fuente
+    pred: Dict[VarKey, Operand] = {}      # destino → fuente
+    dst_of: Dict[VarKey, Operand] = {}
+    todo: List[VarKey] = []
+    ready: List[VarKey] = []
+
+    def k(o: Operand) -> object:
+        return _key(o) if _is_var(o) else o
+
+    copies = [(d, s) for d, s in copies if k(d) != k(s)]
+    for d, s in copies:
+        loc[k(s)] = s
+        pred[_key(d)] = s
+        dst_of[_key(d)] = d
+        todo.append(_key(d))
+    for d, _ in copies:
+        if _key(d) not in loc:          # nadie lee d: se puede pisar ya
+            ready.append(_key(d))
+    done: Set[VarKey] = set()
+    while todo:
+        while ready:
+            b = ready.pop()
+            a = pred[b]
+            c = loc[k(a)]
+            out.append(Assign(dst=dst_of[b], src=c))
+            done.add(b)
+            loc[k(a)] = dst_of[b]
+            if k(a) == k(c) and k(a) in pred:
+                ready.append(k(a))
+        b = todo.pop()
+        if b not in done:
+            # ciclo: se guarda b y queda libre para escribirse
+            t = tmp()
+            out.append(Assign(dst=t, src=dst_of[b]))
+            loc[b] = t
+            ready.append(b)
+    return out
+
+def _interfering(fn: Function) -> Set[str]:
+    """Nombres base con dos versiones vivas a la vez en algún punto."""
+    cfg = fn.cfg()
+    lv = liveness(fn)
+    vn: VarNumbering = lv.universe
+    base_of = [(v.__class__, base_name(v.name)) for v in vn.items]
+    groups: Dict[VarKey, int] = {}
+    for i, bk in enumerate(base_of):
+        groups[bk] = groups.get(bk, 0) | (1 << i)
+    versioned = {bk for bk, m in groups.items() if m & (m - 1)}
+    bad: Set[VarKey] = set()
+
+    def check(v: int, live: int) -> None:
+        bk = base_of[v]
+        if bk in versioned and live & groups[bk] & ~(1 << v):
+            bad.add(bk)
+
+    for b, bb in enumerate(cfg.blocks):
+        live = lv.solution.outs[b] | lv.extra["phi_uses"][b]
+        for ins in reversed(bb.instrs):
+            if type(ins) is Phi:
+                break
+            d = instr_def(ins)
+            if d is not None:
+                v = vn.var(d)
+                live &= ~(1 << v)
+                check(v, live)
+            for o in instr_uses(ins):
+                if _is_var(o):
+                    live |= 1 << vn.var(o)
+        # los φ se definen juntos a la entrada del bloque
+        for ins in bb.instrs:
+            if type(ins) is Phi:
+                check(vn.var(ins.dst), live & ~(1 << vn.var(ins.dst)))
+    return {name for _, name in bad}
+
+def from_ssa(fn: Function) -> int:
+    """Saca 'fn' de SSA en su lugar; devuelve cuántas copias tuvo que insertar."""
+    keep = _interfering(fn)
+
+    def restore(o: Operand) -> Operand:
+        if _is_var(o):
+            base = base_name(o.name)
+            if base != o.name and base not in keep:
+                return o.__class__(base, o.type_hint)
+        return o
+
+    cfg = fn.cfg()
+    edge_copies: Dict[Tuple[int, int], List[Tuple[Operand, Operand]]] = {}
+    for b, bb in enumerate(cfg.blocks):
+        out: List[Instr] = []
+        for ins in bb.instrs:
+            if type(ins) is Phi:
+                dst = restore(ins.dst)
+                for lab, o in ins.args:
+                    o = restore(o)
+                    if not (_is_var(o) and _key(o) == _key(dst)):
+                        p = cfg.index[lab.name]
+                        edge_copies.setdefault((p, b), []).append((dst, o))
+                continue
+            rewrite_uses(ins, restore)
+            d = instr_def(ins)
+            if d is not None:
+                ins.dst = restore(d)
+            if type(ins) is Assign and _is_var(ins.src) and _key(ins.src) == _key(ins.dst):
+                continue
+            out.append(ins)
+        bb.instrs = out
+    if not edge_copies:
+        fn.invalidate()
+        return 0
+
+    n_tmp = 0
+
+    def tmp() -> Operand:
+        nonlocal n_tmp
+        n_tmp += 1
+        return Temp(f"tswap{n_tmp}")
+
+    after: Dict[int, List[BasicBlock]] = {}
+    tail: List[BasicBlock] = []
+    n_copies = 0
+    for (p, b), copies in edge_copies.items():
+        seq = sequentialize(copies, tmp)
+        n_copies += len(seq)
+        pb, sb = cfg.blocks[p], cfg.blocks[b]
+        last = pb.instrs[-1] if pb.instrs else None
+        if len(cfg.succs[p]) == 1:
+            if isinstance(last, IfGoto):        # salta o cae al mismo bloque: el if sobra
+                pb.instrs.pop()
+                pb.instrs.extend(seq)
+            elif isinstance(last, Goto):
+                pb.instrs[-1:-1] = seq
+            else:
+                pb.instrs.extend(seq)
+        elif isinstance(last, IfGoto) and last.target.name == sb.label.name:
+            # arista crítica por el salto: bloque nuevo al final
+            lab = Label(f"{pb.label.name}.to.{sb.label.name}")
+            tail.append(BasicBlock(label=lab, instrs=[LabelInstr(lab), *seq, Goto(sb.label)]))
+            last.target = lab
+        else:
+            # arista crítica por fallthrough: bloque implícito justo después de p
+            lab = Label(f"{pb.label.name}.ft")
+            after.setdefault(p, []).append(
+                BasicBlock(label=lab, instrs=[*seq, Goto(sb.label)], implicit=True))
+    blocks: List[BasicBlock] = []
+    for i, bb in enumerate(cfg.blocks):
+        blocks.append(bb)
+        blocks.extend(after.get(i, ()))
+    cfg.commit(blocks + tail)
+    return n_copies
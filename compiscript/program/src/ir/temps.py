@@ -43,6 +43,11 @@ class TempAllocator:
     def release(self, t: Temp) -> None:
         self.free(t)
 
+    @property
+    def allocated(self) -> int:
+        """Ids distintos entregados desde el último reset."""
+        return self._next_id
+
     def reset(self) -> None:
         self._next_id = 0
         self._free.clear()
@@ -63,5 +68,9 @@ class LabelAllocator:
         base = f"{self.prefix}{i}"
         return Label(f"{base}_{suffix}") if suffix else Label(base)
 
+    @property
+    def allocated(self) -> int:
+        return self._next_id
+
     def reset(self) -> None:
         self._next_id = 0
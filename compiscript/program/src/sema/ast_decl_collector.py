@@ -0,0 +1,142 @@
+# program/src/sema/ast_decl_collector.py
+# Pasada 1 (declaraciones) sobre el AST de src/ast/nodes.py.
+# Mismas reglas, scopes y claves que DeclarationCollector; no importa ANTLR.
+from __future__ import annotations
+from typing import List, Optional
+
+from src.ast import nodes as A
+from .errors import E_DUPLICATE_ID, E_DUPLICATE_PARAM
+from .collector_base import CollectorBase
+from .scopes import ClassScope, FunctionScope, GlobalScope
+from .symbols import (
+    VariableSymbol, ConstSymbol, ParamSymbol, FieldSymbol,
+    FunctionSymbol, ClassSymbol
+)
+
+class ASTDeclarationCollector(CollectorBase):
+    """
+    Pasada 1 sobre el AST (ver DeclarationCollector).
+    Los bloques no abren scope: un 'let' dentro de un if/for top-level se declara global,
+    igual que en la versión sobre el parse tree.
+    """
+
+    def visit_program(self, prog: A.Program) -> GlobalScope:
+        self._stmts(prog.statements)
+        self._check_inheritance_cycles()
+        return self.global_scope
+
+    def _stmts(self, stmts: List[A.Stmt]) -> None:
+        for st in stmts:
+            self._stmt(st)
+
+    def _stmt(self, st: Optional[A.Stmt]) -> None:
+        fn = self._DISPATCH.get(type(st))
+        if fn is not None:
+            fn(self, st)
+
+    # ---------- Declaraciones ----------
+    def _var_decl(self, st: A.VarDecl) -> None:
+        # Solo declaramos en global o clase (NO locales)
+        if self.current_scope.kind not in ("global", "class"):
+            return
+        cls = ConstSymbol if st.is_const else VariableSymbol
+        self.declare_or_error(cls(name=st.name, type_ann=st.type_ann), st)
+
+    def _params(self, fn: A.FunctionDecl, fn_sym: FunctionSymbol, fn_scope: FunctionScope) -> None:
+        # duplicados **dentro de la misma lista**
+        seen = set()
+        for p in fn.params:
+            if p.name in seen:
+                self.reporter.error(E_DUPLICATE_PARAM, f"Parámetro duplicado: {p.name}", p)
+                continue
+            seen.add(p.name)
+            psym = ParamSymbol(name=p.name, type_ann=p.type_ann)
+            if not fn_scope.declare(psym):
+                self.reporter.error(E_DUPLICATE_PARAM, f"Parámetro duplicado: {p.name}", p)
+            fn_sym.params.append(psym)
+
+    def _function_decl(self, st: A.FunctionDecl) -> None:
+        fn_sym = FunctionSymbol(name=st.name, return_ann=st.return_type, is_method=False)
+        self.declare_or_error(fn_sym, st)
+        fn_scope = FunctionScope(name=st.name, parent=self.current_scope)
+        self.function_scopes[self._qualified_fn_key(st.name)] = fn_scope
+        self._params(st, fn_sym, fn_scope)
+        self.push(fn_scope)
+        self._block(st.body)
+        self.pop()
+
+    def _class_decl(self, st: A.ClassDecl) -> None:
+        name = st.name
+        self.declare_or_error(ClassSymbol(name=name, base_name=st.base), st)
+        self.class_nodes[name] = st
+        self.class_bases[name] = st.base
+
+        class_scope = ClassScope(name=name, parent=self.current_scope)
+        self.class_scopes[name] = class_scope
+
+        self.push(class_scope)
+        for m in st.members:
+            d = m.member
+            if isinstance(d, A.FunctionDecl):
+                msym = FunctionSymbol(name=d.name, return_ann=d.return_type, is_method=True,
+                                      is_constructor=(d.name == "constructor"))
+                self.declare_or_error(msym, d)
+                m_scope = FunctionScope(name=d.name, parent=class_scope)
+                self.function_scopes[self._method_key(name, d.name)] = m_scope
+                self._params(d, msym, m_scope)
+                self.push(m_scope)
+                self._block(d.body)
+                self.pop()
+            elif isinstance(d, A.VarDecl):
+                self.declare_or_error(FieldSymbol(name=d.name, type_ann=d.type_ann, mutable=not d.is_const), d)
+        self.pop()
+
+    # ---------- Sentencias con cuerpos ----------
+    def _block(self, st: Optional[A.Block]) -> None:
+        if st is not None:
+            self._stmts(st.statements)
+
+    def _if(self, st: A.IfStmt) -> None:
+        self._block(st.then_block)
+        self._block(st.else_block)
+
+    def _loop(self, st) -> None:
+        self._block(st.body)
+
+    def _for(self, st: A.ForStmt) -> None:
+        self._stmt(st.init)
+        self._block(st.body)
+
+    def _foreach(self, st: A.ForeachStmt) -> None:
+        # scope de bloque para el iterador (permite shadowing)
+        self._push_block_scope(name="foreach")
+        try:
+            if not self.current_scope.declare(VariableSymbol(name=st.var_name, type_ann=None)):
+                self.reporter.error(E_DUPLICATE_ID, f"Identificador redeclarado: {st.var_name}", st)
+            self._block(st.body)
+        finally:
+            self._pop_block_scope()
+
+    def _try(self, st: A.TryCatchStmt) -> None:
+        self._block(st.try_block)
+        self._block(st.catch_block)
+
+    def _switch(self, st: A.SwitchStmt) -> None:
+        for c in st.cases:
+            self._stmts(c.body)
+        if st.default_body:
+            self._stmts(st.default_body)
+
+    _DISPATCH = {
+        A.VarDecl: _var_decl,
+        A.FunctionDecl: _function_decl,
+        A.ClassDecl: _class_decl,
+        A.Block: _block,
+        A.IfStmt: _if,
+        A.WhileStmt: _loop,
+        A.DoWhileStmt: _loop,
+        A.ForStmt: _for,
+        A.ForeachStmt: _foreach,
+        A.TryCatchStmt: _try,
+        A.SwitchStmt: _switch,
+    }
@@ -0,0 +1,618 @@
+# program/src/sema/ast_typecheck.py
+# Pasada 3 (tipos) sobre el AST de src/ast/nodes.py.
+# Reproduce a TypeCheckVisitor: mismos códigos, mensajes, orden y posiciones de errores.
+# Los errores que ANTLR ubicaba en el inicio de una subexpresión usan _start(e): el AST
+# guarda en 'pos' el token propio del nodo ('(' de la llamada, '.', '['), no el inicio.
+from __future__ import annotations
+from typing import Any, List, Optional
+
+from src.ast import nodes as A
+from .errors import (
+    E_UNDECLARED, E_ASSIGN_INCOMPAT, E_OP_TYPES, E_CALL_ARITY, E_INDEX_INVALID,
+    E_MEMBER_NOT_FOUND, E_DUPLICATE_ID, E_THIS_CONTEXT, E_BAD_BREAK_CONTINUE, E_COND_NOT_BOOL,
+    E_RETURN_OUTSIDE, E_MISSING_RETURN, E_ASSIGN_TO_CONST, E_DEAD_CODE,
+)
+from .checker_base import CheckerBase
+from .scopes import ClassScope, FunctionScope
+from .symbols import (
+    VariableSymbol, ConstSymbol, ParamSymbol, FieldSymbol,
+    FunctionSymbol, ClassSymbol
+)
+from .types import (
+    Type, BOOLEAN, INTEGER, FLOAT, STRING, VOID, NULL,
+    ArrayType, ClassType, function_type,
+    is_boolean, is_assignable, array_of, index_result,
+    binary_result, unary_result, is_numeric
+)
+
+_SUFFIXES = (A.CallExpr, A.IndexExpr, A.PropertyAccessExpr)
+
+def _start(e: A.Node) -> A.Pos:
+    """Posición donde empieza 'e' en el fuente (incluye paréntesis y la base de los sufijos)."""
+    while e.paren_pos is None:
+        t = type(e)
+        if t is A.CallExpr:
+            e = e.func
+        elif t is A.IndexExpr:
+            e = e.array
+        elif t is A.PropertyAccessExpr:
+            e = e.obj
+        else:
+            return e.pos
+    return e.paren_pos
+
+def _split_chain(e: A.Expr):
+    """a.b[i](x) -> (a, [.b, [i], (x)]) en orden de evaluación."""
+    suffixes: List[A.Expr] = []
+    while type(e) in _SUFFIXES:
+        suffixes.append(e)
+        e = e.func if type(e) is A.CallExpr else (e.array if type(e) is A.IndexExpr else e.obj)
+    suffixes.reverse()
+    return e, suffixes
+
+
+class ASTTypeChecker(CheckerBase):
+    """Pasada 3 sobre el AST. Requiere un ASTDeclarationCollector ya recorrido y enlazado."""
+
+    def _error_at(self, code: str, message: str, e: A.Node) -> None:
+        ln, col = _start(e)
+        self.rep.error(code, message, line=ln, column=col - 1)
+
+    def _require_boolean(self, t: Type, e: A.Expr) -> None:
+        if not is_boolean(t):
+            self._error_at(E_COND_NOT_BOOL, f"Se requiere boolean, recibido {t}", e)
+
+    # ===== Entrypoint =====
+
+    def visit_program(self, prog: A.Program, workers: int = 1) -> None:
+        """'workers' > 1: cuerpos de funciones/clases top-level en paralelo (ver sema/parallel.py)."""
+        if workers > 1:
+            from .parallel import check_program
+            check_program(self, prog, workers)
+            return None
+        for st in prog.statements:
+            self._stmt(st)
+        return None
+
+    def _stmt(self, st: A.Stmt) -> Any:
+        return self._STMTS[type(st)](self, st)
+
+    # ===== Bloques y control de flujo =====
+
+    def _block_body(self, blk: A.Block) -> bool:
+        must_return = False
+        for st in blk.statements:
+            if must_return:
+                self.rep.error(E_DEAD_CODE, "Código inalcanzable después de return/break/continue", st)
+                continue
+            if self._stmt(st) is True:
+                must_return = True
+        return must_return
+
+    def _block(self, blk: A.Block) -> bool:
+        self.scopes.enter_block()
+        must_return = self._block_body(blk)
+        self.scopes.pop()
+        return must_return
+
+    def _if(self, st: A.IfStmt) -> bool:
+        cond_t = self._expr(st.cond)
+        if cond_t is not None:
+            self._require_boolean(cond_t, st.cond)
+        then_ret = self._block(st.then_block)
+        else_ret = False
+        if st.else_block is not None:
+            else_ret = self._block(st.else_block)
+        return bool(then_ret and else_ret)
+
+    def _while(self, st: A.WhileStmt) -> bool:
+        cond_t = self._expr(st.cond)
+        if cond_t is not None:
+            self._require_boolean(cond_t, st.cond)
+        self.loop_depth += 1
+        self._block(st.body)
+        self.loop_depth -= 1
+        return False
+
+    def _do_while(self, st: A.DoWhileStmt) -> bool:
+        self.loop_depth += 1
+        self._block(st.body)
+        self.loop_depth -= 1
+        cond_t = self._expr(st.cond)
+        if cond_t is not None:
+            self._require_boolean(cond_t, st.cond)
+        return False
+
+    def _for(self, st: A.ForStmt) -> bool:
+        if st.init is not None:
+            self._stmt(st.init)
+        if st.cond is not None:
+            cond_t = self._expr(st.cond)
+            if cond_t is not None:
+                self._require_boolean(cond_t, st.cond)
+        if st.update is not None:
+            self._expr(st.update)
+        self.loop_depth += 1
+        self._block(st.body)
+        self.loop_depth -= 1
+        return False
+
+    def _foreach(self, st: A.ForeachStmt) -> bool:
+        arr_t = self._expr(st.iterable)
+        elem_t: Optional[Type] = None
+        if isinstance(arr_t, ArrayType):
+            elem_t = getattr(arr_t, "elem", None) or getattr(arr_t, "element", None)
+        else:
+            self._error_at(E_OP_TYPES, f"foreach requiere arreglo, recibido {arr_t}", st.iterable)
+
+        self.loop_depth += 1
+        # mismo scope de bloque que abrió la pasada de declaraciones para el iterador
+        self.scopes.enter_block()
+        it_sym = self.scope.resolve(st.var_name)
+        if it_sym is None:
+            it_sym = VariableSymbol(name=st.var_name)
+            self._declare_local_or_error(st, it_sym)
+            it_sym = self.scope.resolve(st.var_name)
+        if isinstance(it_sym, VariableSymbol):
+            it_sym.resolved_type = elem_t
+        self._block(st.body)
+        self.scopes.pop()
+        self.loop_depth -= 1
+        return False
+
+    def _break(self, st: A.BreakStmt) -> bool:
+        if self.loop_depth == 0:
+            self.rep.error(E_BAD_BREAK_CONTINUE, "`break` fuera de un bucle", st)
+        return True
+
+    def _continue(self, st: A.ContinueStmt) -> bool:
+        if self.loop_depth == 0:
+            self.rep.error(E_BAD_BREAK_CONTINUE, "`continue` fuera de un bucle", st)
+        return True
+
+    def _return(self, st: A.ReturnStmt) -> bool:
+        if self.current_function is None:
+            self.rep.error(E_RETURN_OUTSIDE, "`return` fuera de una función", st)
+            return True
+        expected = self.current_function.resolved_return or VOID
+        if st.value is not None:
+            val_t = self._expr(st.value)
+            if expected == VOID:
+                self.rep.error(E_OP_TYPES, "La función es void y no debe retornar valor", st)
+            elif val_t is not None and not is_assignable(val_t, expected, self.hierarchy):
+                self._error_at(E_ASSIGN_INCOMPAT, f"Tipo de retorno {val_t} no asignable a {expected}", st.value)
+        elif expected != VOID:
+            self.rep.error(E_MISSING_RETURN, f"Se requiere retornar {expected}", st)
+        return True
+
+    def _switch(self, st: A.SwitchStmt) -> bool:
+        cond_t = self._expr(st.expr)
+        # boolean o string; si no es ninguno, ambos errores (compatibilidad de tests)
+        if cond_t is not None and cond_t not in (STRING, BOOLEAN):
+            self._error_at(E_COND_NOT_BOOL, f"switch requiere 'boolean', recibido {cond_t}", st.expr)
+            self._error_at(E_OP_TYPES, f"switch requiere 'string', recibido {cond_t}", st.expr)
+
+        if cond_t == STRING:
+            expect = "Etiqueta de case debe ser 'string'"
+        elif cond_t == BOOLEAN:
+            expect = "Etiqueta de case debe ser 'boolean'"
+        else:
+            expect = "Etiqueta de case con tipo incompatible"
+
+        # duplicados solo para literales string
+        seen_str_literals: set[str] = set()
+        for case in st.cases:
+            label_t = self._expr(case.expr)
+            if cond_t in (STRING, BOOLEAN) and label_t is not None and label_t != cond_t:
+                self._error_at(E_OP_TYPES, f"{expect}, recibido {label_t}", case.expr)
+            if cond_t == STRING and isinstance(case.expr, A.StringLiteral):
+                lit = case.expr.value
+                if lit in seen_str_literals:
+                    self.rep.error(E_DUPLICATE_ID, f'Etiqueta de case duplicada: "{lit}"', case)
+                else:
+                    seen_str_literals.add(lit)
+            for s in case.body:
+                self._stmt(s)
+        if st.default_body:
+            for s in st.default_body:
+                self._stmt(s)
+        return False
+
+    def _try(self, st: A.TryCatchStmt) -> bool:
+        # el nombre del catch no se declara (igual que la versión sobre el parse tree)
+        self._block(st.try_block)
+        return self._block(st.catch_block)
+
+    # ===== Declaraciones dentro de cuerpos =====
+
+    def _var_decl(self, st: A.VarDecl) -> bool:
+        if st.is_const:
+            return self._const_decl(st)
+        name, tann = st.name, st.type_ann
+        if self.scope.kind in ("global", "class"):
+            sym = self.scope.resolve(name)
+        else:
+            self._declare_local_or_error(st, VariableSymbol(name=name, type_ann=tann))
+            sym = self.scope.resolve(name)
+        if st.init is not None:
+            val_t = self._expr(st.init)
+            if isinstance(sym, VariableSymbol):
+                if tann:
+                    dst = self._tl._parse_type_str(tann)
+                    sym.resolved_type = dst
+                    if val_t is not None and not is_assignable(val_t, dst, self.hierarchy):
+                        self._error_at(E_ASSIGN_INCOMPAT, f"No se puede asignar {val_t} a {dst}", st.init)
+                else:
+                    sym.resolved_type = val_t
+        return False
+
+    def _const_decl(self, st: A.VarDecl) -> bool:
+        name, tann = st.name, st.type_ann
+        sym = self.scope.resolve(name)
+        if not isinstance(sym, ConstSymbol):
+            self._declare_local_or_error(st, ConstSymbol(name=name))
+            sym = self.scope.resolve(name)
+        val_t = self._expr(st.init)
+        if isinstance(sym, ConstSymbol):
+            if tann:
+                dst = self._tl._parse_type_str(tann)
+                sym.resolved_type = dst
+                if val_t is not None and not is_assignable(val_t, dst, self.hierarchy):
+                    self._error_at(E_ASSIGN_INCOMPAT, f"No se puede asignar {val_t} a {dst}", st.init)
+            else:
+                sym.resolved_type = val_t
+        return False
+
+    def _function_decl(self, st: A.FunctionDecl) -> bool:
+        fname = st.name
+        is_method = self.scope.kind == "class" and isinstance(self.current_class, ClassSymbol)
+        key = self._fn_key_for_current_context(fname, is_method=is_method)
+        fn_scope: FunctionScope = self.decl.function_scopes[key]
+        if fn_scope.parent is not self.scope:
+            fn_scope.parent = self.scope
+
+        prev_func, prev_class = self.current_function, self.current_class
+        fn_sym = self.scope.resolve(fname)
+        if not isinstance(fn_sym, FunctionSymbol):
+            fn_sym = FunctionSymbol(name=fname)  # fallback
+        self.current_function = fn_sym
+        if is_method and prev_class is None and isinstance(self.scope, ClassScope):
+            self.current_class = self.decl.global_scope.resolve(self.scope.name)
+
+        self.scopes.push(fn_scope)
+        must_return = self._block_body(st.body)
+        self.scopes.pop()
+
+        expected = fn_sym.resolved_return or VOID
+        if expected != VOID and not must_return:
+            self.rep.error(E_MISSING_RETURN, f"Falta return en todos los caminos para {expected}", st)
+        self.current_function, self.current_class = prev_func, prev_class
+        return False
+
+    def _class_decl(self, st: A.ClassDecl) -> bool:
+        prev_class = self.current_class
+        csym = self.decl.global_scope.resolve(st.name)
+        self.current_class = csym if isinstance(csym, ClassSymbol) else None
+        self.scopes.push(self.decl.class_scopes[st.name])
+        for m in st.members:
+            if isinstance(m.member, A.FunctionDecl):
+                self._function_decl(m.member)
+        self.scopes.pop()
+        self.current_class = prev_class
+        return False
+
+    # ===== Sentencias =====
+
+    def _expr_stmt(self, st: A.ExprStmt) -> bool:
+        self._expr(st.expr)
+        return False
+
+    def _print(self, st: A.PrintStmt) -> None:
+        self._expr(st.expr)
+        return None
+
+    def _assign(self, st: A.Assign) -> bool:
+        """Sentencia de asignación: 'x = e;' o 'obj.prop = e;' (la forma con '[ ]' es una expresión)."""
+        target = st.target
+        if isinstance(target, A.Identifier):
+            name = target.name
+            sym = self._resolve_var(st, name, node=target)
+            if isinstance(sym, ConstSymbol):
+                self.rep.error(E_ASSIGN_TO_CONST, f"No se puede reasignar const '{name}'", st)
+            dst_t = self._type_of_symbol(sym) if sym else None
+            val_t = self._expr(st.value)
+            if dst_t and val_t and not is_assignable(val_t, dst_t, self.hierarchy):
+                self._error_at(E_ASSIGN_INCOMPAT, f"No se puede asignar {val_t} a {dst_t}", st.value)
+            return False
+
+        obj_t = self._expr(target.obj)
+        if not isinstance(obj_t, ClassType):
+            self._error_at(E_MEMBER_NOT_FOUND, f"No es objeto para asignación de propiedad: {obj_t}", target.obj)
+            return False
+        prop = target.prop
+        mem = self._member_lookup(obj_t, prop)
+        if not isinstance(mem, FieldSymbol):
+            self.rep.error(E_MEMBER_NOT_FOUND, f"Propiedad '{prop}' no existe", st)
+            return False
+        if not getattr(mem, "mutable", True):
+            self.rep.error(E_ASSIGN_TO_CONST, f"No se puede reasignar const '{prop}'", st)
+            return False
+        dst_t = getattr(mem, "resolved_type", None)
+        val_t = self._expr(st.value)
+        if dst_t and val_t and not is_assignable(val_t, dst_t, self.hierarchy):
+            self._error_at(E_ASSIGN_INCOMPAT, f"No se puede asignar {val_t} a {dst_t}", st.value)
+        return False
+
+    _STMTS = {
+        A.Block: _block,
+        A.VarDecl: _var_decl,
+        A.Assign: _assign,
+        A.ExprStmt: _expr_stmt,
+        A.PrintStmt: _print,
+        A.IfStmt: _if,
+        A.WhileStmt: _while,
+        A.DoWhileStmt: _do_while,
+        A.ForStmt: _for,
+        A.ForeachStmt: _foreach,
+        A.TryCatchStmt: _try,
+        A.SwitchStmt: _switch,
+        A.BreakStmt: _break,
+        A.ContinueStmt: _continue,
+        A.ReturnStmt: _return,
+        A.FunctionDecl: _function_decl,
+        A.ClassDecl: _class_decl,
+    }
+
+    # ===== Expresiones =====
+
+    def _expr(self, e: A.Expr) -> Optional[Type]:
+        return self._EXPRS[type(e)](self, e)
+
+    def _binary(self, e: A.BinaryOp) -> Optional[Type]:
+        left_t = self._expr(e.left)
+        right_t = self._expr(e.right)
+        res = binary_result(e.op, left_t, right_t)
+        if res is None:
+            self._error_at(E_OP_TYPES, f"Tipos inválidos para operador {e.op}", e.right)
+            return left_t
+        return res
+
+    def _unary(self, e: A.UnaryOp) -> Optional[Type]:
+        t = self._expr(e.expr)
+        if e.op == "!":
+            if unary_result("!", t) is None:
+                self.rep.error(E_OP_TYPES, f"Operador '!' requiere boolean, recibido {t}", e)
+            return BOOLEAN
+        if unary_result("-", t) is None:
+            self.rep.error(E_OP_TYPES, f"Operador '-' requiere numérico, recibido {t}", e)
+        return t
+
+    def _ternary(self, e: A.TernaryOp) -> Optional[Type]:
+        # sin chequeo de la condición; el tipo es el de la rama 'else'
+        self._expr(e.cond)
+        self._expr(e.then)
+        return self._expr(e.other)
+
+    def _array_literal(self, e: A.ArrayLiteral) -> Type:
+        if not e.elements:
+            self.rep.error(E_OP_TYPES, "Literal de arreglo vacío sin tipo explícito", e)
+            return array_of(VOID)
+        t0: Optional[Type] = None
+        for el in e.elements:
+            te = self._expr(el)
+            if t0 is None:
+                t0 = te
+            elif te != t0:
+                if te and t0 and is_numeric(te) and is_numeric(t0):
+                    t0 = FLOAT if FLOAT in (te, t0) else INTEGER
+                else:
+                    self._error_at(E_OP_TYPES, f"Elementos de arreglo incompatibles: {t0} y {te}", el)
+        return array_of(t0 or VOID)
+
+    def _method_type(self, ctype: ClassType, prop: str, mem: FunctionSymbol) -> Type:
+        owner, _ = self.layouts.get(ctype.name).methods[prop]  # clase que define el método
+        return self._fn_signature(mem, f"{owner}::{prop}")
+
+    def _lhs(self, e: A.Expr) -> Optional[Type]:
+        """Átomo (identificador, new, this) seguido de llamadas, índices y accesos."""
+        atom, suffixes = _split_chain(e)
+
+        if type(atom) is A.Identifier:
+            name = atom.name
+            res = self._resolve_ref(atom, name)
+            if res is None:
+                self.rep.error(E_UNDECLARED, f"Identificador no declarado: {name}", atom)
+                base_t = None
+            else:
+                sym = res.symbol
+                if isinstance(sym, (VariableSymbol, ConstSymbol, ParamSymbol)):
+                    self._maybe_capture(res)
+                if isinstance(sym, (VariableSymbol, ConstSymbol, ParamSymbol, FieldSymbol)):
+                    base_t = self._type_of_symbol(sym)
+                elif isinstance(sym, ClassSymbol):
+                    base_t = ClassType(sym.name)
+                else:
+                    base_t = None
+
+        elif type(atom) is A.NewExpr:
+            cname = atom.class_name
+            args = [self._expr(a) for a in atom.args]
+            csym = self.decl.global_scope.resolve(cname)
+            if not isinstance(csym, ClassSymbol):
+                self.rep.error(E_MEMBER_NOT_FOUND, f"Clase '{cname}' no existe", atom)
+                return ClassType(cname)
+            ctor = self._member_lookup(ClassType(cname), "constructor")
+            if isinstance(ctor, FunctionSymbol):
+                exp = self._fn_signature(ctor, f"{cname}::constructor").params
+                try:
+                    self._call_type(function_type(exp, VOID), args)
+                except Exception as ex:
+                    msg = str(ex)
+                    code = E_CALL_ARITY if "Aridad" in msg else E_OP_TYPES
+                    self.rep.error(code, f"Constructor de {cname}: {msg}", atom)
+            elif args:
+                self.rep.error(E_CALL_ARITY, f"{cname} no tiene constructor; se esperaban 0 argumentos", atom)
+            base_t = ClassType(cname)
+
+        elif type(atom) is A.ThisExpr:
+            if self.current_class is None:
+                self.rep.error(E_THIS_CONTEXT, "`this` solo puede usarse dentro de métodos de clase", atom)
+                return None
+            base_t = ClassType(self.current_class.name)
+
+        else:
+            base_t = self._expr(atom)
+
+        cur_t = base_t
+        for s in suffixes:
+            if type(s) is A.CallExpr:
+                if type(atom) is A.Identifier and base_t is None:
+                    fname = atom.name
+                    res = self.resolved.get(atom)  # ya resuelto arriba
+                    fsym = res.symbol if res is not None else None
+                    if not isinstance(fsym, FunctionSymbol):
+                        self.rep.error(E_UNDECLARED, f"Llamada a '{fname}' que no es función", s)
+                        return None
+                    key = self._qualified_key_from_decl_scope(res.scope, fname)
+                    fn_t = self._fn_signature(fsym, key)
+                else:
+                    if cur_t is None:
+                        self.rep.error(E_OP_TYPES, "Llamada sobre algo que no es función", s)
+                        return None
+                    fn_t = cur_t
+                args = [self._expr(a) for a in s.args]
+                try:
+                    cur_t = self._call_type(fn_t, args)  # type: ignore[arg-type]
+                except Exception as ex:
+                    msg = str(ex)
+                    code = E_CALL_ARITY if "Aridad" in msg else E_OP_TYPES
+                    self.rep.error(code, msg, s)
+                    cur_t = getattr(fn_t, "ret", None)
+
+            elif type(s) is A.IndexExpr:
+                idx_t = self._expr(s.index)
+                try:
+                    cur_t = index_result(cur_t, idx_t)  # type: ignore[arg-type]
+                except Exception:
+                    self.rep.error(E_INDEX_INVALID, f"Indexación inválida sobre {cur_t} con índice {idx_t}", s)
+                    cur_t = None
+
+            else:
+                prop = s.prop
+                if not isinstance(cur_t, ClassType):
+                    self.rep.error(E_MEMBER_NOT_FOUND, f"Acceso '{prop}' sobre no-objeto {cur_t}", s)
+                    cur_t = None
+                else:
+                    mem = self._member_lookup(cur_t, prop)
+                    if mem is None:
+                        self.rep.error(E_MEMBER_NOT_FOUND, f"Miembro '{prop}' no existe en {cur_t}", s)
+                        cur_t = None
+                    elif isinstance(mem, FieldSymbol):
+                        cur_t = getattr(mem, "resolved_type", None)
+                    elif isinstance(mem, FunctionSymbol):
+                        cur_t = self._method_type(cur_t, prop, mem)
+                    else:
+                        cur_t = None
+        return cur_t
+
+    # ===== Asignación como expresión =====
+
+    def _assign_expr(self, e: A.Assign) -> Optional[Type]:
+        rhs_t = self._expr(e.value)
+        atom, suffixes = _split_chain(e.target)
+        if type(atom) is A.ThisExpr:
+            if self.current_class is None:
+                self.rep.error(E_THIS_CONTEXT, "`this` solo puede usarse dentro de métodos de clase", atom)
+            else:
+                self.rep.error(E_OP_TYPES, "No se puede asignar a `this`", atom)
+            return rhs_t
+
+        last = suffixes[-1] if suffixes else None
+        if type(last) is A.PropertyAccessExpr:
+            obj_t = self._lhs_truncated(atom, suffixes[:-1])
+            if not isinstance(obj_t, ClassType):
+                self.rep.error(E_MEMBER_NOT_FOUND, "Asignación a propiedad sobre no-objeto", e)
+                return rhs_t
+            prop = last.prop
+            mem = self._member_lookup(obj_t, prop)
+            if not isinstance(mem, FieldSymbol):
+                self.rep.error(E_MEMBER_NOT_FOUND, f"Propiedad '{prop}' no existe", e)
+                return rhs_t
+            dst_t = getattr(mem, "resolved_type", None)
+            if not getattr(mem, "mutable", True):
+                self.rep.error(E_ASSIGN_TO_CONST, f"No se puede reasignar const '{prop}'", e)
+                return dst_t or rhs_t
+            if dst_t and rhs_t and not is_assignable(rhs_t, dst_t, self.hierarchy):
+                self._error_at(E_ASSIGN_INCOMPAT, f"No se puede asignar {rhs_t} a {dst_t}", e.value)
+            return dst_t or rhs_t
+
+        if type(last) is A.IndexExpr:
+            arr_t = self._lhs_truncated(atom, suffixes[:-1])
+            idx_t = self._expr(last.index)
+            try:
+                elem_t = index_result(arr_t, idx_t)  # type: ignore[arg-type]
+            except Exception:
+                self.rep.error(E_INDEX_INVALID, "Asignación con indexación inválida", last)
+                return rhs_t
+            if elem_t and rhs_t and not is_assignable(rhs_t, elem_t, self.hierarchy):
+                self._error_at(E_ASSIGN_INCOMPAT, f"No se puede asignar {rhs_t} a {elem_t}", e.value)
+            return elem_t or rhs_t
+
+        self.rep.error(E_OP_TYPES, "El lado izquierdo de la asignación no es asignable", e)
+        return rhs_t
+
+    def _lhs_truncated(self, atom: A.Expr, suffixes: List[A.Expr]) -> Optional[Type]:
+        if type(atom) is A.Identifier:
+            sym = self._resolve_var(atom, atom.name)
+            cur_t = self._type_of_symbol(sym) if sym else None
+        elif type(atom) is A.NewExpr:
+            cur_t = ClassType(atom.class_name)
+        elif type(atom) is A.ThisExpr:
+            cur_t = ClassType(self.current_class.name) if self.current_class else None
+        else:
+            cur_t = None
+
+        for s in suffixes:
+            if type(s) is A.CallExpr:
+                self.rep.error(E_OP_TYPES, "Llamada en LHS no soportada", s)
+                return None
+            elif type(s) is A.IndexExpr:
+                idx_t = self._expr(s.index)
+                try:
+                    cur_t = index_result(cur_t, idx_t)  # type: ignore[arg-type]
+                except Exception:
+                    self.rep.error(E_INDEX_INVALID, "Indexación inválida", s)
+                    return None
+            else:
+                prop = s.prop
+                if not isinstance(cur_t, ClassType):
+                    self.rep.error(E_MEMBER_NOT_FOUND, f"Acceso '{prop}' sobre no-objeto", s)
+                    return None
+                mem = self._member_lookup(cur_t, prop)
+                if mem is None:
+                    self.rep.error(E_MEMBER_NOT_FOUND, f"Miembro '{prop}' no existe", s)
+                    return None
+                if isinstance(mem, FieldSymbol):
+                    cur_t = getattr(mem, "resolved_type", None)
+                elif isinstance(mem, FunctionSymbol):
+                    cur_t = self._method_type(cur_t, prop, mem)
+        return cur_t
+
+    _EXPRS = {
+        A.IntLiteral: lambda self, e: INTEGER,
+        A.FloatLiteral: lambda self, e: FLOAT,
+        A.StringLiteral: lambda self, e: STRING,
+        A.BoolLiteral: lambda self, e: BOOLEAN,
+        A.NullLiteral: lambda self, e: NULL,
+        A.ArrayLiteral: _array_literal,
+        A.Identifier: _lhs,
+        A.NewExpr: _lhs,
+        A.ThisExpr: _lhs,
+        A.CallExpr: _lhs,
+        A.IndexExpr: _lhs,
+        A.PropertyAccessExpr: _lhs,
+        A.UnaryOp: _unary,
+        A.BinaryOp: _binary,
+        A.TernaryOp: _ternary,
+        A.Assign: _assign_expr,
+    }
@@ -0,0 +1,157 @@
+# program/src/sema/checker_base.py
+# Estado y helpers de la pasada de tipos, sin dependencias de ANTLR.
+# Los comparten TypeCheckVisitor (parse tree) y ASTTypeChecker (AST). 'ctx' es cualquier
+# cosa que ErrorReporter sepa ubicar: un ctx de ANTLR o un nodo del AST.
+from __future__ import annotations
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, Union
+
+from .errors import ErrorReporter, E_UNDECLARED, E_DUPLICATE_ID
+from .scopes import Scope, ScopeStack, ClassScope, FunctionScope
+from .symbols import (
+    Symbol, VariableSymbol, ConstSymbol, ParamSymbol, FieldSymbol,
+    FunctionSymbol, ClassSymbol
+)
+from .types import Type, ClassType, FunctionType, VOID, function_type, call_result
+from .type_linker import TypeLinker
+from .class_layout import ClassLayoutIndex
+from .class_hierarchy import ClassHierarchy
+from .resolution import Resolution, ResolutionTable
+
+if TYPE_CHECKING:
+    from .decl_collector import DeclarationCollector
+    from .ast_decl_collector import ASTDeclarationCollector
+    Collector = Union[DeclarationCollector, ASTDeclarationCollector]
+
+class CheckerBase:
+    def __init__(self, reporter: ErrorReporter, decl: "Collector") -> None:
+        self.rep = reporter
+        self.decl = decl
+        self.scopes = ScopeStack(decl.global_scope)
+        self.current_function: Optional[FunctionSymbol] = None
+        self.current_class: Optional[ClassSymbol] = None
+        self.loop_depth: int = 0
+        self._tl = TypeLinker(self.rep, decl)
+        # lo arma TypeLinker.link(); si el llamador no enlazó, se arma aquí
+        self.layouts: ClassLayoutIndex = decl.class_layouts or ClassLayoutIndex(decl)
+        # jerarquía de clases (la arma el chequeo de ciclos del colector): subtipos en O(1)
+        self.hierarchy: ClassHierarchy = decl.class_hierarchy or ClassHierarchy(decl.class_bases)
+        # resoluciones de cada identificador; quedan en decl para las pasadas siguientes
+        self.resolved = decl.resolutions = ResolutionTable()
+        # memos de la pasada: firma por FunctionSymbol y tipo de una llamada por (firma, tipos
+        # de los argumentos). Cada nodo se tipa una sola vez, así que no se memoiza por nodo: lo
+        # que se repite es f(1), f(2)... Los contadores salen en --stats (type_memo_hits/misses)
+        self._call_memo: Dict[Tuple[Type, Tuple[Optional[Type], ...]], Type] = {}
+        self._sig_memo: Dict[int, Tuple[FunctionSymbol, FunctionType]] = {}
+        self.memo_hits = 0
+        self.memo_misses = 0
+
+    # ===== Utilidades =====
+
+    @property
+    def scope(self) -> Scope:
+        return self.scopes.current
+
+    def _declare_local_or_error(self, ctx: Any, sym: Symbol) -> None:
+        """
+        Declara en el scope actual (sólo si NO es global/clase).
+        Si el identificador ya existe en el scope ACTUAL, reporta E_DUPLICATE_ID.
+        (Permite shadowing respecto a scopes exteriores.)
+        """
+        if self.scope.kind in ("global", "class"):
+            return
+        if not self.scope.declare(sym):
+            self.rep.error(E_DUPLICATE_ID, f"Identificador redeclarado: {sym.name}", ctx)
+        else:
+            self.resolved.declare(ctx, self.scope, sym.name)
+
+    def _resolve_ref(self, node: Any, name: str) -> Optional[Resolution]:
+        """Resuelve un uso de 'name' y lo anota en la tabla lateral (clave: 'node')."""
+        return self.resolved.resolve(node, self.scope, name)
+
+    def _resolve_var(self, ctx: Any, name: str, node: Any = None) -> Optional[Symbol]:
+        res = self.resolved.resolve(ctx if node is None else node, self.scope, name)
+        if res is None:
+            self.rep.error(E_UNDECLARED, f"Identificador no declarado: {name}", ctx)
+            return None
+        # destino de una asignación: escribir una variable externa también es capturarla
+        if isinstance(res.symbol, (VariableSymbol, ConstSymbol, ParamSymbol)):
+            self._maybe_capture(res)
+        return res.symbol
+
+    def _type_of_symbol(self, sym: Symbol) -> Optional[Type]:
+        if isinstance(sym, (VariableSymbol, ConstSymbol, ParamSymbol, FieldSymbol)):
+            return getattr(sym, "resolved_type", None)
+        if isinstance(sym, FunctionSymbol):
+            return None
+        if isinstance(sym, ClassSymbol):
+            return ClassType(sym.name)
+        return None
+
+    def _current_function_scope(self) -> Optional[FunctionScope]:
+        return self.scopes.current_function_scope()
+    
+    def _fn_key_for_current_context(self, fname: str, is_method: bool) -> str:
+        path = self.scopes.function_path()
+        parts = list(path) + [fname]
+        if self.current_class is not None:
+            if not path and is_method:
+                return f"{self.current_class.name}::{fname}"
+            return f"{self.current_class.name}::" + "::".join(parts)
+        return "::" + "::".join(parts)
+
+    def _maybe_capture(self, res: Resolution) -> None:
+        # capturado = declarado en (un bloque de) otra función que la actual
+        if self.current_function is None or res.function is None:
+            return
+        cur_fn_scope = self._current_function_scope()
+        if cur_fn_scope is None or res.function is cur_fn_scope:
+            return
+        self.current_function.capture(res.name)
+
+    def _call_type(self, fn_t: Type, args: List[Optional[Type]]) -> Type:
+        """call_result memoizado: los tipos están internados y la jerarquía no cambia en la pasada.
+        Solo se guardan las llamadas válidas; una inválida vuelve a lanzar SemanticTypeError."""
+        key = (fn_t, tuple(args))
+        t = self._call_memo.get(key)
+        if t is not None:
+            self.memo_hits += 1
+            return t
+        self.memo_misses += 1
+        t = self._call_memo[key] = call_result(fn_t, args, self.hierarchy)
+        return t
+
+    def _fn_signature(self, fsym: FunctionSymbol, key: str) -> FunctionType:
+        """(params) -> ret de 'fsym'; los tipos de params salen de su scope ('key') si existe."""
+        hit = self._sig_memo.get(id(fsym))
+        if hit is not None:
+            self.memo_hits += 1
+            return hit[1]
+        self.memo_misses += 1
+        fscope = self.decl.function_scopes.get(key)
+        if fscope:
+            params = [getattr(fscope.resolve(p.name), "resolved_type", None) for p in fsym.params]
+        else:
+            params = [getattr(p, "resolved_type", None) for p in fsym.params]
+        sig = function_type(params, fsym.resolved_return or VOID)
+        self._sig_memo[id(fsym)] = (fsym, sig)
+        return sig
+
+    def _member_lookup(self, ctype: ClassType, member: str) -> Optional[Symbol]:
+        # tabla aplanada (propios + heredados); solo miembros, nunca globales
+        return self.layouts.lookup(ctype.name, member)
+
+    def _qualified_key_from_decl_scope(self, decl_scope: Scope, fname: str) -> str:
+        parts = []
+        cls = None
+        s = decl_scope
+        while s is not None:
+            if isinstance(s, FunctionScope):
+                parts.append(s.name)
+            elif isinstance(s, ClassScope):
+                cls = s.name
+            s = s.parent
+        parts = list(reversed(parts))
+        parts.append(fname)
+        if cls:
+            return f"{cls}::" + "::".join(parts)
+        return "::" + "::".join(parts)
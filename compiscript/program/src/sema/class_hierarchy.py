@@ -0,0 +1,73 @@
+# program/src/sema/class_hierarchy.py
+# Índice de la jerarquía de clases. Se arma una vez, al final del chequeo de ciclos del
+# colector (E140), a partir de class_bases. Cada clase recibe números pre/post de un DFS
+# sobre el bosque de herencia: A es subclase de B si el intervalo de A cae dentro del de B,
+# así que is_subclass (y con él is_assignable entre clases) es O(1) sin subir por las bases.
+# 'order' (bases antes que derivadas) y 'depth' sirven para layout de objetos y vtables.
+from __future__ import annotations
+from typing import Dict, List, Optional
+
+class ClassHierarchy:
+    def __init__(self, class_bases: Dict[str, Optional[str]]) -> None:
+        # base válida: una clase declarada; una base desconocida deja a la clase como raíz
+        parent: Dict[str, Optional[str]] = {
+            c: (b if b in class_bases else None) for c, b in class_bases.items()
+        }
+        # un ciclo (ya reportado como E140) se corta en la arista que lo cierra
+        state: Dict[str, int] = {}  # 1 = en el camino actual, 2 = listo
+        for c in class_bases:
+            path: List[str] = []
+            x: Optional[str] = c
+            while x is not None and x not in state:
+                state[x] = 1
+                path.append(x)
+                x = parent[x]
+            if x is not None and state[x] == 1:
+                parent[path[-1]] = None
+            for y in path:
+                state[y] = 2
+        self.parent = parent
+
+        children: Dict[Optional[str], List[str]] = {}
+        for c, p in parent.items():
+            children.setdefault(p, []).append(c)
+        self.pre: Dict[str, int] = {}
+        self.post: Dict[str, int] = {}
+        self.depth: Dict[str, int] = {}
+        self.order: List[str] = []  # preorden: cada clase después de su base
+        n = 0
+        for root in children.get(None, ()):
+            stack = [(root, 0, False)]
+            while stack:
+                c, d, done = stack.pop()
+                if done:
+                    self.post[c] = n
+                    n += 1
+                    continue
+                self.pre[c] = n
+                n += 1
+                self.depth[c] = d
+                self.order.append(c)
+                stack.append((c, d, True))
+                for ch in reversed(children.get(c, ())):
+                    stack.append((ch, d + 1, False))
+
+    def __contains__(self, cname: str) -> bool:
+        return cname in self.pre
+
+    def is_subclass(self, a: str, b: str) -> bool:
+        """a == b o a hereda (directa o indirectamente) de b."""
+        pa, pb = self.pre.get(a), self.pre.get(b)
+        if pa is None or pb is None:
+            return a == b
+        return pb <= pa and self.post[a] <= self.post[b]
+
+    def ancestors(self, cname: str) -> List[str]:
+        """Cadena desde la raíz hasta 'cname' (incluida), en orden de layout."""
+        out: List[str] = []
+        c: Optional[str] = cname if cname in self.parent else None
+        while c is not None:
+            out.append(c)
+            c = self.parent[c]
+        out.reverse()
+        return out
@@ -0,0 +1,70 @@
+# program/src/sema/class_layout.py
+# Índice de layout de clases: por clase, la tabla aplanada de miembros (propios tapan a los
+# heredados), el orden de campos y la tabla de métodos. Se arma una vez al final de
+# TypeLinker.link(); la pasada de tipos resuelve obj.p con un solo dict lookup en vez de
+# subir por la cadena de bases (y por los scopes padres de cada ClassScope) en cada acceso.
+from __future__ import annotations
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+from .symbols import Symbol, FieldSymbol, FunctionSymbol, ClassSymbol
+
+if TYPE_CHECKING:
+    from .collector_base import CollectorBase
+
+@dataclass
+class ClassLayout:
+    name: str
+    base: Optional[str] = None
+    members: Dict[str, Symbol] = field(default_factory=dict)   # propios + heredados
+    fields: List[str] = field(default_factory=list)            # heredados primero
+    methods: Dict[str, Tuple[str, FunctionSymbol]] = field(default_factory=dict)  # nombre → (clase que lo define, símbolo)
+
+class ClassLayoutIndex:
+    def __init__(self, decl: CollectorBase) -> None:
+        self.decl = decl
+        self.layouts: Dict[str, ClassLayout] = {}
+        for cname in decl.class_scopes:
+            self._build(cname, set())
+
+    def _build(self, cname: str, visiting: set) -> Optional[ClassLayout]:
+        lay = self.layouts.get(cname)
+        if lay is not None:
+            return lay
+        cscope = self.decl.class_scopes.get(cname)
+        csym = self.decl.global_scope.resolve(cname)
+        base = csym.base_name if isinstance(csym, ClassSymbol) else None
+        if cscope is None and base is None:
+            return None
+        lay = ClassLayout(name=cname, base=base)
+        # un ciclo de herencia (E140) se corta donde lo corta ClassHierarchy (en la arista que
+        # lo cierra, recorriendo en orden de declaración): no depende de qué clase se arma primero
+        hier = self.decl.class_hierarchy
+        chain = hier.parent.get(cname, base) if hier is not None else base
+        visiting.add(cname)
+        parent = self._build(chain, visiting) if chain and chain not in visiting else None
+        visiting.discard(cname)
+        if parent is not None:
+            lay.members.update(parent.members)
+            lay.fields.extend(parent.fields)
+            lay.methods.update(parent.methods)
+        if cscope is not None:
+            for name, sym in cscope.items():
+                lay.members[name] = sym
+                if isinstance(sym, FieldSymbol):
+                    lay.methods.pop(name, None)
+                    if name not in lay.fields:
+                        lay.fields.append(name)
+                elif isinstance(sym, FunctionSymbol):
+                    lay.methods[name] = (cname, sym)
+                    if name in lay.fields:
+                        lay.fields.remove(name)
+        self.layouts[cname] = lay
+        return lay
+
+    def get(self, cname: str) -> Optional[ClassLayout]:
+        return self.layouts.get(cname)
+
+    def lookup(self, cname: str, member: str) -> Optional[Symbol]:
+        lay = self.layouts.get(cname)
+        return lay.members.get(member) if lay is not None else None
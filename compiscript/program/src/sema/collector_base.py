@@ -0,0 +1,101 @@
+# program/src/sema/collector_base.py
+# Estado y helpers de la pasada de declaraciones, sin dependencias de ANTLR.
+# Los comparten DeclarationCollector (parse tree) y ASTDeclarationCollector (AST).
+from __future__ import annotations
+from typing import Any, Dict, List, Optional, Tuple
+
+from .errors import ErrorReporter, E_DUPLICATE_ID, E_INHERIT_CYCLE
+from .scopes import GlobalScope, ClassScope, FunctionScope, Scope
+from .class_hierarchy import ClassHierarchy
+from .symbols import Symbol
+
+class CollectorBase:
+    def __init__(self, reporter: ErrorReporter) -> None:
+        self.reporter = reporter
+        self.global_scope = GlobalScope()
+        self.scope_stack: List[Scope] = [self.global_scope]
+        self.class_scopes: Dict[str, ClassScope] = {}
+        self.function_scopes: Dict[str, FunctionScope] = {}
+        self.class_nodes: Dict[str, Any] = {}  # ctx de ANTLR o A.ClassDecl (posición de errores)
+        self.class_bases: Dict[str, Optional[str]] = {}
+        # anotación → (Type, clase desconocida); lo llena TypeLinker, vive lo que la compilación
+        self.type_cache: Dict[str, Tuple[Any, Optional[str]]] = {}
+        self.class_layouts: Optional[Any] = None  # ClassLayoutIndex, al final de TypeLinker.link()
+        self.class_hierarchy: Optional[ClassHierarchy] = None  # al final de _check_inheritance_cycles
+        self.resolutions: Optional[Any] = None    # ResolutionTable, la llena la pasada de tipos
+
+    # ---------- scope helpers ----------
+    @property
+    def current_scope(self) -> Scope:
+        return self.scope_stack[-1]
+
+    def push(self, scope: Scope) -> None:
+        self.scope_stack.append(scope)
+
+    def pop(self) -> None:
+        self.scope_stack.pop()
+
+    def _push_block_scope(self, name: str = "block") -> None:
+        """
+        Abre un scope de bloque. Si tu Scope soporta new_child(name=...),
+        lo usamos; de lo contrario, usamos FunctionScope como contenedor local.
+        """
+        child = None
+        if hasattr(self.current_scope, "new_child"):
+            try:
+                child = self.current_scope.new_child(name=name)  # type: ignore[attr-defined]
+            except Exception:
+                child = None
+        if child is None:
+            child = FunctionScope(name=name, parent=self.current_scope)
+        self.push(child)
+
+    def _pop_block_scope(self) -> None:
+        self.pop()
+
+    # ---------- declaración con error si dup en MISMO scope ----------
+    def declare_or_error(self, sym: Symbol, ctx: Any) -> None:
+        # Prohíbe redeclaración **en el mismo scope** (shadowing en scopes padres sí se permite)
+        if not self.current_scope.declare(sym):
+            self.reporter.error(E_DUPLICATE_ID, f"Identificador redeclarado: {sym.name}", ctx)
+
+    # ---------- Ciclos de herencia ----------
+    def _check_inheritance_cycles(self):
+        WHITE, GRAY, BLACK = 0, 1, 2
+        color: Dict[str, int] = {k: WHITE for k in self.class_bases.keys()}
+
+        def dfs(u: str):
+            color[u] = GRAY
+            v = self.class_bases.get(u)
+            if v is not None and v in self.class_bases:
+                if color.get(v, WHITE) == GRAY:
+                    self.reporter.error(E_INHERIT_CYCLE, f"Ciclo de herencia involucrando '{u}' y '{v}'", self.class_nodes[u])
+                elif color.get(v, WHITE) == WHITE:
+                    dfs(v)
+            color[u] = BLACK
+
+        for cname in list(self.class_bases.keys()):
+            if color.get(cname, WHITE) == WHITE:
+                dfs(cname)
+        # con los ciclos ya reportados, el índice de subtipos los corta
+        self.class_hierarchy = ClassHierarchy(self.class_bases)
+
+    # ---------- Keys helper ----------
+    def _fn_key(self, fn) -> str:
+        return f"::{fn.name}"
+
+    def _method_key(self, cls: str, m: str) -> str:
+        return f"{cls}::{m}"
+
+    def _qualified_fn_key(self, name: str) -> str:
+        parts: List[str] = []
+        cls = None
+        for s in self.scope_stack:
+            if isinstance(s, ClassScope):
+                cls = s.name
+            elif isinstance(s, FunctionScope):
+                parts.append(s.name)
+        parts.append(name)
+        if cls:
+            return f"{cls}::" + "::".join(parts)
+        return "::" + "::".join(parts)
@@ -1,13 +1,13 @@
 # program/src/sema/decl_collector.py
 from __future__ import annotations
-from typing import Dict, List, Optional
-from antlr4 import ParserRuleContext
+from typing import Optional
 from CompiscriptParser import CompiscriptParser
 from CompiscriptVisitor import CompiscriptVisitor
-from .errors import ErrorReporter, E_DUPLICATE_ID, E_INHERIT_CYCLE, E_DUPLICATE_PARAM
-from .scopes import GlobalScope, ClassScope, FunctionScope, Scope
+from .errors import E_DUPLICATE_ID, E_DUPLICATE_PARAM
+from .scopes import ClassScope, FunctionScope
+from .collector_base import CollectorBase
 from .symbols import (
-    Symbol, VariableSymbol, ConstSymbol, ParamSymbol, FieldSymbol,
+    VariableSymbol, ConstSymbol, ParamSymbol, FieldSymbol,
     FunctionSymbol, ClassSymbol
 )
 
@@ -39,7 +39,7 @@ def _get_type_from_param(pctx):
     return None
 # -----------------------------------------------------------
 
-class DeclarationCollector(CompiscriptVisitor):
+class DeclarationCollector(CollectorBase, CompiscriptVisitor):
     """
     Pasada 1: declara identificadores (sin evaluar cuerpos).
     - Top-level: vars/consts/funcs/clases
@@ -47,50 +47,8 @@ class DeclarationCollector(CompiscriptVisitor):
     - Parámetros: detecta duplicados
     - Herencia: detecta ciclos
     - Foreach: declara el iterador en un scope hijo (permite shadowing)
+    Estado, scopes y claves en CollectorBase (compartidos con la versión sobre el AST).
     """
-    def __init__(self, reporter: ErrorReporter) -> None:
-        self.reporter = reporter
-        self.global_scope = GlobalScope()
-        self.scope_stack: List[Scope] = [self.global_scope]
-        self.class_scopes: Dict[str, ClassScope] = {}
-        self.function_scopes: Dict[str, FunctionScope] = {}
-        self.class_nodes: Dict[str, ParserRuleContext] = {}
-        self.class_bases: Dict[str, Optional[str]] = {}
-
-    # ---------- scope helpers ----------
-    @property
-    def current_scope(self) -> Scope:
-        return self.scope_stack[-1]
-
-    def push(self, scope: Scope) -> None:
-        self.scope_stack.append(scope)
-
-    def pop(self) -> None:
-        self.scope_stack.pop()
-
-    def _push_block_scope(self, name: str = "block") -> None:
-        """
-        Abre un scope de bloque. Si tu Scope soporta new_child(name=...),
-        lo usamos; de lo contrario, usamos FunctionScope como contenedor local.
-        """
-        child = None
-        if hasattr(self.current_scope, "new_child"):
-            try:
-                child = self.current_scope.new_child(name=name)  # type: ignore[attr-defined]
-            except Exception:
-                child = None
-        if child is None:
-            child = FunctionScope(name=name, parent=self.current_scope)
-        self.push(child)
-
-    def _pop_block_scope(self) -> None:
-        self.pop()
-
-    # ---------- declaración con error si dup en MISMO scope ----------
-    def declare_or_error(self, sym: Symbol, ctx: ParserRuleContext) -> None:
-        # Prohíbe redeclaración **en el mismo scope** (shadowing en scopes padres sí se permite)
-        if not self.current_scope.declare(sym):
-            self.reporter.error(E_DUPLICATE_ID, f"Identificador redeclarado: {sym.name}", ctx)
 
     # ---------- Entrypoint ----------
     def visitProgram(self, ctx: CompiscriptParser.ProgramContext):
@@ -252,44 +210,3 @@ class DeclarationCollector(CompiscriptVisitor):
         finally:
             self._pop_block_scope()
         return None
-
-
-
-    # ---------- Ciclos de herencia ----------
-    def _check_inheritance_cycles(self):
-        WHITE, GRAY, BLACK = 0, 1, 2
-        color: Dict[str, int] = {k: WHITE for k in self.class_bases.keys()}
-
-        def dfs(u: str):
-            color[u] = GRAY
-            v = self.class_bases.get(u)
-            if v is not None and v in self.class_bases:
-                if color.get(v, WHITE) == GRAY:
-                    self.reporter.error(E_INHERIT_CYCLE, f"Ciclo de herencia involucrando '{u}' y '{v}'", self.class_nodes[u])
-                elif color.get(v, WHITE) == WHITE:
-                    dfs(v)
-            color[u] = BLACK
-
-        for cname in list(self.class_bases.keys()):
-            if color.get(cname, WHITE) == WHITE:
-                dfs(cname)
-
-    # ---------- Keys helper ----------
-    def _fn_key(self, fn: FunctionSymbol) -> str:
-        return f"::{fn.name}"
-
-    def _method_key(self, cls: str, m: str) -> str:
-        return f"{cls}::{m}"
-
-    def _qualified_fn_key(self, name: str) -> str:
-        parts: List[str] = []
-        cls = None
-        for s in self.scope_stack:
-            if isinstance(s, ClassScope):
-                cls = s.name
-            elif isinstance(s, FunctionScope):
-                parts.append(s.name)
-        parts.append(name)
-        if cls:
-            return f"{cls}::" + "::".join(parts)
-        return "::" + "::".join(parts)
\ No newline at end of file
@@ -1,7 +1,7 @@
 # program/src/sema/errors.py
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import List, Optional, Tuple, Any
+from typing import Any, Callable, Iterable, List, Optional, Set, Tuple
 
 # Códigos sugeridos (irá creciendo con tu proyecto)
 E_DUPLICATE_ID   = "E101"
@@ -29,17 +29,38 @@ class SemanticError:
     line: int
     column: int
 
+def pos_of(ctx: Any) -> Tuple[int, int]:
+    """(línea, columna 0-based) de un ctx de ANTLR o de un nodo del AST."""
+    pos = getattr(ctx, "pos", None)
+    if isinstance(pos, tuple):
+        # nodo del AST: columna 1-based → 0-based como los tokens de ANTLR
+        return pos[0], pos[1] - 1
+    try:
+        tok = ctx.start  # ctx de ANTLR
+        return tok.line, tok.column
+    except Exception:
+        return (-1, -1)
+
+class TooManyErrors(Exception):
+    """La levanta ErrorReporter al pasar max_errors: corta la pasada en curso."""
+
 class ErrorReporter:
-    """Acumula errores sin abortar la compilación."""
-    def __init__(self) -> None:
+    """
+    Acumula errores sin abortar la compilación, salvo que se fije 'max_errors': el error
+    que lo excede no se guarda y levanta TooManyErrors ('truncated' queda en True).
+    Un error con la misma (código, línea, columna) que uno ya reportado se descarta.
+    'sink' recibe cada error en cuanto se acepta (streaming hacia el IDE).
+    """
+    def __init__(self, max_errors: Optional[int] = None,
+                 sink: Optional[Callable[[SemanticError], None]] = None) -> None:
         self.errors: List[SemanticError] = []
+        self.max_errors = max_errors
+        self.sink = sink
+        self.truncated = False
+        self._seen: Set[Tuple[str, int, int]] = set()
 
     def _pos_from_ctx(self, ctx: Any) -> Tuple[int, int]:
-        try:
-            tok = ctx.start  # ctx de ANTLR
-            return tok.line, tok.column
-        except Exception:
-            return (-1, -1)
+        return pos_of(ctx)
 
     def error(
         self,
@@ -55,7 +76,34 @@ class ErrorReporter:
             ln, col = self._pos_from_ctx(ctx)
         else:
             ln, col = -1, -1
-        self.errors.append(SemanticError(code, message, ln, col))
+        self.add(SemanticError(code, message, ln, col))
+
+    def _is_new(self, e: SemanticError) -> bool:
+        if e.line is None or e.line < 0:
+            return True  # sin posición no hay forma de saber si es el mismo
+        key = (e.code, e.line, e.column)
+        if key in self._seen:
+            return False
+        self._seen.add(key)
+        return True
+
+    def add(self, e: SemanticError) -> None:
+        if not self._is_new(e):
+            return
+        if self.max_errors is not None and len(self.errors) >= self.max_errors:
+            self.truncated = True
+            raise TooManyErrors(f"Se alcanzó el máximo de {self.max_errors} errores")
+        self.errors.append(e)
+        if self.sink is not None:
+            self.sink(e)
+
+    def extend(self, errors: Iterable[SemanticError]) -> None:
+        for e in errors:
+            self.add(e)
+
+    def insert(self, at: int, errors: Iterable[SemanticError]) -> None:
+        """Inserta en 'at' errores de otro reporter (sin tope ni sink: ver sema/parallel.py)."""
+        self.errors[at:at] = [e for e in errors if self._is_new(e)]
 
     def has_errors(self) -> bool:
         return bool(self.errors)
@@ -65,6 +113,8 @@ class ErrorReporter:
 
     def clear(self) -> None:
         self.errors.clear()
+        self._seen.clear()
+        self.truncated = False
 
     def summary(self) -> str:
         return "\n".join(f"{e.code} @ {e.line}:{e.column} - {e.message}" for e in self.errors)
@@ -0,0 +1,411 @@
+# program/src/sema/incremental.py
+# Semántica incremental sobre el AST (la usa el modo servidor con "session").
+#
+# Cada sentencia top-level es una unidad. Se guarda, por unidad, su texto en el fuente,
+# los nombres que usa y los artefactos de las pasadas: símbolo y scopes (colector), errores
+# de declaración y de tipos, y sus entradas de la tabla de resoluciones.
+# Al reanalizar, una función o clase top-level se reutiliza tal cual (sin recolectar ni
+# chequear) si su texto no cambió y no cambió la interfaz de ningún nombre que usa:
+#   - interfaz de una función: parámetros y retorno anotados;
+#   - de una clase: base y miembros (anotaciones de campos, firmas de métodos);
+#   - de una global: su anotación, o el texto de la sentencia si el tipo se infiere.
+# El cambio de interfaz se propaga por el grafo de dependencias de firmas (una función
+# depende de las clases de sus anotaciones, una clase de su base y de los tipos de sus
+# miembros, una global inferida de lo que usa su inicializador).
+# Las 'let' y sentencias sueltas se vuelven a recolectar y chequear siempre (son baratas y
+# fijan el tipo inferido de las globales); enlazado y ciclos de herencia corren completos.
+# Si hay (o había) un ciclo de herencia no se reutiliza nada: el corte depende del orden.
+# El resultado anterior se consume: sus nodos, símbolos y scopes pasan al nuevo.
+from __future__ import annotations
+from dataclasses import dataclass, field, replace
+from functools import partial
+from typing import Any, Dict, FrozenSet, Iterator, List, Optional, Set, Tuple
+
+from src.ast import nodes as A
+from .errors import ErrorReporter, SemanticError, E_INHERIT_CYCLE
+from .ast_decl_collector import ASTDeclarationCollector
+from .ast_typecheck import ASTTypeChecker
+from .resolution import Resolution, ResolutionTable
+from .scopes import GlobalScope, Scope
+from .symbols import Symbol
+from .type_linker import TypeLinker
+
+_REUSABLE = (A.FunctionDecl, A.ClassDecl)
+_KEYWORD = {A.FunctionDecl: "function", A.ClassDecl: "class"}
+
+@dataclass
+class Unit:
+    """Sentencia top-level con lo que dejaron las pasadas (ver módulo)."""
+    key: Tuple[str, str, int]           # (tipo, nombre, n-ésima aparición)
+    stmt: A.Stmt
+    text: Optional[str]                 # None = no se pudo ubicar en el fuente (no se reutiliza)
+    uses: FrozenSet[str]
+    infer_before: FrozenSet[str]        # globales inferidas que usa y que se declaran antes
+    declared: bool = False              # su símbolo quedó en el scope global
+    symbol: Optional[Symbol] = None
+    fn_scopes: Dict[str, Scope] = field(default_factory=dict)
+    class_scope: Optional[Scope] = None
+    decl_errors: List[SemanticError] = field(default_factory=list)
+    check_errors: List[SemanticError] = field(default_factory=list)
+    by_node: Dict[int, Tuple[Any, Resolution]] = field(default_factory=dict)
+    home: Optional[Scope] = None        # scope global al que apuntan las resoluciones de by_node
+    frames: Dict[int, Dict[str, None]] = field(default_factory=dict)
+
+@dataclass
+class SemaResult:
+    source: str
+    ast: A.Program
+    rep: ErrorReporter
+    decl: ASTDeclarationCollector
+    units: List[Unit]
+    ifaces: Dict[str, Tuple[Any, ...]]          # nombre global → interfaz (una entrada por declaración)
+    sig_deps: Dict[str, FrozenSet[str]]         # nombre global → nombres de los que depende su interfaz
+    reused: int = 0
+    memo_hits: int = 0
+    memo_misses: int = 0
+
+    def dependents(self, name: str) -> Set[str]:
+        """Declaraciones top-level (funciones/clases) que usan 'name'."""
+        return {u.key[1] for u in self.units if isinstance(u.stmt, _REUSABLE) and name in u.uses}
+
+class SemaSession:
+    """Último resultado de un documento: el modo servidor reanaliza contra él."""
+    def __init__(self) -> None:
+        self.result: Optional[SemaResult] = None
+        self.invalidated: Set[str] = set()
+
+    def update(self, source: str, ast: Optional[A.Program] = None) -> SemaResult:
+        old, self.result = self.result, None  # si reanalyze falla, el próximo análisis es completo
+        self.result, self.invalidated = reanalyze(old, source, ast)
+        return self.result
+
+def analyze(source: str, ast: Optional[A.Program] = None) -> SemaResult:
+    """Análisis completo que deja el estado para reanalyze."""
+    return reanalyze(None, source, ast)[0]
+
+def reanalyze(old: Optional[SemaResult], source: str,
+              ast: Optional[A.Program] = None) -> Tuple[SemaResult, Set[str]]:
+    """
+    Analiza 'source' reutilizando lo que sirva de 'old'. Devuelve (resultado, nombres de
+    funciones/clases top-level que se volvieron a chequear). Los errores y símbolos son
+    los mismos que daría el pipeline completo. 'ast' evita volver a parsear; sin él se usa
+    el parser rápido (lanza FastSyntaxError: con errores de sintaxis no hay incremental).
+    """
+    if ast is None:
+        from src.frontend.fast_parser import parse_program
+        ast = parse_program(source)
+    prev = {u.key: u for u in old.units} if old is not None else {}
+    units = _split(source, ast, prev)
+    # con un ciclo de herencia (E140) el corte, y con él los miembros heredados que ve cada
+    # clase, depende del orden de las declaraciones: no se reutiliza nada
+    had_cycle = old is not None and any(e.code == E_INHERIT_CYCLE for e in old.rep.errors)
+    if had_cycle or _has_inheritance_cycle(units):
+        prev = {}
+    ifaces, sig_deps = _interfaces(units)
+    if old is not None:
+        changed = _sig_changed(old.ifaces, ifaces, sig_deps)
+    else:
+        changed = set()
+
+    def reusable(u: Unit) -> Optional[Unit]:
+        o = prev.get(u.key)
+        if (o is None or not o.declared or u.text is None or o.text != u.text
+                or o.infer_before != u.infer_before or not changed.isdisjoint(u.uses)):
+            return None
+        return o
+
+    rep = ErrorReporter()
+    dc = ASTDeclarationCollector(rep)
+    gs = dc.global_scope
+    fn_scopes = dc.function_scopes
+    reused: Set[int] = set()
+
+    # ---- Pasada 1: unidad por unidad, en orden (mismo orden de errores y de slots) ----
+    for i, u in enumerate(units):
+        o = reusable(u) if isinstance(u.stmt, _REUSABLE) else None
+        if o is not None and gs.resolve_local(u.key[1]) is None:
+            _adopt(u, o, gs, dc)
+            reused.add(i)
+            rep.extend(u.decl_errors)
+            continue
+        name = u.key[1] if isinstance(u.stmt, _REUSABLE) else None
+        before = gs.resolve_local(name) if name else None
+        n0 = len(rep.errors)
+        dc.function_scopes = u.fn_scopes
+        dc._stmt(u.stmt)
+        dc.function_scopes = fn_scopes
+        fn_scopes.update(u.fn_scopes)
+        u.decl_errors = rep.errors[n0:]
+        if name:
+            u.symbol = gs.resolve_local(name)
+            u.declared = before is None and u.symbol is not None
+            if isinstance(u.stmt, A.ClassDecl):
+                u.class_scope = dc.class_scopes.get(name)
+    dc._check_inheritance_cycles()
+
+    # ---- Pasada 2: enlazado completo (los símbolos reutilizados se vuelven a enlazar) ----
+    TypeLinker(rep, dc).link()
+
+    # ---- Pasada 3: se chequea lo que no se reutilizó ----
+    tc = ASTTypeChecker(rep, dc)
+    table = ResolutionTable()
+    for i, u in enumerate(units):
+        if i in reused:
+            rep.extend(u.check_errors)
+        else:
+            tc.resolved = ResolutionTable()
+            n0 = len(rep.errors)
+            tc._stmt(u.stmt)
+            u.check_errors = rep.errors[n0:]
+            u.by_node, u.frames = tc.resolved.export()
+            u.home = gs
+        # las de unidades reutilizadas se traducen al nuevo scope global recién al leerlas
+        table.merge(partial(_rebind, u.by_node, u.home, gs), u.frames)
+    tc.resolved = dc.resolutions = table
+
+    # las unidades reutilizadas aportan su sentencia anterior: las resoluciones apuntan a sus nodos
+    prog = A.Program(pos=ast.pos, statements=[u.stmt for u in units])
+
+    result = SemaResult(source, prog, rep, dc, units, ifaces, sig_deps, len(reused), tc.memo_hits, tc.memo_misses)
+    invalidated = {u.key[1] for i, u in enumerate(units) if isinstance(u.stmt, _REUSABLE) and i not in reused}
+    return result, invalidated
+
+# ---------- Unidades ----------
+
+def _has_inheritance_cycle(units: List[Unit]) -> bool:
+    bases = {u.stmt.name: u.stmt.base for u in units if isinstance(u.stmt, A.ClassDecl)}
+    state: Dict[str, int] = {}  # 1 = en el camino actual, 2 = listo
+    for c in bases:
+        path: List[str] = []
+        x: Optional[str] = c
+        while x in bases and x not in state:
+            state[x] = 1
+            path.append(x)
+            x = bases[x]
+        if x in state and state[x] == 1:
+            return True
+        for y in path:
+            state[y] = 2
+    return False
+
+def _line_offsets(source: str) -> List[int]:
+    offs = [0]
+    i = source.find("\n")
+    while i >= 0:
+        offs.append(i + 1)
+        i = source.find("\n", i + 1)
+    return offs
+
+def _split(source: str, ast: A.Program, prev: Dict[Tuple[str, str, int], Unit]) -> List[Unit]:
+    lines = _line_offsets(source)
+    stmts = ast.statements
+    starts: List[Optional[int]] = []
+    for st in stmts:
+        if st.pos is None or st.pos[0] - 1 >= len(lines):
+            starts.append(None)
+        else:
+            starts.append(lines[st.pos[0] - 1] + st.pos[1] - 1)
+
+    units: List[Unit] = []
+    seen: Dict[Tuple[str, str], int] = {}
+    inferred: Set[str] = set()  # globales sin anotación declaradas hasta aquí
+    for i, st in enumerate(stmts):
+        kind = type(st).__name__
+        name = st.name if isinstance(st, (A.FunctionDecl, A.ClassDecl, A.VarDecl)) else ""
+        nth = seen.get((kind, name), 0)
+        seen[(kind, name)] = nth + 1
+
+        text = None
+        start = starts[i]
+        if start is not None:
+            end = next((s for s in starts[i + 1:] if s is not None), len(source))
+            text = source[start:end].rstrip()  # la sangría de la siguiente no cuenta
+            kw = _KEYWORD.get(type(st))
+            if kw is not None and not text.startswith(kw):
+                text = None
+        o = prev.get((kind, name, nth))
+        # mismo texto, mismos nombres: no hace falta recorrer la sentencia otra vez
+        uses = o.uses if o is not None and text is not None and o.text == text else frozenset(_names_used(st))
+        units.append(Unit((kind, name, nth), st, text, uses, frozenset(uses & inferred)))
+        inferred.update(n for n, d in _global_lets(st) if not d.type_ann)
+    return units
+
+def _children(node: Any) -> Iterator[A.Node]:
+    for v in vars(node).values():
+        if isinstance(v, A.Node):
+            yield v
+        elif isinstance(v, list):
+            for x in v:
+                if isinstance(x, A.Node):
+                    yield x
+
+def _walk(node: A.Node) -> Iterator[A.Node]:
+    stack = [node]
+    while stack:
+        n = stack.pop()
+        yield n
+        stack.extend(_children(n))
+
+def _ann_base(ann: Optional[str]) -> Optional[str]:
+    if not ann:
+        return None
+    i = ann.find("[")
+    return ann if i < 0 else ann[:i]
+
+def _names_used(st: A.Stmt) -> Set[str]:
+    """Nombres que aparecen en la sentencia: identificadores, 'new C', anotaciones y bases."""
+    out: Set[str] = set()
+    for n in _walk(st):
+        t = type(n)
+        if t is A.Identifier:
+            out.add(n.name)
+        elif t is A.NewExpr:
+            out.add(n.class_name)
+        elif t is A.VarDecl or t is A.Param:
+            b = _ann_base(n.type_ann)
+            if b:
+                out.add(b)
+        elif t is A.FunctionDecl:
+            b = _ann_base(n.return_type)
+            if b:
+                out.add(b)
+        elif t is A.ClassDecl and n.base:
+            out.add(n.base)
+    return out
+
+def _global_lets(st: A.Stmt) -> Iterator[Tuple[str, A.VarDecl]]:
+    """Las 'let' que el colector declara globales (las de bloques top-level, no foreach)."""
+    if isinstance(st, A.VarDecl):
+        yield st.name, st
+    elif isinstance(st, A.Block):
+        for s in st.statements:
+            yield from _global_lets(s)
+    elif isinstance(st, A.IfStmt):
+        for b in (st.then_block, st.else_block):
+            if b is not None:
+                yield from _global_lets(b)
+    elif isinstance(st, (A.WhileStmt, A.DoWhileStmt)):
+        if st.body is not None:
+            yield from _global_lets(st.body)
+    elif isinstance(st, A.ForStmt):
+        if st.init is not None:
+            yield from _global_lets(st.init)
+        if st.body is not None:
+            yield from _global_lets(st.body)
+    elif isinstance(st, A.TryCatchStmt):
+        for b in (st.try_block, st.catch_block):
+            if b is not None:
+                yield from _global_lets(b)
+    elif isinstance(st, A.SwitchStmt):
+        for c in st.cases:
+            for s in c.body:
+                yield from _global_lets(s)
+        for s in st.default_body or ():
+            yield from _global_lets(s)
+
+# ---------- Interfaces y grafo de firmas ----------
+
+def _fn_iface(fn: A.FunctionDecl) -> Tuple[Any, ...]:
+    return (tuple((p.name, p.type_ann) for p in fn.params), fn.return_type)
+
+def _interfaces(units: List[Unit]) -> Tuple[Dict[str, Tuple[Any, ...]], Dict[str, FrozenSet[str]]]:
+    ifaces: Dict[str, List[Any]] = {}
+    deps: Dict[str, Set[str]] = {}
+    for u in units:
+        st = u.stmt
+        if isinstance(st, A.FunctionDecl):
+            entries = [(st.name, ("function", _fn_iface(st)),
+                        {_ann_base(a) for a in (st.return_type, *(p.type_ann for p in st.params))})]
+        elif isinstance(st, A.ClassDecl):
+            members, ds = [], {st.base}
+            for m in st.members:
+                d = m.member
+                if isinstance(d, A.FunctionDecl):
+                    members.append(("method", d.name, _fn_iface(d)))
+                    ds.update(_ann_base(a) for a in (d.return_type, *(p.type_ann for p in d.params)))
+                elif isinstance(d, A.VarDecl):
+                    members.append(("field", d.name, d.type_ann, d.is_const))
+                    ds.add(_ann_base(d.type_ann))
+            entries = [(st.name, ("class", st.base, tuple(members)), ds)]
+        else:
+            # global inferida: su tipo depende del texto y de lo que usa
+            entries = [(n, ("let", d.is_const, d.type_ann, None if d.type_ann else u.text),
+                        {_ann_base(d.type_ann)} if d.type_ann else set(u.uses))
+                       for n, d in _global_lets(st)]
+        for name, iface, ds in entries:
+            ifaces.setdefault(name, []).append(iface)
+            deps.setdefault(name, set()).update(x for x in ds if x and x != name)
+    return ({n: tuple(v) for n, v in ifaces.items()},
+            {n: frozenset(v) for n, v in deps.items()})
+
+def _sig_changed(old: Dict[str, Tuple[Any, ...]], new: Dict[str, Tuple[Any, ...]],
+                 deps: Dict[str, FrozenSet[str]]) -> Set[str]:
+    """Nombres cuya interfaz cambió (o que aparecieron/desaparecieron), cerrado por el grafo."""
+    changed = {n for n in old.keys() | new.keys() if old.get(n) != new.get(n)}
+    rdeps: Dict[str, Set[str]] = {}
+    for n, ds in deps.items():
+        for d in ds:
+            rdeps.setdefault(d, set()).add(n)
+    work = list(changed)
+    while work:
+        for n in rdeps.get(work.pop(), ()):
+            if n not in changed:
+                changed.add(n)
+                work.append(n)
+    return changed
+
+# ---------- Reutilización ----------
+
+def _delta(old: A.Stmt, new: A.Stmt) -> Tuple[int, int, int]:
+    """(línea de inicio anterior, Δlínea, Δcolumna en esa línea)."""
+    return old.pos[0], new.pos[0] - old.pos[0], new.pos[1] - old.pos[1]
+
+def _shift_error(e: SemanticError, line0: int, dl: int, dc: int) -> SemanticError:
+    if not (dl or dc) or e.line is None or e.line < line0:
+        return e
+    return replace(e, line=e.line + dl, column=e.column + dc if e.line == line0 else e.column)
+
+def _shift_pos(pos: Optional[A.Pos], line0: int, dl: int, dc: int) -> Optional[A.Pos]:
+    if pos is None:
+        return None
+    return (pos[0] + dl, pos[1] + dc if pos[0] == line0 else pos[1])
+
+def _adopt(u: Unit, o: Unit, gs: GlobalScope, dc: ASTDeclarationCollector) -> None:
+    """Pasa los artefactos de 'o' (misma sentencia en el resultado anterior) a 'u'."""
+    line0, dl, dcol = _delta(o.stmt, u.stmt)
+    if dl or dcol:
+        for n in _walk(o.stmt):
+            n.pos = _shift_pos(n.pos, line0, dl, dcol)
+            if n.paren_pos is not None:
+                n.paren_pos = _shift_pos(n.paren_pos, line0, dl, dcol)
+    u.stmt, u.declared, u.symbol = o.stmt, True, o.symbol
+    u.fn_scopes, u.class_scope = o.fn_scopes, o.class_scope
+    u.decl_errors = [_shift_error(e, line0, dl, dcol) for e in o.decl_errors]
+    u.check_errors = [_shift_error(e, line0, dl, dcol) for e in o.check_errors]
+    u.by_node, u.home, u.frames = o.by_node, o.home, o.frames
+
+    gs.declare(o.symbol)
+    name = u.key[1]
+    dc.function_scopes.update(o.fn_scopes)
+    if isinstance(u.stmt, A.ClassDecl):
+        dc.class_scopes[name] = o.class_scope
+        dc.class_nodes[name] = u.stmt
+        dc.class_bases[name] = u.stmt.base
+        if o.class_scope is not None:
+            o.class_scope.parent = gs
+    else:
+        top = o.fn_scopes.get(f"::{name}")
+        if top is not None:
+            top.parent = gs
+
+def _rebind(by_node: Dict[int, Tuple[Any, Resolution]], home: Optional[Scope],
+            gs: GlobalScope) -> Dict[int, Tuple[Any, Resolution]]:
+    """Resoluciones a globales: apuntan al scope (y al símbolo/slot) del nuevo análisis."""
+    if home is gs:
+        return by_node
+    out: Dict[int, Tuple[Any, Resolution]] = {}
+    for k, (node, res) in by_node.items():
+        if res.scope is home:
+            res = Resolution(res.name, gs.resolve_local(res.name), gs, res.depth, gs.slot_of(res.name), None)
+        out[k] = (node, res)
+    return out
@@ -0,0 +1,151 @@
+# program/src/sema/parallel.py
+# Chequeo de cuerpos de funciones/clases top-level en un pool de procesos (ASTTypeChecker).
+#
+# 1) El padre recorre el programa en orden y difiere cada FunctionDecl/ClassDecl top-level:
+#    anota cuántos errores había en ese punto y los tipos de las globales (las 'let' sin
+#    anotación se infieren en orden, así que un cuerpo ve las globales de antes de él).
+# 2) Los workers nacen con fork: heredan AST, scopes y símbolos sin serializar, y los id()
+#    de esos objetos son los mismos que en el padre. Cada trabajo usa su propio ErrorReporter.
+#    Al devolver, los scopes y símbolos que ya existían en el padre viajan como su id()
+#    (persistent_id de pickle); se serializa lo que creó el worker (locales, bloques) y los
+#    nodos anotados en la tabla lateral, que en el padre quedan como copias (misma clave).
+# 3) El padre inserta los errores de cada cuerpo donde estaba el cuerpo (mismo orden que la
+#    pasada secuencial), une las capturas y las resoluciones de la tabla lateral.
+# Sin fork (Windows), con pocos cuerpos o con max_errors/sink se chequea en secuencia.
+from __future__ import annotations
+import gc, io, pickle
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+from src.ast import nodes as A
+from .errors import ErrorReporter, SemanticError
+from .resolution import ResolutionTable
+from .symbols import VariableSymbol, ConstSymbol, FunctionSymbol
+
+if TYPE_CHECKING:
+    from .ast_typecheck import ASTTypeChecker
+
+# por debajo de esto el costo de levantar el pool no se recupera
+MIN_PARALLEL_BODIES = 64
+
+_BODIES = (A.FunctionDecl, A.ClassDecl)
+
+# estado que heredan los workers (se fija antes de crear el pool)
+_STATE: Optional[Tuple[Any, ...]] = None
+
+def _fork_context():
+    try:
+        return mp.get_context("fork")
+    except ValueError:
+        return None
+
+def _shared_objects(decl) -> Dict[int, Any]:
+    """id → objeto para los scopes y símbolos que el worker hereda del padre."""
+    shared: Dict[int, Any] = {}
+    for sc in [decl.global_scope, *decl.class_scopes.values(), *decl.function_scopes.values()]:
+        shared[id(sc)] = sc
+        for _, sym in sc.items():
+            shared[id(sym)] = sym
+    return shared
+
+# Objetos heredados: el worker escribe solo su id() y el padre lo traduce con _SHARED.
+# reducer_override (no persistent_id) para no pagar una llamada por cada str/int/tupla.
+_SHARED: Dict[int, Any] = {}
+
+def _shared_ref(k: int) -> Any:
+    return _SHARED[k]
+
+class _SharedPickler(pickle.Pickler):
+    def __init__(self, file, shared: Dict[int, Any]) -> None:
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.shared = shared
+
+    def reducer_override(self, obj: Any) -> Any:
+        k = id(obj)
+        if k in self.shared:
+            return _shared_ref, (k,)
+        return NotImplemented
+
+def check_program(checker: "ASTTypeChecker", prog: A.Program, workers: int) -> None:
+    """Igual que checker.visit_program(prog), con los cuerpos top-level en 'workers' procesos."""
+    global _STATE
+    n_bodies = sum(1 for st in prog.statements if isinstance(st, _BODIES))
+    ctx = _fork_context()
+    rep = checker.rep
+    # con tope o sink los errores tienen que salir en orden y en el momento: en secuencia
+    streaming = rep.max_errors is not None or rep.sink is not None
+    if workers <= 1 or n_bodies < MIN_PARALLEL_BODIES or ctx is None or streaming:
+        for st in prog.statements:
+            checker._stmt(st)
+        return
+
+    decl = checker.decl
+    gvars = [s for _, s in decl.global_scope.items() if isinstance(s, (VariableSymbol, ConstSymbol))]
+    jobs: List[Tuple[int, int, Tuple[Any, ...]]] = []   # (índice de sentencia, nº de errores, globales)
+    for i, st in enumerate(prog.statements):
+        if isinstance(st, _BODIES):
+            jobs.append((i, len(checker.rep.errors), tuple(s.resolved_type for s in gvars)))
+        else:
+            checker._stmt(st)
+
+    shared = _shared_objects(decl)
+    fsyms = [s for s in shared.values() if isinstance(s, FunctionSymbol)]
+    _STATE = (checker, prog, jobs, gvars, fsyms, shared)
+    try:
+        # varios trozos por worker: reparte mejor cuerpos de tamaño desigual
+        size = max(1, len(jobs) // (workers * 4))
+        chunks = [range(k, min(k + size, len(jobs))) for k in range(0, len(jobs), size)]
+        # gc.freeze: el GC de los workers no recorre (ni copia, por copy-on-write) el heap heredado
+        gc.freeze()
+        with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as pool:
+            blobs = list(pool.map(_check_chunk, chunks))
+    finally:
+        gc.unfreeze()
+        _STATE = None
+
+    per_job: List[List[SemanticError]] = []
+    for blob, by_node in blobs:
+        job_errors, captured, frames, hits, misses = _load(blob, shared)
+        per_job.extend(job_errors)
+        for fsym, names in captured:
+            fsym.captured |= names
+        checker.resolved.merge(partial(_load, by_node, shared), frames)
+        checker.memo_hits += hits
+        checker.memo_misses += misses
+    # de atrás hacia adelante para que los índices anotados sigan valiendo
+    for (_, at, _), errs in reversed(list(zip(jobs, per_job))):
+        rep.insert(at, errs)
+
+def _check_chunk(idxs: range) -> Tuple[bytes, bytes]:
+    checker, prog, jobs, gvars, fsyms, shared = _STATE
+    table = ResolutionTable()
+    checker.resolved = checker.decl.resolutions = table
+    hits0, misses0 = checker.memo_hits, checker.memo_misses
+    out: List[List[SemanticError]] = []
+    for j in idxs:
+        i, _, snapshot = jobs[j]
+        for s, t in zip(gvars, snapshot):
+            s.resolved_type = t
+        rep = ErrorReporter()
+        checker.rep = checker._tl.reporter = rep
+        checker._stmt(prog.statements[i])
+        out.append(rep.errors)
+    captured = [(s, s.captured) for s in fsyms if s.captured]
+    by_node, frames = table.export()
+    return (_dump((out, captured, frames, checker.memo_hits - hits0, checker.memo_misses - misses0), shared),
+            _dump(by_node, shared))
+
+def _dump(obj: Any, shared: Dict[int, Any]) -> bytes:
+    buf = io.BytesIO()
+    _SharedPickler(buf, shared).dump(obj)
+    return buf.getvalue()
+
+def _load(blob: bytes, shared: Dict[int, Any]) -> Any:
+    global _SHARED
+    _SHARED = shared
+    try:
+        return pickle.loads(blob)
+    finally:
+        _SHARED = {}
@@ -0,0 +1,91 @@
+# program/src/sema/resolution.py
+# Tabla lateral de resoluciones. La pasada de tipos guarda, por cada aparición de un
+# identificador (usos y declaraciones locales), el símbolo, el scope que lo declara y su
+# dirección (depth, slot). --symbols, el análisis de capturas y los frames del IR la leen
+# en vez de volver a subir por la cadena de scopes.
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from .scopes import Scope, FunctionScope
+from .symbols import Symbol, VariableSymbol, ConstSymbol
+
+@dataclass(frozen=True)
+class Resolution:
+    name: str
+    symbol: Symbol
+    scope: Scope                       # scope que declara el símbolo
+    depth: int                         # saltos desde el scope del uso hasta 'scope'
+    slot: int                          # índice de declaración dentro de 'scope'
+    function: Optional[FunctionScope]  # función que contiene a 'scope' (None = nivel global)
+
+def enclosing_function(scope: Optional[Scope]) -> Optional[FunctionScope]:
+    while scope is not None and not isinstance(scope, FunctionScope):
+        scope = scope.parent
+    return scope
+
+class ResolutionTable:
+    """
+    Clave: id() del nodo (nodo del AST o ctx de ANTLR). Se guarda también el nodo para que
+    el id no se recicle mientras viva la tabla.
+    """
+    def __init__(self) -> None:
+        self._by_node: Dict[int, Tuple[Any, Resolution]] = {}
+        # locales por función (id del FunctionScope; 0 = bloques de nivel global), en orden
+        self._frames: Dict[int, Dict[str, None]] = {}
+        # anotaciones de otra tabla que se decodifican recién al leer (ver merge)
+        self._pending: List[Callable[[], Dict[int, Tuple[Any, Resolution]]]] = []
+
+    def resolve(self, node: Any, scope: Scope, name: str) -> Optional[Resolution]:
+        """Resuelve 'name' desde 'scope' y anota el resultado para 'node'."""
+        sym, decl_scope, depth = scope.resolve_address(name)
+        if sym is None:
+            return None
+        return self._add(node, name, sym, decl_scope, depth)
+
+    def declare(self, node: Any, scope: Scope, name: str) -> Optional[Resolution]:
+        """Anota la declaración local de 'name' en 'scope' (depth 0)."""
+        sym = scope.resolve_local(name)
+        if sym is None:
+            return None
+        return self._add(node, name, sym, scope, 0)
+
+    def _add(self, node: Any, name: str, sym: Symbol, decl_scope: Scope, depth: int) -> Resolution:
+        fn = enclosing_function(decl_scope)
+        res = Resolution(name, sym, decl_scope, depth, decl_scope.slot_of(name), fn)
+        self._by_node[id(node)] = (node, res)
+        if decl_scope.kind in ("function", "block") and isinstance(sym, (VariableSymbol, ConstSymbol)):
+            self._frames.setdefault(id(fn) if fn is not None else 0, {})[name] = None
+        return res
+
+    def _by_node_all(self) -> Dict[int, Tuple[Any, Resolution]]:
+        while self._pending:
+            self._by_node.update(self._pending.pop(0)())
+        return self._by_node
+
+    def get(self, node: Any) -> Optional[Resolution]:
+        hit = self._by_node_all().get(id(node))
+        return hit[1] if hit is not None else None
+
+    def frame_locals(self, fn_scope: Optional[FunctionScope]) -> List[str]:
+        """Locales (sin params) de la función, en orden de aparición; None = nivel global."""
+        return list(self._frames.get(id(fn_scope) if fn_scope is not None else 0, ()))
+
+    def export(self) -> Tuple[Dict[int, Tuple[Any, Resolution]], Dict[int, Dict[str, None]]]:
+        return self._by_node, self._frames
+
+    def merge(self, by_node: Callable[[], Dict[int, Tuple[Any, Resolution]]],
+              frames: Dict[int, Dict[str, None]]) -> None:
+        """
+        Agrega lo que anotó otra tabla (un worker de src/sema/parallel.py). 'by_node' se llama
+        recién cuando alguien lee las anotaciones: decodificarlas cuesta más que el chequeo.
+        """
+        self._pending.append(by_node)
+        for k, names in frames.items():
+            self._frames.setdefault(k, {}).update(names)
+
+    def items(self) -> Iterator[Tuple[Any, Resolution]]:
+        return iter(self._by_node_all().values())
+
+    def __len__(self) -> int:
+        return len(self._by_node_all())
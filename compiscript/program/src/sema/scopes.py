@@ -4,25 +4,31 @@ from dataclasses import dataclass, field
 from typing import Dict, Optional, Iterable, Tuple
 from .symbols import Symbol
 
-@dataclass
+@dataclass(slots=True)
 class Scope:
     """
     Scope genérico:
     - kind: 'global' | 'class' | 'function' | 'block'
     - parent: scope contenedor (cadena léxica)
     - _symbols: tabla local de símbolos
+    - _slots: nombre → índice de declaración en este scope (no cambia una vez asignado)
     """
     name: str
     kind: str
     parent: Optional["Scope"] = None
     _symbols: Dict[str, Symbol] = field(default_factory=dict)
+    _slots: Dict[str, int] = field(default_factory=dict)
 
     # Declaración local: False si ya existía en ESTE scope (prohibir redeclaración local)
     def declare(self, sym: Symbol) -> bool:
         if sym.name in self._symbols:
             return False
+        self._slots[sym.name] = len(self._symbols)
         self._symbols[sym.name] = sym
         return True
+
+    def slot_of(self, name: str) -> Optional[int]:
+        return self._slots.get(name)
     
     # alias para legibilidad
     def lookup_current(self, name: str) -> Optional[Symbol]:
@@ -50,6 +56,18 @@ class Scope:
             s = s.parent
         return None, None
 
+    def resolve_address(self, name: str):
+        """(símbolo, scope que lo declara, depth = saltos hasta ese scope) o (None, None, -1)."""
+        s: Optional[Scope] = self
+        depth = 0
+        while s is not None:
+            hit = s._symbols.get(name)
+            if hit is not None:
+                return hit, s, depth
+            s = s.parent
+            depth += 1
+        return None, None, -1
+
     # Utilidades
     def __contains__(self, name: str) -> bool:
         return name in self._symbols
@@ -62,21 +80,29 @@ class Scope:
 
 
 class GlobalScope(Scope):
+    __slots__ = ()
+
     def __init__(self) -> None:
         super().__init__(name="::global::", kind="global", parent=None)
 
 
 class ClassScope(Scope):
+    __slots__ = ()
+
     def __init__(self, name: str, parent: Scope) -> None:
         super().__init__(name=name, kind="class", parent=parent)
 
 
 class FunctionScope(Scope):
+    __slots__ = ()
+
     def __init__(self, name: str, parent: Scope) -> None:
         super().__init__(name=name, kind="function", parent=parent)
 
 
 class BlockScope(Scope):
+    __slots__ = ()
+
     def __init__(self, name: str, parent: Scope) -> None:
         super().__init__(name=name, kind="block", parent=parent)
 
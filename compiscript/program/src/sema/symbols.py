@@ -1,14 +1,15 @@
 # program/src/sema/symbols.py
 from __future__ import annotations
 from dataclasses import dataclass, field
-from typing import List, Optional, TYPE_CHECKING
+from typing import AbstractSet, List, Optional, Set, TYPE_CHECKING
 
 # Para anotar sin crear dependencias en tiempo de ejecución
 if TYPE_CHECKING:
     from .types import Type, ClassType
 
+# slots=True: sin __dict__ por instancia (programas grandes tienen decenas de miles de símbolos)
 
-@dataclass
+@dataclass(slots=True)
 class Symbol:
     name: str
     # Clase base genérica; las subclases fijan kind por defecto.
@@ -17,7 +18,7 @@ class Symbol:
     type_ann: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class VariableSymbol(Symbol):
     kind: str = field(default="var", init=False)
     mutable: bool = True
@@ -25,27 +26,27 @@ class VariableSymbol(Symbol):
     resolved_type: Optional["Type"] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class ConstSymbol(Symbol):
     kind: str = field(default="const", init=False)
     mutable: bool = False
     resolved_type: Optional["Type"] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class ParamSymbol(Symbol):
     kind: str = field(default="param", init=False)
     resolved_type: Optional["Type"] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class FieldSymbol(Symbol):
     kind: str = field(default="field", init=False)
     resolved_type: Optional["Type"] = None
     mutable: bool = True
 
 
-@dataclass
+@dataclass(slots=True)
 class FunctionSymbol(Symbol):
     kind: str = field(default="func", init=False)
     params: List[ParamSymbol] = field(default_factory=list)
@@ -54,8 +55,23 @@ class FunctionSymbol(Symbol):
     is_constructor: bool = False
     # Retorno resuelto (TypeLinker lo llena)
     resolved_return: Optional["Type"] = None
-    # ⬇️ NUEVO: variables/params capturados desde funciones externas
-    captured: set[str] = field(default_factory=set)
+    # variables/params capturados desde funciones externas; el set se crea con la primera
+    # captura (la mayoría de las funciones no captura nada). Se lee como frozenset: las
+    # escrituras pasan por capture() o por el setter
+    _captured: Optional[Set[str]] = field(default=None, init=False, repr=False, compare=False)
+
+    @property
+    def captured(self) -> AbstractSet[str]:
+        return frozenset(self._captured or ())
+
+    @captured.setter
+    def captured(self, names: AbstractSet[str]) -> None:
+        self._captured = set(names) if names else None
+
+    def capture(self, name: str) -> None:
+        if self._captured is None:
+            self._captured = set()
+        self._captured.add(name)
 
     def signature(self) -> str:
         ps = ", ".join(p.type_ann if p.type_ann else "any" for p in self.params)
@@ -63,7 +79,7 @@ class FunctionSymbol(Symbol):
         return f"({ps}) -> {ret}"
 
 
-@dataclass
+@dataclass(slots=True)
 class ClassSymbol(Symbol):
     kind: str = field(default="class", init=False)
     base_name: Optional[str] = None  # Nombre de la clase base, si existe
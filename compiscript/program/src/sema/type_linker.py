@@ -1,26 +1,36 @@
 # program/src/sema/type_linker.py
 from __future__ import annotations
-from typing import Optional
+from typing import TYPE_CHECKING, Dict, Optional, Tuple, Union
 
 from .errors import ErrorReporter, E_UNKNOWN_TYPE
 from .symbols import (
     VariableSymbol, ConstSymbol, ParamSymbol, FieldSymbol, FunctionSymbol, ClassSymbol
 )
 from .scopes import Scope
+from .class_layout import ClassLayoutIndex
 from . import symbols as symmod 
 from .types import (
     BOOLEAN, INTEGER, FLOAT, STRING, VOID,
     ClassType, ArrayType, array_of, Type
 )
-from .decl_collector import DeclarationCollector
+
+_PRIMITIVES: Dict[str, Type] = {
+    "integer": INTEGER, "string": STRING, "boolean": BOOLEAN, "float": FLOAT, "void": VOID,
+}
+
+if TYPE_CHECKING:
+    # solo para anotar: importar decl_collector carga ANTLR
+    from .decl_collector import DeclarationCollector
+    from .ast_decl_collector import ASTDeclarationCollector
 
 
 class TypeLinker:
 
-    def __init__(self, reporter: ErrorReporter, decl: DeclarationCollector) -> None:
+    def __init__(self, reporter: ErrorReporter, decl: Union[DeclarationCollector, ASTDeclarationCollector]) -> None:
         self.reporter = reporter
         self.decl = decl
         self.global_scope: Scope = decl.global_scope
+        self._cache = decl.type_cache
 
     def link(self) -> None:
         # Top-level
@@ -62,6 +72,9 @@ class TypeLinker:
                 if isinstance(ps, ParamSymbol) and ps.type_ann:
                     ps.resolved_type = self._parse_type_str(ps.type_ann)
 
+        # miembros aplanados por clase para la pasada de tipos
+        self.decl.class_layouts = ClassLayoutIndex(self.decl)
+
     # ------------------ Helpers ------------------
     def _resolve_return(self, ann: Optional[str]) -> Type:
         # Sin anotación → void
@@ -70,40 +83,31 @@ class TypeLinker:
         return self._parse_type_str(ann)
 
     def _parse_type_str(self, s: str) -> Type:
-        base = s
-        rank = 0
-        # contar sufijos []
-        while base.endswith("[]"):
-            base = base[:-2]
-            rank += 1
-
-        base_l = base  # compiscript es case-sensitive por default; no forzamos lower
-        prim = self._map_primitive(base_l)
-        if prim is not None:
-            t: Type = prim
-        else:
-            # Debe ser una clase declarada
-            csym = self.global_scope.resolve(base_l)
-            if not isinstance(csym, ClassSymbol):
-                self.reporter.error(E_UNKNOWN_TYPE, f"Tipo desconocido: {base_l}")
-                # Continuamos para no frenar toda la pasada
-                t = ClassType(base_l)
-            else:
-                t = ClassType(base_l)
+        # memo por compilación (decl.type_cache): "Perro[][]" se resuelve una sola vez
+        hit = self._cache.get(s)
+        if hit is None:
+            hit = self._cache[s] = self._resolve_type_str(s)
+        t, unknown = hit
+        if unknown is not None:
+            # cada mención de un tipo desconocido se reporta, igual que sin memo
+            self.reporter.error(E_UNKNOWN_TYPE, f"Tipo desconocido: {unknown}")
+        return t
 
+    def _resolve_type_str(self, s: str) -> Tuple[Type, Optional[str]]:
+        """(tipo, nombre base si es una clase no declarada)."""
+        # sufijos []: la anotación viene sin espacios ("integer[][]")
+        i = s.find("[")
+        base, rank = (s, 0) if i < 0 else (s[:i], (len(s) - i) // 2)
+        unknown = None
+        t: Optional[Type] = _PRIMITIVES.get(base)  # compiscript es case-sensitive
+        if t is None:
+            # Debe ser una clase declarada; si no, seguimos para no frenar toda la pasada
+            if not isinstance(self.global_scope.resolve(base), ClassSymbol):
+                unknown = base
+            t = ClassType(base)
         if rank > 0:
             t = array_of(t, rank)
-        return t
+        return t, unknown
 
     def _map_primitive(self, name: str) -> Optional[Type]:
-        if name == "integer":
-            return INTEGER
-        if name == "string":
-            return STRING
-        if name == "boolean":
-            return BOOLEAN
-        if name == "float":
-            return FLOAT
-        if name == "void":
-            return VOID
-        return None
+        return _PRIMITIVES.get(name)
@@ -1,134 +1,37 @@
 # program/src/sema/typecheck_visitor.py
 from __future__ import annotations
-from typing import List, Optional, Tuple
+from typing import Optional
 from CompiscriptParser import CompiscriptParser as P
 from antlr4 import ParserRuleContext, TerminalNode
 from CompiscriptParser import CompiscriptParser
 from CompiscriptVisitor import CompiscriptVisitor
 
 from .errors import (
-    ErrorReporter,
     E_UNDECLARED, E_ASSIGN_INCOMPAT, E_OP_TYPES, E_CALL_ARITY, E_INDEX_INVALID,
     E_MEMBER_NOT_FOUND, E_DUPLICATE_ID, E_THIS_CONTEXT, E_BAD_BREAK_CONTINUE, E_COND_NOT_BOOL,
     E_RETURN_OUTSIDE, E_MISSING_RETURN, E_ASSIGN_TO_CONST, E_DEAD_CODE,
 )
-from .scopes import Scope, ScopeStack, ClassScope, FunctionScope
+from .scopes import ClassScope, FunctionScope
 from .symbols import (
-    Symbol, VariableSymbol, ConstSymbol, ParamSymbol, FieldSymbol,
+    VariableSymbol, ConstSymbol, ParamSymbol, FieldSymbol,
     FunctionSymbol, ClassSymbol
 )
 from .types import (
     Type, BOOLEAN, INTEGER, FLOAT, STRING, VOID, NULL,
-    ArrayType, ClassType, function_type, call_result,
+    ArrayType, ClassType, function_type,
     is_boolean, is_assignable, array_of, index_result,
-    result_add, result_sub, result_mul, result_div, result_mod,
-    result_logical_and, result_logical_or, result_logical_not,
-    result_relational, result_equality, is_numeric
+    binary_result, unary_result, is_numeric
 )
-from .type_linker import TypeLinker
-from .decl_collector import DeclarationCollector
+from .checker_base import CheckerBase
 
 
-class TypeCheckVisitor(CompiscriptVisitor):
-    def __init__(self, reporter: ErrorReporter, decl: DeclarationCollector) -> None:
-        self.rep = reporter
-        self.decl = decl
-        self.scopes = ScopeStack(decl.global_scope)
-        self.current_function: Optional[FunctionSymbol] = None
-        self.current_class: Optional[ClassSymbol] = None
-        self.loop_depth: int = 0
-        self._tl = TypeLinker(self.rep, decl)
-
-    # ===== Utilidades =====
-
-    @property
-    def scope(self) -> Scope:
-        return self.scopes.current
-
-    def _declare_local_or_error(self, ctx: ParserRuleContext, sym: Symbol) -> None:
-        """
-        Declara en el scope actual (sólo si NO es global/clase).
-        Si el identificador ya existe en el scope ACTUAL, reporta E_DUPLICATE_ID.
-        (Permite shadowing respecto a scopes exteriores.)
-        """
-        if self.scope.kind in ("global", "class"):
-            return
-        if not self.scope.declare(sym):
-            self.rep.error(E_DUPLICATE_ID, f"Identificador redeclarado: {sym.name}", ctx)
-
-    def _resolve_var(self, ctx: ParserRuleContext, name: str) -> Optional[Symbol]:
-        sym = self.scope.resolve(name)
-        if sym is None:
-            self.rep.error(E_UNDECLARED, f"Identificador no declarado: {name}", ctx)
-        return sym
-
-    def _type_of_symbol(self, sym: Symbol) -> Optional[Type]:
-        if isinstance(sym, (VariableSymbol, ConstSymbol, ParamSymbol, FieldSymbol)):
-            return getattr(sym, "resolved_type", None)
-        if isinstance(sym, FunctionSymbol):
-            return None
-        if isinstance(sym, ClassSymbol):
-            return ClassType(sym.name)
-        return None
+class TypeCheckVisitor(CheckerBase, CompiscriptVisitor):
+    """Pasada 3 sobre el parse tree. Estado y helpers de scopes/miembros en CheckerBase."""
 
     def _require_boolean(self, t: Type, ctx: ParserRuleContext):
         if not is_boolean(t):
             self.rep.error(E_COND_NOT_BOOL, f"Se requiere boolean, recibido {t}", ctx)
     
-    def _current_function_scope(self) -> Optional[FunctionScope]:
-        return self.scopes.current_function_scope()
-    
-    def _fn_key_for_current_context(self, fname: str, is_method: bool) -> str:
-        path = self.scopes.function_path()
-        parts = list(path) + [fname]
-        if self.current_class is not None:
-            if not path and is_method:
-                return f"{self.current_class.name}::{fname}"
-            return f"{self.current_class.name}::" + "::".join(parts)
-        return "::" + "::".join(parts)
-
-    def _maybe_capture(self, name: str, decl_scope: Optional[Scope]) -> None:
-        if self.current_function is None or decl_scope is None:
-            return
-        if not isinstance(decl_scope, FunctionScope):
-            return
-        cur_fn_scope = self._current_function_scope()
-        if cur_fn_scope is None:
-            return
-        if decl_scope is cur_fn_scope:
-            return
-        self.current_function.captured.add(name)
-
-    def _member_lookup(self, ctype: ClassType, member: str) -> Optional[Symbol]:
-        cname = ctype.name
-        while True:
-            cscope: ClassScope = self.decl.class_scopes.get(cname)
-            if cscope:
-                sym = cscope.resolve(member)
-                if sym:
-                    return sym
-            cls_sym = self.decl.global_scope.resolve(cname)
-            if not isinstance(cls_sym, ClassSymbol) or not cls_sym.base_name:
-                break
-            cname = cls_sym.base_name
-        return None
-
-    def _qualified_key_from_decl_scope(self, decl_scope: Scope, fname: str) -> str:
-        parts = []
-        cls = None
-        s = decl_scope
-        while s is not None:
-            if isinstance(s, FunctionScope):
-                parts.append(s.name)
-            elif isinstance(s, ClassScope):
-                cls = s.name
-            s = s.parent
-        parts = list(reversed(parts))
-        parts.append(fname)
-        if cls:
-            return f"{cls}::" + "::".join(parts)
-        return "::" + "::".join(parts)
-
     def _visit_block_in_current_scope(self, ctx: CompiscriptParser.BlockContext):
         must_return = False
         for st in ctx.statement():
@@ -300,7 +203,7 @@ class TypeCheckVisitor(CompiscriptVisitor):
             val_t = self.visit(ctx.expression())
             if expected == VOID:
                 self.rep.error(E_OP_TYPES, "La función es void y no debe retornar valor", ctx)
-            elif val_t is not None and not is_assignable(val_t, expected):
+            elif val_t is not None and not is_assignable(val_t, expected, self.hierarchy):
                 self.rep.error(E_ASSIGN_INCOMPAT, f"Tipo de retorno {val_t} no asignable a {expected}", ctx.expression())
         else:
             if expected != VOID:
@@ -377,7 +280,7 @@ class TypeCheckVisitor(CompiscriptVisitor):
                 if tann:
                     dst = self._tl._parse_type_str(tann)
                     sym.resolved_type = dst
-                    if val_t is not None and not is_assignable(val_t, dst):
+                    if val_t is not None and not is_assignable(val_t, dst, self.hierarchy):
                         self.rep.error(E_ASSIGN_INCOMPAT, f"No se puede asignar {val_t} a {dst}", ctx.initializer().expression())
                 else:
                     sym.resolved_type = val_t
@@ -404,7 +307,7 @@ class TypeCheckVisitor(CompiscriptVisitor):
             if tann:
                 dst = self._tl._parse_type_str(tann)
                 sym.resolved_type = dst
-                if val_t is not None and not is_assignable(val_t, dst):
+                if val_t is not None and not is_assignable(val_t, dst, self.hierarchy):
                     self.rep.error(E_ASSIGN_INCOMPAT, f"No se puede asignar {val_t} a {dst}", ctx.expression())
             else:
                 sym.resolved_type = val_t
@@ -472,7 +375,7 @@ class TypeCheckVisitor(CompiscriptVisitor):
                 self.rep.error(E_ASSIGN_TO_CONST, f"No se puede reasignar const '{name}'", ctx)
             dst_t = self._type_of_symbol(sym) if sym else None
             val_t = self.visit(ctx.expression(0))
-            if dst_t and val_t and not is_assignable(val_t, dst_t):
+            if dst_t and val_t and not is_assignable(val_t, dst_t, self.hierarchy):
                 self.rep.error(E_ASSIGN_INCOMPAT, f"No se puede asignar {val_t} a {dst_t}", ctx.expression(0))
             return False
 
@@ -493,12 +396,12 @@ class TypeCheckVisitor(CompiscriptVisitor):
 
         dst_t = getattr(mem, "resolved_type", None)
         val_t = self.visit(ctx.expression(1))
-        if dst_t and val_t and not is_assignable(val_t, dst_t):
+        if dst_t and val_t and not is_assignable(val_t, dst_t, self.hierarchy):
             self.rep.error(E_ASSIGN_INCOMPAT, f"No se puede asignar {val_t} a {dst_t}", ctx.expression(1))
         return False
 
     # ---------- Expresiones (núcleo) ----------
-    def _eval_chain(self, ctx: ParserRuleContext, first_child, op_set: set, op_apply):
+    def _eval_chain(self, ctx: ParserRuleContext, first_child, op_set: set):
         children = list(ctx.getChildren())
         if not children:
             return None
@@ -509,48 +412,44 @@ class TypeCheckVisitor(CompiscriptVisitor):
             if isinstance(node, TerminalNode) and node.getText() in op_set:
                 op = node.getText()
                 rhs = self.visit(children[i+1])
-                try:
-                    cur = op_apply(op, cur, rhs, children[i+1])
-                except Exception:
+                res = binary_result(op, cur, rhs)
+                if res is None:
                     self.rep.error(E_OP_TYPES, f"Tipos inválidos para operador {op}", children[i+1])
+                else:
+                    cur = res
                 i += 2
             else:
                 i += 1
         return cur
 
     def visitLogicalOrExpr(self, ctx: CompiscriptParser.LogicalOrExprContext):
-        return self._eval_chain(ctx, None, {"||"},
-                                lambda op, a, b, nctx: result_logical_or(a, b))
+        return self._eval_chain(ctx, None, {"||"})
 
     def visitLogicalAndExpr(self, ctx: CompiscriptParser.LogicalAndExprContext):
-        return self._eval_chain(ctx, None, {"&&"},
-                                lambda op, a, b, nctx: result_logical_and(a, b))
+        return self._eval_chain(ctx, None, {"&&"})
 
     def visitEqualityExpr(self, ctx: CompiscriptParser.EqualityExprContext):
-        return self._eval_chain(ctx, None, {"==", "!="},
-                                lambda op, a, b, nctx: result_equality(a, b))
+        return self._eval_chain(ctx, None, {"==", "!="})
 
     def visitRelationalExpr(self, ctx: CompiscriptParser.RelationalExprContext):
-        return self._eval_chain(ctx, None, {"<", "<=", ">", ">="},
-                                lambda op, a, b, nctx: result_relational(a, b))
+        return self._eval_chain(ctx, None, {"<", "<=", ">", ">="})
 
     def visitAdditiveExpr(self, ctx: CompiscriptParser.AdditiveExprContext):
-        return self._eval_chain(ctx, None, {"+", "-"},
-                                lambda op, a, b, nctx: result_add(a, b) if op == "+" else result_sub(a, b))
+        return self._eval_chain(ctx, None, {"+", "-"})
 
     def visitMultiplicativeExpr(self, ctx: CompiscriptParser.MultiplicativeExprContext):
-        return self._eval_chain(ctx, None, {"*", "/", "%"},
-                                lambda op, a, b, nctx:
-                                    result_mul(a, b) if op == "*" else (result_div(a, b) if op == "/" else result_mod(a, b)))
+        return self._eval_chain(ctx, None, {"*", "/", "%"})
 
     def visitUnaryExpr(self, ctx: CompiscriptParser.UnaryExprContext):
         if ctx.getChildCount() == 2:
             op = ctx.getChild(0).getText()
             t = self.visit(ctx.getChild(1))
             if op == "!":
-                return result_logical_not(t)
+                if unary_result("!", t) is None:
+                    self.rep.error(E_OP_TYPES, f"Operador '!' requiere boolean, recibido {t}", ctx)
+                return BOOLEAN
             if op == "-":
-                if not is_numeric(t):
+                if unary_result("-", t) is None:
                     self.rep.error(E_OP_TYPES, f"Operador '-' requiere numérico, recibido {t}", ctx)
                 return t
         return self.visit(ctx.getChild(0))
@@ -602,13 +501,14 @@ class TypeCheckVisitor(CompiscriptVisitor):
         # a) Identificador
         if isinstance(atom, P.IdentifierExprContext):
             name = atom.Identifier().getText()
-            sym, decl_scope = self.scope.resolve_with_scope(name)
-            if sym is None:
+            res = self._resolve_ref(atom, name)
+            if res is None:
                 self.rep.error(E_UNDECLARED, f"Identificador no declarado: {name}", atom)
                 base_t = None
             else:
+                sym = res.symbol
                 if isinstance(sym, (VariableSymbol, ConstSymbol, ParamSymbol)):
-                    self._maybe_capture(name, decl_scope)
+                    self._maybe_capture(res)
                 if isinstance(sym, (VariableSymbol, ConstSymbol, ParamSymbol, FieldSymbol)):
                     base_t = self._type_of_symbol(sym)
                 elif isinstance(sym, FunctionSymbol):
@@ -633,10 +533,9 @@ class TypeCheckVisitor(CompiscriptVisitor):
 
             ctor = self._member_lookup(ClassType(cname), "constructor")
             if isinstance(ctor, FunctionSymbol):
-                fscope = self.decl.function_scopes.get(f"{cname}::constructor")
-                exp = [getattr(fscope.resolve(p.name), "resolved_type", None) for p in ctor.params] if fscope else [getattr(p, "resolved_type", None) for p in ctor.params]
+                exp = self._fn_signature(ctor, f"{cname}::constructor").params
                 try:
-                    _ = call_result(function_type(exp, VOID), args)
+                    _ = self._call_type(function_type(exp, VOID), args)
                 except Exception as ex:
                     msg = str(ex)
                     code = E_CALL_ARITY if "Aridad" in msg else E_OP_TYPES
@@ -662,22 +561,13 @@ class TypeCheckVisitor(CompiscriptVisitor):
             if isinstance(s, P.CallExprContext):
                 if isinstance(atom, P.IdentifierExprContext) and base_t is None:
                     fname = atom.Identifier().getText()
-                    fsym, decl_scope = self.scope.resolve_with_scope(fname)
+                    res = self.resolved.get(atom)  # ya resuelto arriba
+                    fsym = res.symbol if res is not None else None
                     if not isinstance(fsym, FunctionSymbol):
                         self.rep.error(E_UNDECLARED, f"Llamada a '{fname}' que no es función", s)
                         return None
-                    key = self._qualified_key_from_decl_scope(decl_scope, fname) if decl_scope else f"::{fname}"
-                    fscope = self.decl.function_scopes.get(key)
-                    params = []
-                    if fscope:
-                        for p in fsym.params:
-                            ps = fscope.resolve(p.name)
-                            params.append(getattr(ps, "resolved_type", None))
-                    else:
-                        for p in fsym.params:
-                            params.append(getattr(p, "resolved_type", None))
-                    ret = fsym.resolved_return or VOID
-                    fn_t = function_type(params, ret)
+                    key = self._qualified_key_from_decl_scope(res.scope, fname)
+                    fn_t = self._fn_signature(fsym, key)
                 else:
                     if cur_t is None:
                         self.rep.error(E_OP_TYPES, "Llamada sobre algo que no es función", s)
@@ -689,7 +579,7 @@ class TypeCheckVisitor(CompiscriptVisitor):
                     for a in s.arguments().expression():
                         args.append(self.visit(a))
                 try:
-                    ret_t = call_result(fn_t, args)  # type: ignore[arg-type]
+                    ret_t = self._call_type(fn_t, args)  # type: ignore[arg-type]
                 except Exception as ex:
                     msg = str(ex)
                     code = E_CALL_ARITY if "Aridad" in msg else E_OP_TYPES
@@ -718,17 +608,7 @@ class TypeCheckVisitor(CompiscriptVisitor):
                     elif isinstance(mem, FieldSymbol):
                         cur_t = getattr(mem, "resolved_type", None)
                     elif isinstance(mem, FunctionSymbol):
-                        fscope = self.decl.function_scopes.get(f"{cur_t.name}::{prop}")
-                        params = []
-                        if fscope:
-                            for p in mem.params:
-                                ps = fscope.resolve(p.name)
-                                params.append(getattr(ps, "resolved_type", None))
-                        else:
-                            for p in mem.params:
-                                params.append(getattr(p, "resolved_type", None))
-                        ret = mem.resolved_return or VOID
-                        cur_t = function_type(params, ret)
+                        cur_t = self._fn_signature(mem, f"{cur_t.name}::{prop}")
                     else:
                         cur_t = None
         return cur_t
@@ -761,7 +641,7 @@ class TypeCheckVisitor(CompiscriptVisitor):
             if isinstance(mem, FieldSymbol) and not getattr(mem, "mutable", True):
                 self.rep.error(E_ASSIGN_TO_CONST, f"No se puede reasignar const '{prop}'", ctx)
                 return dst_t or rhs_t
-            if dst_t and rhs_t and not is_assignable(rhs_t, dst_t):
+            if dst_t and rhs_t and not is_assignable(rhs_t, dst_t, self.hierarchy):
                 self.rep.error(E_ASSIGN_INCOMPAT, f"No se puede asignar {rhs_t} a {dst_t}", ctx.assignmentExpr())
             return dst_t or rhs_t
 
@@ -774,7 +654,7 @@ class TypeCheckVisitor(CompiscriptVisitor):
             except Exception:
                 self.rep.error(E_INDEX_INVALID, "Asignación con indexación inválida", lhs_ctx.suffixOp()[-1])
                 return rhs_t
-            if elem_t and rhs_t and not is_assignable(rhs_t, elem_t):
+            if elem_t and rhs_t and not is_assignable(rhs_t, elem_t, self.hierarchy):
                 self.rep.error(E_ASSIGN_INCOMPAT, f"No se puede asignar {rhs_t} a {elem_t}", ctx.assignmentExpr())
             return elem_t or rhs_t
 
@@ -817,15 +697,5 @@ class TypeCheckVisitor(CompiscriptVisitor):
                 if isinstance(mem, FieldSymbol):
                     cur_t = getattr(mem, "resolved_type", None)
                 elif isinstance(mem, FunctionSymbol):
-                    fscope = self.decl.function_scopes.get(f"{cur_t.name}::{prop}")
-                    params = []
-                    if fscope:
-                        for p in mem.params:
-                            ps = fscope.resolve(p.name)
-                            params.append(getattr(ps, "resolved_type", None))
-                    else:
-                        for p in mem.params:
-                            params.append(getattr(p, "resolved_type", None))
-                    ret = mem.resolved_return or VOID
-                    cur_t = function_type(params, ret)
+                    cur_t = self._fn_signature(mem, f"{cur_t.name}::{prop}")
         return cur_t
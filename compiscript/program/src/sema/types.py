@@ -1,15 +1,58 @@
 # program/src/sema/types.py
 from __future__ import annotations
-from dataclasses import dataclass
-from typing import List, Optional, Tuple
+import weakref
+from dataclasses import dataclass, fields, MISSING
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from .class_hierarchy import ClassHierarchy
 
 class SemanticTypeError(TypeError):
     pass
 
-@dataclass(frozen=True)
-class Type:
+# ---- Interning (hash-consing) ----
+# Cada tipo distinto existe una sola vez: ClassType("A") devuelve siempre el mismo objeto,
+# igual que array_of(INTEGER, 2) o function_type([...], ret). Por eso las dataclasses usan
+# eq=False: == y hash son los de object (identidad), que es lo que corre en cada
+# is_assignable / result_*. La tabla es global y guarda referencias débiles: un tipo sale
+# de ella cuando nadie más lo usa, así que en serve no acumula los de análisis anteriores.
+_INTERNED: "weakref.WeakValueDictionary[tuple, Type]" = weakref.WeakValueDictionary()
+_FIELD_SPECS: Dict[type, Tuple[Tuple[str, Any], ...]] = {}
+
+def _field_spec(cls) -> Tuple[Tuple[str, Any], ...]:
+    spec = _FIELD_SPECS.get(cls)
+    if spec is None:
+        spec = _FIELD_SPECS[cls] = tuple((f.name, f.default) for f in fields(cls))
+    return spec
+
+class _Interned(type):
+    def __call__(cls, *args, **kwargs):
+        spec = _field_spec(cls)
+        if kwargs or len(args) != len(spec):
+            vals = list(args)
+            for fname, default in spec[len(args):]:
+                v = kwargs.get(fname, default)
+                if v is MISSING:
+                    raise TypeError(f"{cls.__name__}() falta el argumento {fname!r}")
+                vals.append(v)
+            args = tuple(vals)
+        key = (cls, *args)
+        t = _INTERNED.get(key)
+        if t is None:
+            t = _INTERNED[key] = super().__call__(*args)
+        return t
+
+def interned_count() -> int:
+    return len(_INTERNED)
+
+@dataclass(frozen=True, eq=False)
+class Type(metaclass=_Interned):
     name: str
 
+    def __reduce__(self):
+        # pickle/copy vuelven a pasar por el constructor: la copia es el mismo objeto
+        return (type(self), tuple(getattr(self, f.name) for f in fields(self)))
+
     def __str__(self) -> str:
         return self.name
 
@@ -18,23 +61,23 @@ class Type:
         return self == other
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, eq=False)
 class PrimitiveType(Type):
     pass
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, eq=False)
 class VoidType(Type):
     pass
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, eq=False)
 class NullType(Type):
     def is_subtype_of(self, other: "Type") -> bool:
         return isinstance(other, (ClassType, ArrayType, PrimitiveType)) and other in (STRING,) or isinstance(other, (ClassType, ArrayType))
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, eq=False)
 class ArrayType(Type):
     elem: Type
     rank: int = 1  
@@ -50,12 +93,16 @@ class ArrayType(Type):
         return isinstance(other, ArrayType) and self.elem == other.elem and self.rank == other.rank
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, eq=False)
 class ClassType(Type):
-    pass
+    # la herencia es de cada compilación (ClassType está internado): sin índice, exacto
+    def is_subtype_of(self, other: "Type", hierarchy: Optional["ClassHierarchy"] = None) -> bool:
+        if self is other:
+            return True
+        return hierarchy is not None and type(other) is ClassType and hierarchy.is_subclass(self.name, other.name)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, eq=False)
 class FunctionType(Type):
     params: Tuple[Type, ...]
     ret: Type
@@ -96,62 +143,100 @@ def is_reference_like(t: Type) -> bool:
     return isinstance(t, (ArrayType, ClassType)) or is_string(t)
 
 
-def is_assignable(src: Type, dst: Type) -> bool:
+def is_assignable(src: Type, dst: Type, hierarchy: Optional["ClassHierarchy"] = None) -> bool:
+    """Con 'hierarchy' (ClassHierarchy de la compilación) una subclase se asigna a su base."""
     if src == dst:
         return True
     if src == INTEGER and dst == FLOAT:
         return True
     if src == NULL and is_reference_like(dst):
         return True
+    if hierarchy is not None and type(src) is ClassType and type(dst) is ClassType:
+        return hierarchy.is_subclass(src.name, dst.name)
     return False
 
+# ---- Tablas de operadores ----
+# (lhs, rhs) → resultado por operador; una combinación ausente es inválida. Los tipos están
+# internados (hash por identidad), así que el lookup es un solo probe de dict.
+_NUMERIC_PAIRS = {
+    (INTEGER, INTEGER): INTEGER, (INTEGER, FLOAT): FLOAT,
+    (FLOAT, INTEGER): FLOAT, (FLOAT, FLOAT): FLOAT,
+}
+_COMPARE = {k: BOOLEAN for k in _NUMERIC_PAIRS}
+_LOGICAL = {(BOOLEAN, BOOLEAN): BOOLEAN}
+
+BINARY_OPS: Dict[str, Dict[Tuple[Any, Any], Type]] = {
+    "+": {**_NUMERIC_PAIRS, (STRING, STRING): STRING},
+    "-": _NUMERIC_PAIRS, "*": _NUMERIC_PAIRS, "/": _NUMERIC_PAIRS, "%": _NUMERIC_PAIRS,
+    "<": _COMPARE, "<=": _COMPARE, ">": _COMPARE, ">=": _COMPARE,
+    "==": _COMPARE, "!=": _COMPARE,   # además: tipos idénticos (ver binary_result)
+    "&&": _LOGICAL, "||": _LOGICAL,
+}
+
+def binary_result(op: str, a: Optional[Type], b: Optional[Type]) -> Optional[Type]:
+    """Tipo de 'a op b', o None si la combinación es inválida (no lanza)."""
+    r = BINARY_OPS[op].get((a, b))
+    if r is None and a == b and op in ("==", "!="):
+        return BOOLEAN
+    return r
+
+def unary_result(op: str, t: Optional[Type]) -> Optional[Type]:
+    """Tipo de '!t' / '-t', o None si es inválido (no lanza)."""
+    if op == "!":
+        return BOOLEAN if t == BOOLEAN else None
+    return t if is_numeric(t) else None
+
+# Versiones que lanzan SemanticTypeError (API previa)
 def result_add(a: Type, b: Type) -> Type:
-    if is_string(a) and is_string(b):
-        return STRING
-    # Numérico
-    return unify_numeric(a, b)
+    r = BINARY_OPS["+"].get((a, b))
+    if r is None:
+        raise SemanticTypeError(f"Se esperaba tipos numéricos, recibidos: {a}, {b}")
+    return r
+
+def _numeric_op(op: str, a: Type, b: Type) -> Type:
+    r = BINARY_OPS[op].get((a, b))
+    if r is None:
+        raise SemanticTypeError(f"Se esperaba tipos numéricos, recibidos: {a}, {b}")
+    return r
 
 def result_sub(a: Type, b: Type) -> Type:
-    return unify_numeric(a, b)
+    return _numeric_op("-", a, b)
 
 def result_mul(a: Type, b: Type) -> Type:
-    return unify_numeric(a, b)
+    return _numeric_op("*", a, b)
 
 def result_div(a: Type, b: Type) -> Type:
-    return unify_numeric(a, b)
+    return _numeric_op("/", a, b)
 
 def result_mod(a: Type, b: Type) -> Type:
-    return unify_numeric(a, b)
+    return _numeric_op("%", a, b)
 
 def result_logical_and(a: Type, b: Type) -> Type:
-    if is_boolean(a) and is_boolean(b):
-        return BOOLEAN
-    raise SemanticTypeError(f"Operación lógica requiere boolean: {a}, {b}")
+    if binary_result("&&", a, b) is None:
+        raise SemanticTypeError(f"Operación lógica requiere boolean: {a}, {b}")
+    return BOOLEAN
 
 def result_logical_or(a: Type, b: Type) -> Type:
-    if is_boolean(a) and is_boolean(b):
-        return BOOLEAN
-    raise SemanticTypeError(f"Operación lógica requiere boolean: {a}, {b}")
+    if binary_result("||", a, b) is None:
+        raise SemanticTypeError(f"Operación lógica requiere boolean: {a}, {b}")
+    return BOOLEAN
 
 def result_logical_not(t: Type) -> Type:
-    if is_boolean(t):
-        return BOOLEAN
-    raise SemanticTypeError(f"'!' requiere boolean, recibido: {t}")
+    if unary_result("!", t) is None:
+        raise SemanticTypeError(f"'!' requiere boolean, recibido: {t}")
+    return BOOLEAN
 
 def result_relational(a: Type, b: Type) -> Type:
     # <, <=, >, >=
-    unify_numeric(a, b)
-    return BOOLEAN
+    return _numeric_op("<", a, b)
 
 def result_equality(a: Type, b: Type) -> Type:
     # ==, !=  — aceptamos igualdad cuando:
     #   - tipos idénticos, o
     #   - ambos numéricos (int/float)
-    if a == b:
-        return BOOLEAN
-    if is_numeric(a) and is_numeric(b):
-        return BOOLEAN
-    raise SemanticTypeError(f"Igualdad requiere tipos compatibles, recibidos: {a}, {b}")
+    if binary_result("==", a, b) is None:
+        raise SemanticTypeError(f"Igualdad requiere tipos compatibles, recibidos: {a}, {b}")
+    return BOOLEAN
 
 def array_of(elem: Type, rank: int = 1) -> ArrayType:
     return ArrayType(name="array", elem=elem, rank=rank)
@@ -169,12 +254,12 @@ def index_result(t_arr: Type, t_index: Type) -> Type:
 def function_type(params: List[Type], ret: Type) -> FunctionType:
     return FunctionType(name="fn", params=tuple(params), ret=ret)
 
-def call_result(fn: Type, args: List[Type]) -> Type:
+def call_result(fn: Type, args: List[Type], hierarchy: Optional["ClassHierarchy"] = None) -> Type:
     if not isinstance(fn, FunctionType):
         raise SemanticTypeError(f"Llamada requiere función, recibido: {fn}")
     if len(args) != len(fn.params):
         raise SemanticTypeError(f"Aridad inválida: se esperaban {len(fn.params)}, recibidos {len(args)}")
     for i, (arg_t, param_t) in enumerate(zip(args, fn.params)):
-        if not is_assignable(arg_t, param_t):
+        if not is_assignable(arg_t, param_t, hierarchy):
             raise SemanticTypeError(f"Argumento {i} incompatible: {arg_t} → {param_t}")
     return fn.ret
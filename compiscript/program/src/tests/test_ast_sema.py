@@ -0,0 +1,100 @@
+# program/tests/test_ast_sema.py
+# La semántica sobre el AST debe dar exactamente lo mismo que los visitors del parse tree:
+# errores (código, mensaje, línea, columna) y tablas de símbolos.
+import os
+import pytest
+from cli import _serialize_symbols
+from src.frontend.parser_util import parse_code
+from src.frontend.fast_parser import parse_program
+from src.ast.builder_visitor import ASTBuilder
+from src.sema.errors import ErrorReporter
+from src.sema.decl_collector import DeclarationCollector
+from src.sema.type_linker import TypeLinker
+from src.sema.typecheck_visitor import TypeCheckVisitor
+from src.sema.ast_decl_collector import ASTDeclarationCollector
+from src.sema.ast_typecheck import ASTTypeChecker
+
+SAMPLES = os.path.join(os.path.dirname(__file__), "..", "..", "samples")
+
+def _result(rep, dc):
+    return [(e.code, e.message, e.line, e.column) for e in rep.errors], _serialize_symbols(dc)
+
+def _tree_sema(tree):
+    rep = ErrorReporter()
+    dc = DeclarationCollector(rep)
+    dc.visit(tree)
+    TypeLinker(rep, dc).link()
+    TypeCheckVisitor(rep, dc).visit(tree)
+    return _result(rep, dc)
+
+def _ast_sema(ast):
+    rep = ErrorReporter()
+    dc = ASTDeclarationCollector(rep)
+    dc.visit_program(ast)
+    TypeLinker(rep, dc).link()
+    ASTTypeChecker(rep, dc).visit_program(ast)
+    return _result(rep, dc)
+
+def _assert_same(code):
+    parser, tree = parse_code(code)
+    assert parser.getNumberOfSyntaxErrors() == 0
+    ref = _tree_sema(tree)
+    assert _ast_sema(ASTBuilder().visit(tree)) == ref
+    assert _ast_sema(parse_program(code)) == ref
+    return ref
+
+@pytest.mark.parametrize("name", sorted(f for f in os.listdir(SAMPLES) if f.endswith(".cps")))
+def test_samples(name):
+    code = open(os.path.join(SAMPLES, name), encoding="utf-8").read()
+    parser, _ = parse_code(code)
+    if parser.getNumberOfSyntaxErrors():
+        pytest.skip("con errores de sintaxis cli usa los visitors del parse tree")
+    _assert_same(code)
+
+SNIPPETS = [
+    # operadores y posiciones de subexpresiones (paréntesis, sufijos)
+    'let a: integer = 1; let b = (a + "x") * 2; let c = -(true); let d = !(a > 0) || "s";',
+    'let n = !42; let m = !"s" && true; let o = !(1 < 2) == false; let q = -"s" + 1;',
+    'let xs: integer[] = [1, 2.0, "s"]; xs[0] = "a"; xs["i"] = 1; let e = []; let m = xs[0][1];',
+    # clases, campos const, this, new, herencia
+    'class P { let x: integer; const k: integer = 1; function constructor(x: integer) { this.x = x; }'
+    ' function get(): integer { return this.x; } }\n'
+    'let p: P = new P(1); p.x = "s"; p.k = 2; p.zz = 1; p.get().x = 1; let q = p.get(); q.x = 1;',
+    'class G { let a: integer[]; function set() { this.a[0] = 1; this.a = [1]; this.a.b = 2; this.a[0].c = 1; } }\n'
+    'let g = new G(); g.a[0] = "x"; g.set(1); g.set = 2;',
+    'class A { function m(): integer { function n(): integer { return 1; } return n(); } }\n'
+    'class B : A { function k(): integer { return this.m() + this.nope(); } }\n'
+    'class C : D { } class E : F { } class F : E { }',
+    'this.x = 1; let z = this; let o = new Nope(1); let o2 = new A(1); x.y.z = 1; f(p.q = 1);',
+    # funciones, parámetros, retornos, capturas
+    'function f(a: integer, a: string): integer { if (a > 0) { return 1; } }\n'
+    'function g(): string { return 1; } function h() { return 2; } return 3;\n'
+    'let r = f(1) + f("x", 2); let t = undefinedFn(1); let u = a(1);',
+    'function outer(): integer { let v: integer = 1;'
+    ' function inner(): integer { return v + w; } let w = 2; return inner(); }',
+    'function v(): void { return 1; } function w2(): integer { return; }'
+    ' let t = 1 ? 2 : "x"; let tt = true ? 1 : 2;',
+    # control de flujo, scopes de bloque, código muerto
+    'for (let i: integer = 0; i < 10; i = i + 1) { break; print(i); }\n'
+    'for (;; i = i + 1) { } while (1) { continue; } do { } while ("x");\n'
+    'foreach (y in 5) { } foreach (z in [1,2]) { let w: string = z; }',
+    '{ let inner = 1; { let inner = 2; } let inner = 3; } let inner = 4; break;',
+    'try { let e1 = 1; } catch (err) { print(err); }',
+    # switch
+    'switch (1) { case 1: print(1); case "a": print(2); default: print(3); }\n'
+    'let s: string = "a"; switch (s) { case "a": break; case "a": break; case 1: break; }\n'
+    'switch (true) { case false: break; case "x": break; }',
+    # asignaciones como expresión y constantes
+    'let a = 1; let k = (a = 3); let arr: integer[] = [1]; arr[0] = "x"; let y = arr[1] = 5;\n'
+    'const c: integer = "x"; c = 2; let n: integer = null; let f2: float = 1;',
+]
+
+@pytest.mark.parametrize("code", SNIPPETS)
+def test_snippets(code):
+    errors, _ = _assert_same(code)
+    assert errors  # cada snippet ejercita al menos un error
+
+def test_syntax_error_trees_still_checked_by_cli():
+    import cli
+    payload = cli.build_payload("let a: integer = \"x\"\nlet b = ;\n")
+    assert not payload["ok"] and "E200" in [e["code"] for e in payload["errors"]]
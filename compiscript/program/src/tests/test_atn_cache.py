@@ -0,0 +1,100 @@
+# program/tests/test_atn_cache.py
+import os, subprocess, sys, types
+
+import pytest
+
+from src.frontend import atn_cache
+
+PROGRAM = atn_cache.PROGRAM_DIR
+SAMPLES = os.path.join(PROGRAM, "samples")
+SimpleATN = types.SimpleNamespace(states=[])
+
+# imprime si cargó DFAs de disco y el árbol de cada sample
+_SCRIPT = """
+import os, sys
+from src.frontend import atn_cache
+if sys.argv[2:] == ["on"]:
+    atn_cache.configure()
+from src.frontend.parser_util import parse_code
+print(atn_cache.loaded)
+for name in sorted(os.listdir(sys.argv[1])):
+    if name.endswith(".cps"):
+        p, t = parse_code(open(os.path.join(sys.argv[1], name), encoding="utf-8").read())
+        print(t.toStringTree(recog=p))
+"""
+
+def _run(cache_dir, disabled=False, opt_in=True):
+    env = dict(os.environ, CPS_CACHE_DIR=str(cache_dir))
+    env.pop("CPS_NO_ATN_CACHE", None)
+    if disabled:
+        env["CPS_NO_ATN_CACHE"] = "1"
+    out = subprocess.run([sys.executable, "-c", _SCRIPT, SAMPLES, "on" if opt_in else "off"], cwd=PROGRAM, env=env,
+                         capture_output=True, text=True, check=True).stdout.splitlines()
+    return out[0] == "True", out[1:]
+
+def test_dfa_cache_written_at_exit_then_loaded_with_same_trees(tmp_path):
+    loaded, cold = _run(tmp_path)
+    assert not loaded
+    assert len(os.listdir(tmp_path / "atn")) == 1
+    loaded, warm = _run(tmp_path)
+    assert loaded and warm == cold
+    loaded, plain = _run(tmp_path, disabled=True)
+    assert not loaded and plain == cold
+
+def test_dfa_cache_is_opt_in(tmp_path):
+    # importar parser_util sin configure() no lee ni escribe la caché
+    loaded, _ = _run(tmp_path, opt_in=False)
+    assert not loaded and not (tmp_path / "atn").exists()
+
+def test_ast_dump_writes_then_loads_dfa_cache(tmp_path):
+    env = dict(os.environ, CPS_CACHE_DIR=str(tmp_path))
+    env.pop("CPS_NO_ATN_CACHE", None)
+    sample = os.path.join(SAMPLES, sorted(n for n in os.listdir(SAMPLES) if n.endswith(".cps"))[0])
+    dump = lambda: subprocess.run([sys.executable, "-m", "src.tools.ast_dump", sample], cwd=PROGRAM,
+                                  env=env, capture_output=True, check=True).stdout
+    cold = dump()
+    [name] = os.listdir(tmp_path / "atn")
+    mtime = os.stat(tmp_path / "atn" / name).st_mtime_ns
+    # segunda corrida: carga la caché y no la reescribe
+    assert dump() == cold
+    assert os.stat(tmp_path / "atn" / name).st_mtime_ns == mtime
+
+def test_cache_with_foreign_header_or_classes_is_ignored(tmp_path):
+    _run(tmp_path)
+    [name] = os.listdir(tmp_path / "atn")
+    path = tmp_path / "atn" / name
+    header, _, body = path.read_bytes().partition(b"\n")
+    path.write_bytes(b"cps-atn otra-clave\n" + body)
+    assert _run(tmp_path)[0] is False
+    # cabecera correcta pero un pickle que intenta importar otra cosa
+    import pickle
+    path.write_bytes(header + b"\n" + pickle.dumps(os.system))
+    assert _run(tmp_path)[0] is False
+    # la entrada rechazada se reescribe al salir con los DFAs aprendidos
+    assert _run(tmp_path)[0] is True
+
+def test_unpickler_only_resolves_dfa_classes():
+    import io, pickle
+    from antlr4.FileStream import FileStream
+    from antlr4.dfa.DFAState import DFAState
+    for obj in (FileStream, os.system):
+        with pytest.raises(pickle.UnpicklingError):
+            atn_cache._DFAUnpickler(io.BytesIO(pickle.dumps(obj)), SimpleATN, SimpleATN).load()
+    assert atn_cache._DFAUnpickler(io.BytesIO(pickle.dumps(DFAState)), SimpleATN, SimpleATN).load() is DFAState
+
+def test_parallel_batch_writes_dfa_cache(tmp_path):
+    # los workers del pool no corren atexit: guardan al cerrarse el pool
+    env = dict(os.environ)
+    env.pop("CPS_NO_ATN_CACHE", None)
+    subprocess.run([sys.executable, "cli.py", "--batch", SAMPLES, "-j", "2", "--cache-dir", str(tmp_path)],
+                   cwd=PROGRAM, env=env, capture_output=True, check=False)
+    assert len(os.listdir(tmp_path / "atn")) == 1
+    loaded, _ = _run(tmp_path)
+    assert loaded
+
+def test_cache_key_tracks_serialized_atn():
+    lex = types.SimpleNamespace(serializedATN=lambda: [4, 1, 2])
+    par = types.SimpleNamespace(serializedATN=lambda: [4, 5, 6])
+    par2 = types.SimpleNamespace(serializedATN=lambda: [4, 5, 7])
+    assert atn_cache.cache_key(lex, par) == atn_cache.cache_key(lex, par)
+    assert atn_cache.cache_key(lex, par) != atn_cache.cache_key(lex, par2)
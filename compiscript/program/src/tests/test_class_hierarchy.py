@@ -0,0 +1,59 @@
+# program/tests/test_class_hierarchy.py
+from src.frontend.fast_parser import parse_program
+from src.sema.errors import ErrorReporter, E_ASSIGN_INCOMPAT, E_INHERIT_CYCLE
+from src.sema.ast_decl_collector import ASTDeclarationCollector
+from src.sema.type_linker import TypeLinker
+from src.sema.ast_typecheck import ASTTypeChecker
+from src.sema.class_hierarchy import ClassHierarchy
+from src.sema.types import ClassType, NULL, is_assignable
+
+def _check(code: str):
+    rep = ErrorReporter()
+    ast = parse_program(code)
+    dc = ASTDeclarationCollector(rep)
+    dc.visit_program(ast)
+    TypeLinker(rep, dc).link()
+    ASTTypeChecker(rep, dc).visit_program(ast)
+    return dc, rep
+
+def test_pre_post_numbering_answers_subclass_queries():
+    h = ClassHierarchy({"Animal": None, "Perro": "Animal", "Gato": "Animal", "Cachorro": "Perro", "X": None})
+    assert h.is_subclass("Cachorro", "Animal") and h.is_subclass("Cachorro", "Perro")
+    assert h.is_subclass("Perro", "Perro")
+    assert not h.is_subclass("Animal", "Perro") and not h.is_subclass("Gato", "Perro")
+    assert not h.is_subclass("X", "Animal")
+    assert h.depth == {"Animal": 0, "Perro": 1, "Cachorro": 2, "Gato": 1, "X": 0}
+    assert h.order == ["Animal", "Perro", "Cachorro", "Gato", "X"]
+    assert h.ancestors("Cachorro") == ["Animal", "Perro", "Cachorro"]
+
+def test_unknown_bases_and_cycles_are_cut():
+    h = ClassHierarchy({"A": "B", "B": "A", "C": "A", "D": "Nope"})
+    assert h.parent == {"A": "B", "B": None, "C": "A", "D": None}
+    assert h.is_subclass("C", "B") and not h.is_subclass("B", "A")
+    assert sorted(h.order) == ["A", "B", "C", "D"]
+
+def test_is_assignable_uses_the_hierarchy_for_class_types():
+    h = ClassHierarchy({"Animal": None, "Perro": "Animal"})
+    perro, animal = ClassType("Perro"), ClassType("Animal")
+    assert not is_assignable(perro, animal)  # sin índice: exacto, como antes
+    assert is_assignable(perro, animal, h) and not is_assignable(animal, perro, h)
+    assert is_assignable(NULL, perro, h)
+    assert perro.is_subtype_of(animal, h) and not perro.is_subtype_of(animal)
+
+def test_checker_accepts_subclass_where_base_is_expected():
+    dc, rep = _check("""
+class Animal { let n: integer; }
+class Perro : Animal { }
+function f(a: Animal): Animal { return a; }
+let p: Perro = new Perro();
+let a: Animal = p;
+let b: Animal = f(p);
+let c: Perro = b;
+""")
+    assert [(e.code, e.line) for e in rep.errors] == [(E_ASSIGN_INCOMPAT, 8)]
+    assert dc.class_hierarchy.is_subclass("Perro", "Animal")
+
+def test_hierarchy_is_built_after_cycle_check():
+    dc, rep = _check("class A : B { }\nclass B : A { }\nlet a: A = new B();")
+    assert [e.code for e in rep.errors][:1] == [E_INHERIT_CYCLE]
+    assert set(dc.class_hierarchy.order) == {"A", "B"}
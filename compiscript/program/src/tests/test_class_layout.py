@@ -0,0 +1,56 @@
+# program/tests/test_class_layout.py
+from src.frontend.fast_parser import parse_program
+from src.sema.errors import ErrorReporter, E_MEMBER_NOT_FOUND
+from src.sema.ast_decl_collector import ASTDeclarationCollector
+from src.sema.type_linker import TypeLinker
+from src.sema.ast_typecheck import ASTTypeChecker
+from src.sema.symbols import FieldSymbol
+from src.sema.types import INTEGER, STRING
+
+def _check(code: str):
+    rep = ErrorReporter()
+    ast = parse_program(code)
+    dc = ASTDeclarationCollector(rep)
+    dc.visit_program(ast)
+    TypeLinker(rep, dc).link()
+    ASTTypeChecker(rep, dc).visit_program(ast)
+    return dc, rep
+
+HIERARCHY = """
+class A { let x: integer; let y: integer; function m(): integer { return 1; } function n(): integer { return 2; } }
+class B : A { let z: string; let x: integer; function m(): integer { return 3; } }
+class C : B { let w: integer; }
+"""
+
+def test_flattened_members_fields_and_methods():
+    dc, rep = _check(HIERARCHY)
+    assert not rep.has_errors(), rep.summary()
+    c = dc.class_layouts.get("C")
+    assert c.base == "B" and c.fields == ["x", "y", "z", "w"]
+    assert {k: owner for k, (owner, _) in c.methods.items()} == {"m": "B", "n": "A"}
+    # el campo propio tapa al heredado
+    assert c.members["x"] is dc.class_scopes["B"].resolve_local("x")
+    assert isinstance(c.members["z"], FieldSymbol) and c.members["z"].resolved_type == STRING
+    assert dc.class_layouts.lookup("C", "y").resolved_type == INTEGER
+    assert dc.class_layouts.lookup("C", "nope") is None and dc.class_layouts.lookup("Nope", "x") is None
+
+def test_member_lookup_does_not_fall_back_to_globals():
+    _, rep = _check("class A { }\nlet g: integer = 1;\nfunction constructor() { }\n"
+                    "let a: A = new A(1);\nlet x: integer = a.g;\n")
+    assert [e.code for e in rep.errors] == ["E202", E_MEMBER_NOT_FOUND]
+
+def test_inheritance_cycle_does_not_hang():
+    dc, rep = _check("class A : B { let a: integer; }\nclass B : A { let b: integer; }\n"
+                     "let x: A = new A();\nlet y = x.b + x.a; let z = x.c;\n")
+    assert [e.code for e in rep.errors] == ["E140", E_MEMBER_NOT_FOUND]
+    assert set(dc.class_layouts.get("A").members) == {"a", "b"}
+
+def test_inheritance_cycle_cut_matches_hierarchy():
+    # C : A entra al ciclo A ↔ B; armar C primero no cambia dónde se corta
+    dc, _ = _check("class C : A { }\nclass A : B { let a: integer; }\nclass B : A { let b: integer; }\n")
+    hier = dc.class_hierarchy
+    for cname in ("A", "B", "C"):
+        expected = set()
+        for anc in hier.ancestors(cname):
+            expected |= {name for name, _ in dc.class_scopes[anc].items()}
+        assert set(dc.class_layouts.get(cname).members) == expected, cname
@@ -1,5 +1,7 @@
 # program/tests/test_errors.py
-from src.sema.errors import ErrorReporter, SemanticError, E_DUPLICATE_ID, E_INHERIT_CYCLE
+import pytest
+
+from src.sema.errors import ErrorReporter, SemanticError, TooManyErrors, E_DUPLICATE_ID, E_INHERIT_CYCLE
 
 class _DummyTok:
     def __init__(self, line, column):
@@ -37,3 +39,24 @@ def test_summary_and_clear():
     rep.clear()
     assert not rep.has_errors()
     assert len(rep) == 0
+
+def test_same_code_and_position_is_reported_once():
+    rep = ErrorReporter()
+    rep.error(E_DUPLICATE_ID, "Identificador redeclarado: x", line=2, column=1)
+    rep.error(E_DUPLICATE_ID, "otro mensaje, mismo lugar", line=2, column=1)
+    rep.error(E_INHERIT_CYCLE, "otro código", line=2, column=1)
+    rep.error(E_DUPLICATE_ID, "sin posición")
+    rep.error(E_DUPLICATE_ID, "sin posición")
+    assert [(e.code, e.line) for e in rep.errors] == [
+        (E_DUPLICATE_ID, 2), (E_INHERIT_CYCLE, 2), (E_DUPLICATE_ID, -1), (E_DUPLICATE_ID, -1)]
+
+def test_max_errors_aborts_and_sink_streams():
+    seen = []
+    rep = ErrorReporter(max_errors=2, sink=seen.append)
+    rep.error(E_DUPLICATE_ID, "a", line=1, column=0)
+    rep.error(E_DUPLICATE_ID, "a", line=1, column=0)  # duplicado: no cuenta para el tope
+    rep.error(E_DUPLICATE_ID, "b", line=2, column=0)
+    with pytest.raises(TooManyErrors):
+        rep.error(E_DUPLICATE_ID, "c", line=3, column=0)
+    assert rep.truncated and [e.message for e in rep.errors] == ["a", "b"]
+    assert seen == rep.errors
@@ -0,0 +1,114 @@
+# program/tests/test_fast_frontend.py
+import dataclasses
+import os
+import pytest
+from src.frontend.parser_util import parse_code
+from src.frontend.fast_lexer import tokenize, FastSyntaxError
+from src.frontend.fast_parser import parse_program
+from src.ast.builder_visitor import ASTBuilder
+from src.ast import nodes as A
+
+SAMPLES = os.path.join(os.path.dirname(__file__), "..", "..", "samples")
+
+def _antlr_ast(code):
+    _, tree = parse_code(code)
+    return ASTBuilder().visit(tree)
+
+def _paren_positions(node):
+    # paren_pos no entra en ==: se compara aparte
+    out = []
+    stack = [node]
+    while stack:
+        n = stack.pop()
+        if isinstance(n, list):
+            stack.extend(reversed(n))
+        elif isinstance(n, A.Node):
+            out.append(n.paren_pos)
+            stack.extend(reversed([getattr(n, f.name) for f in dataclasses.fields(n)]))
+    return out
+
+def _assert_same_ast(fast, ref):
+    assert fast == ref
+    assert _paren_positions(fast) == _paren_positions(ref)
+
+@pytest.mark.parametrize("name", sorted(f for f in os.listdir(SAMPLES) if f.endswith(".cps")))
+def test_fast_matches_ast_builder_on_samples(name):
+    code = open(os.path.join(SAMPLES, name), encoding="utf-8").read()
+    parser, tree = parse_code(code)
+    if parser.getNumberOfSyntaxErrors():
+        # con errores de sintaxis el frontend rápido no adivina: deja el diagnóstico a ANTLR
+        with pytest.raises(FastSyntaxError):
+            parse_program(code)
+        return
+    # igualdad de dataclasses: estructura, valores y posiciones
+    _assert_same_ast(parse_program(code), ASTBuilder().visit(tree))
+
+SNIPPETS = [
+    "",
+    "// solo comentarios\n/* varias\n   líneas */",
+    "let x = -a * (b + c) - d % 2 <= 3 && !e || f == g != h;",
+    "x = a ? b : c ? d : e;",
+    "let q: integer[][] = [[1, 2], [3]];\nlet s: string = \"hola\";",
+    "new A(1).f(2)[3].g;",
+    "this.x = 1.5e3 + 2e-1 + 3.25;",
+    "a = b = c;",
+    "a.b = 1;",
+    "x = a.b = 1;",
+    "f(a.b = 1);",
+    "a[0] = 1;",
+    "(a = 1);",
+    "(a.b = 1);",
+    "x + (b.c = 1);",
+    "let y = ((a + b)) * -(c);",
+    "for (i = 0; i < 10; i = i + 1) { continue; }",
+    "for (a.b = 1; ;) {}",
+    "for (;; i = i + 1) {}",
+    "foreach (x in xs) { print(x); }",
+    "switch (x) { case 1: print(1); break; case 2: default: print(3); }",
+    "class A : B { const k: integer = 1; var v; function constructor(a, b: string) { this.v = a; } }",
+    "try { f(); } catch (e) { print(e); } do { x = x - 1; } while (x > 0);",
+    "if (a) { } else { if (b) { return; } }",
+    "\t\tlet  a =\n\n   1;",
+]
+
+@pytest.mark.parametrize("code", SNIPPETS)
+def test_fast_matches_ast_builder_on_snippets(code):
+    _assert_same_ast(parse_program(code), _antlr_ast(code))
+
+def test_statement_property_assignment_position():
+    # alt 2 de 'assignment': el PropertyAccess toma la posición de la sentencia
+    stmt = parse_program("  a.b = 1;").statements[0]
+    assert isinstance(stmt, A.Assign) and stmt.target.pos == (1, 3)
+    # dentro de una expresión es PropertyAccess normal, en el '.'
+    call = parse_program("f(a.b = 1);").statements[0].expr
+    assert call.args[0].target.pos == (1, 4)
+
+def test_tokenize_positions_and_kinds():
+    toks = tokenize("let x: float = 1.5;\n  y")
+    assert [t[0] for t in toks] == ["let", "id", ":", "float", "=", "float_lit", ";", "id", "eof"]
+    assert toks[5][2] == (1, 16) and toks[7][2] == (2, 3)
+
+@pytest.mark.parametrize("code", [
+    "let x: integer = ;",
+    "let x = 1",
+    "if (a) { } else if (b) { }",  # 'else' exige bloque
+    "1(2);",                        # sufijos solo sobre leftHandSide
+    "(a) = 1;",
+    "let s = \"sin cerrar;",
+    "let x = 1 & 2;",
+    "class A { print(1); }",
+])
+def test_invalid_input_raises(code):
+    with pytest.raises(FastSyntaxError):
+        parse_program(code)
+
+def test_ambiguous_chained_property_assignment_is_left_to_antlr():
+    with pytest.raises(FastSyntaxError):
+        parse_program("a.b = c.d = 1;")
+
+def test_identifiers_share_one_string_per_compilation():
+    code = "let abc: integer[] = [1]; let xs: integer[] = abc; print(abc);"
+    for prog in (parse_program(code), ASTBuilder().visit(parse_code(code)[1])):
+        a, b, p = prog.statements
+        assert b.init.name is a.name and p.expr.name is a.name
+        assert b.type_ann is a.type_ann
@@ -0,0 +1,93 @@
+# program/tests/test_incremental.py
+from src.frontend.fast_parser import parse_program
+from src.sema.errors import ErrorReporter
+from src.sema.ast_decl_collector import ASTDeclarationCollector
+from src.sema.type_linker import TypeLinker
+from src.sema.ast_typecheck import ASTTypeChecker
+from src.sema.incremental import analyze, reanalyze
+from cli import _serialize_symbols, build_ir_from_ast
+
+BASE = """
+class P { let v: integer; function get(): integer { return this.v; } }
+class Q : P { let w: string; }
+let g = 1;
+function mk(): P { return new P(); }
+function f(a: integer): integer {
+  let x = mk();
+  if (a > 0) { let y = x.v; function inner(): integer { return y + a + g; } return inner(); }
+  return x.get() + g;
+}
+function k(s: string): string { return s + "!"; }
+function bad(): integer { return "s" * 2; }
+function usesQ(q: Q): string { return q.w; }
+"""
+
+def _full(code: str):
+    rep = ErrorReporter()
+    ast = parse_program(code)
+    dc = ASTDeclarationCollector(rep)
+    dc.visit_program(ast)
+    TypeLinker(rep, dc).link()
+    ASTTypeChecker(rep, dc).visit_program(ast)
+    return rep, dc, ast
+
+def _same_as_full(res, code: str) -> None:
+    rep, dc, _ = _full(code)
+    assert [(e.code, e.message, e.line, e.column) for e in res.rep.errors] == \
+           [(e.code, e.message, e.line, e.column) for e in rep.errors]
+    assert _serialize_symbols(res.decl) == _serialize_symbols(dc)
+
+def test_body_edit_rechecks_only_that_declaration():
+    old = analyze(BASE)
+    k_sym = old.decl.global_scope.resolve_local("k")
+    code = BASE.replace('return s + "!";', "return s + 1;")
+    res, invalidated = reanalyze(old, code)
+    assert invalidated == {"k"}
+    assert res.decl.global_scope.resolve_local("f") is not None
+    assert res.decl.global_scope.resolve_local("k") is not k_sym
+    _same_as_full(res, code)
+
+def test_signature_change_invalidates_dependents_through_the_graph():
+    res = analyze(BASE)
+    # el tipo de P.v cambia: P, Q (su base) y quienes usan P o Q
+    code = BASE.replace("let v: integer;", "let v: string;")
+    res, invalidated = reanalyze(res, code)
+    assert invalidated == {"P", "Q", "mk", "f", "usesQ"}
+    assert res.dependents("mk") == {"f"}
+    _same_as_full(res, code)
+
+def test_moved_declarations_keep_errors_and_resolutions_in_place():
+    res = analyze(BASE)
+    bad_sym = res.decl.global_scope.resolve_local("bad")
+    # líneas nuevas arriba y 'bad' corrida de columna: se reutiliza con posiciones nuevas
+    code = "\n\nfunction extra(): integer { return 2; }\n" + BASE.replace("function bad", "  function bad")
+    res, invalidated = reanalyze(res, code)
+    assert invalidated == {"extra"}
+    assert res.decl.global_scope.resolve_local("bad") is bad_sym
+    _same_as_full(res, code)
+
+    fixed = code.replace('return "s" * 2;', "return 2;")
+    res, invalidated = reanalyze(res, fixed)
+    assert invalidated == {"bad"} and not res.rep.has_errors()
+    _, dc, ast = _full(fixed)
+    assert build_ir_from_ast(res.ast, None, res.decl) == build_ir_from_ast(ast, None, dc)
+
+def test_added_global_invalidates_users_of_that_name():
+    res = analyze(BASE)
+    code = BASE + "let zz = 3;\n"
+    res, _ = reanalyze(res, code.replace("return s + \"!\";", "return s + zz;"))
+    code2 = code.replace("let zz = 3;", 'let zz = "t";').replace("return s + \"!\";", "return s + zz;")
+    res, invalidated = reanalyze(res, code2)
+    assert invalidated == {"k"}
+    _same_as_full(res, code2)
+
+def test_inheritance_cycle_reorder_matches_full_pipeline():
+    p = "class P : Q { function get(): integer { return 1; } }\n"
+    q = "class Q : P { function use(): integer { return this.get(); } }\n"
+    tail = "function h(): integer { return 2; }\n"
+    res = analyze(p + q + tail)
+    _same_as_full(res, p + q + tail)
+    # el corte del ciclo depende del orden: con E140 no se reutiliza nada
+    res, invalidated = reanalyze(res, q + p + tail)
+    assert invalidated == {"P", "Q", "h"}
+    _same_as_full(res, q + p + tail)
@@ -0,0 +1,54 @@
+# program/tests/test_parallel_sema.py
+import pytest
+
+from src.frontend.fast_parser import parse_program
+from src.sema.errors import ErrorReporter
+from src.sema.ast_decl_collector import ASTDeclarationCollector
+from src.sema.type_linker import TypeLinker
+from src.sema.ast_typecheck import ASTTypeChecker
+from src.sema import parallel
+from cli import _serialize_symbols
+
+def _program(n: int) -> str:
+    out = ['let g0 = 1;']
+    for i in range(n):
+        # usa una global que todavía no tiene tipo inferido cuando aparece la función
+        out.append(f'function f{i}(a: integer): integer {{ let x: integer = a + g{i // 5 * 5}; '
+                   f'if (x > 0) {{ let y = x; function inner(): integer {{ return y + a; }} return inner(); }} '
+                   f'return x + "s"; }}')
+        if i % 5 == 4:
+            out.append(f'let g{i + 1} = f{i}(1);')
+        if i % 9 == 0:
+            out.append(f'class C{i} {{ let v: integer; function get(): string {{ return this.v; }} }}')
+    return "\n".join(out)
+
+def _check(code: str, workers: int):
+    rep = ErrorReporter()
+    ast = parse_program(code)
+    dc = ASTDeclarationCollector(rep)
+    dc.visit_program(ast)
+    TypeLinker(rep, dc).link()
+    tc = ASTTypeChecker(rep, dc)
+    tc.visit_program(ast, workers=workers)
+    errors = [(e.code, e.message, e.line, e.column) for e in rep.errors]
+    return errors, _serialize_symbols(dc), (tc.memo_hits, tc.memo_misses), dc
+
+@pytest.mark.skipif(parallel._fork_context() is None, reason="requiere fork")
+def test_parallel_bodies_match_sequential():
+    code = _program(parallel.MIN_PARALLEL_BODIES + 16)
+    seq = _check(code, 1)
+    par = _check(code, 3)
+    assert seq[0] and par[0] == seq[0]          # mismos errores, mismo orden
+    assert par[1] == seq[1]                     # símbolos, capturas y refs
+    # mismas consultas a los memos; el reparto hits/misses depende de qué vio cada worker
+    assert sum(par[2]) == sum(seq[2]) and par[2][0] <= seq[2][0]
+    assert par[1]["functions"]["::f0::inner"]["captured"] == ["a", "y"]
+    fn = par[3].function_scopes["::f3"]
+    assert par[3].resolutions.frame_locals(fn) == seq[3].resolutions.frame_locals(seq[3].function_scopes["::f3"])
+
+def test_small_inputs_stay_sequential(monkeypatch):
+    def boom(*a, **k):
+        raise AssertionError("no debería levantar procesos")
+    monkeypatch.setattr(parallel, "ProcessPoolExecutor", boom)
+    errors, _, _, _ = _check(_program(4), 4)
+    assert errors
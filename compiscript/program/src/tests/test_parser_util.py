@@ -0,0 +1,35 @@
+# program/tests/test_parser_util.py
+import os
+import pytest
+from src.frontend.parser_util import parse_code
+
+SAMPLES = os.path.join(os.path.dirname(__file__), "..", "..", "samples")
+
+def _tree_str(code, mode):
+    parser, tree = parse_code(code, mode)
+    return parser, tree.toStringTree(recog=parser)
+
+@pytest.mark.parametrize("name", sorted(f for f in os.listdir(SAMPLES) if f.endswith(".cps")))
+def test_two_stage_matches_ll_on_samples(name):
+    code = open(os.path.join(SAMPLES, name), encoding="utf-8").read()
+    _, ll = _tree_str(code, "ll")
+    _, two = _tree_str(code, "two-stage")
+    assert two == ll
+
+def test_valid_code_uses_sll():
+    parser, _ = parse_code("let x: integer = 1 + 2 * 3;\nfunction f(a: integer): integer { return a; }\n")
+    assert parser.parse_stage == "sll"
+
+def test_property_assignment_goes_straight_to_ll():
+    parser, _ = parse_code("class A { var v: integer; }\nlet a: A = new A();\na.v = 3;\n")
+    assert parser.parse_stage == "ll"
+
+def test_syntax_error_falls_back_to_ll_and_reports(capsys):
+    parser, _ = parse_code("let x: integer = ;\n")
+    assert parser.parse_stage == "ll"
+    assert parser.getNumberOfSyntaxErrors() > 0
+    assert "line 1" in capsys.readouterr().err
+
+def test_unknown_mode_rejected():
+    with pytest.raises(ValueError):
+        parse_code("let x = 1;", "sll-only")
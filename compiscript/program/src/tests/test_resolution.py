@@ -0,0 +1,71 @@
+# program/tests/test_resolution.py
+from src.ast import nodes as A
+from src.frontend.fast_parser import parse_program
+from src.sema.errors import ErrorReporter
+from src.sema.ast_decl_collector import ASTDeclarationCollector
+from src.sema.type_linker import TypeLinker
+from src.sema.ast_typecheck import ASTTypeChecker
+from src.sema.symbols import ParamSymbol
+from cli import build_payload
+
+CODE = """
+let g: integer = 1;
+function outer(p: integer): integer {
+  let a: integer = p;
+  if (a > 0) {
+    let b: integer = a;
+    function inner(): integer { return b + g; }
+  }
+  return a;
+}
+"""
+
+def _check(code: str):
+    rep = ErrorReporter()
+    ast = parse_program(code)
+    dc = ASTDeclarationCollector(rep)
+    dc.visit_program(ast)
+    TypeLinker(rep, dc).link()
+    ASTTypeChecker(rep, dc).visit_program(ast)
+    return dc, rep
+
+def test_every_identifier_use_is_recorded_with_its_address():
+    dc, rep = _check(CODE)
+    assert not rep.has_errors(), rep.summary()
+    table = dc.resolutions
+    uses = {(n.pos, r.name): r for n, r in table.items() if isinstance(n, A.Identifier)}
+    assert len(uses) == 6  # p, a, a, b, g, a
+
+    p = uses[((4, 20), "p")]
+    assert isinstance(p.symbol, ParamSymbol)
+    assert p.scope is dc.function_scopes["::outer"]
+    assert (p.depth, p.slot) == (0, 0)
+
+    # b desde inner: inner → bloque del if
+    b = uses[((7, 40), "b")]
+    assert b.scope.kind == "block" and (b.depth, b.slot) == (1, 0)
+    assert b.function is dc.function_scopes["::outer"]
+
+    g = uses[((7, 44), "g")]
+    assert g.scope is dc.global_scope and g.depth == 3 and g.function is None
+
+def test_capture_from_enclosing_block_and_frame_locals():
+    dc, _ = _check(CODE)
+    outer = dc.function_scopes["::outer"]
+    inner_sym = outer.resolve_local("inner")
+    # 'b' vive en un bloque de outer: también es captura
+    assert inner_sym.captured == {"b"}
+    assert dc.resolutions.frame_locals(outer) == ["a", "b"]
+    assert dc.resolutions.frame_locals(dc.function_scopes["::outer::inner"]) == []
+
+def test_symbols_payload_includes_refs():
+    payload = build_payload("let x: integer = 1;\nprint(x);", symbols=True)
+    refs = payload["symbols"]["refs"]
+    assert refs == [{"name": "x", "line": 2, "column": 6, "kind": "var",
+                     "scope": "::global::", "depth": 0, "slot": 0}]
+
+def test_assignment_to_outer_variable_is_a_capture():
+    dc, rep = _check("function outer(): integer { let x: integer = 1;"
+                     " function inner(): void { x = 5; } inner(); return x; }")
+    assert not rep.has_errors()
+    assert dc.function_scopes["::outer"].resolve_local("inner").captured == {"x"}
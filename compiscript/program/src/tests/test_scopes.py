@@ -82,3 +82,8 @@ def test_scope_stack_push_pop_and_helpers():
     assert isinstance(st.current, ClassScope)
     st.pop()  # class
     assert isinstance(st.current, GlobalScope)
+
+def test_scopes_are_slotted():
+    st = ScopeStack()
+    for sc in (st.global_scope, st.enter_class("A"), st.enter_function("f"), st.enter_block()):
+        assert not hasattr(sc, "__dict__")
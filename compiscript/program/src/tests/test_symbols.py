@@ -1,4 +1,5 @@
 # program/tests/test_symbols.py
+import pytest
 from src.sema.symbols import (
     Symbol,
     VariableSymbol, ConstSymbol, ParamSymbol, FieldSymbol,
@@ -48,3 +49,23 @@ def test_equality_by_dataclass_values():
     v1 = VariableSymbol(name="x", type_ann="integer")
     v2 = VariableSymbol(name="x", type_ann="integer")
     assert v1 == v2  # dataclass equality por campos
+
+def test_symbols_are_slotted_and_captures_lazy():
+    fn = FunctionSymbol(name="f")
+    assert not hasattr(fn, "__dict__")
+    assert fn.captured == set() and fn._captured is None  # sin capturas no hay set
+    fn.capture("a")
+    fn.captured |= {"b"}
+    assert fn.captured == {"a", "b"}
+    assert FunctionSymbol(name="f") == FunctionSymbol(name="f")
+
+def test_captured_is_read_only_with_or_without_captures():
+    fn = FunctionSymbol(name="f")
+    for _ in range(2):
+        view = fn.captured
+        with pytest.raises(AttributeError):
+            view.add("x")               # no se puede escribir por la vista
+        fn.capture("a")
+    assert view == {"a"} and fn.captured == {"a"}
+    fn.captured = set()
+    assert fn.captured == frozenset() and fn._captured is None
@@ -85,3 +85,12 @@ def test_unknown_type_reports_error():
     dc, g, rep = _link(code)
     assert rep.has_errors()
     assert any(e.code == E_UNKNOWN_TYPE for e in rep.errors)
+
+def test_parse_type_str_memoized_but_unknown_reported_each_time():
+    dc, g, rep = _link("class Perro {}\nlet a: Perro[][]; let b: Perro[][]; let c: Gato; let d: Gato[];")
+    assert g.resolve("a").resolved_type is g.resolve("b").resolved_type
+    assert str(g.resolve("a").resolved_type) == "Perro[][]"
+    assert [e.message for e in rep.errors] == ["Tipo desconocido: Gato"] * 2
+    tl = TypeLinker(rep, dc)
+    assert tl._parse_type_str("Gato") is g.resolve("c").resolved_type  # desde dc.type_cache
+    assert len(rep.errors) == 3 and set(dc.type_cache) >= {"Perro[][]", "Gato", "Gato[]"}
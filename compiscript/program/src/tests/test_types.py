@@ -4,10 +4,11 @@ from src.sema.types import (
     BOOLEAN, INTEGER, FLOAT, STRING, NULL, VOID,
     ArrayType, ClassType,
     is_assignable, array_of, index_result,
-    result_add, result_sub, result_mul, result_div, result_mod,
-    result_logical_and, result_logical_or, result_logical_not,
+    result_add, result_mul, result_div, result_mod,
+    result_logical_and, result_logical_not,
     result_relational, result_equality,
-    function_type, call_result, SemanticTypeError
+    function_type, call_result, SemanticTypeError,
+    binary_result, unary_result
 )
 
 # ---------- Aritmética ----------
@@ -66,6 +67,30 @@ def test_equality_incompatible_raises():
     with pytest.raises(SemanticTypeError):
         result_equality(STRING, INTEGER)
 
+# ---------- Tabla de operadores (sin excepciones) ----------
+def test_binary_result_table_has_fixed_expectations():
+    A = ClassType("A")
+    cases = [
+        ("+", INTEGER, INTEGER, INTEGER), ("+", INTEGER, FLOAT, FLOAT), ("+", FLOAT, INTEGER, FLOAT),
+        ("+", STRING, STRING, STRING), ("+", INTEGER, STRING, None), ("+", STRING, INTEGER, None),
+        ("-", STRING, STRING, None), ("%", FLOAT, FLOAT, FLOAT), ("*", BOOLEAN, INTEGER, None),
+        ("<", INTEGER, FLOAT, BOOLEAN), ("<", STRING, STRING, None),
+        ("==", BOOLEAN, BOOLEAN, BOOLEAN), ("==", STRING, STRING, BOOLEAN), ("!=", A, A, BOOLEAN),
+        ("==", INTEGER, FLOAT, BOOLEAN), ("==", STRING, INTEGER, None), ("==", A, ClassType("B"), None),
+        ("&&", BOOLEAN, BOOLEAN, BOOLEAN), ("||", BOOLEAN, INTEGER, None),
+        ("+", None, INTEGER, None), ("==", None, INTEGER, None),
+    ]
+    for op, a, b, expected in cases:
+        assert binary_result(op, a, b) is expected, (op, a, b)
+
+def test_unary_result_returns_none_instead_of_raising():
+    assert unary_result("!", BOOLEAN) is BOOLEAN
+    assert unary_result("!", INTEGER) is None
+    assert unary_result("-", FLOAT) is FLOAT
+    assert unary_result("-", STRING) is None
+    with pytest.raises(SemanticTypeError):
+        result_logical_not(INTEGER)
+
 # ---------- Asignación ----------
 def test_assign_same_type_ok():
     assert is_assignable(STRING, STRING)
@@ -120,3 +145,25 @@ def test_function_call_type_mismatch():
     fn = function_type([STRING], VOID)
     with pytest.raises(SemanticTypeError):
         call_result(fn, [INTEGER])
+
+# ---------- Interning ----------
+def test_types_are_interned_and_compared_by_identity():
+    import copy, pickle
+    assert ClassType("A") is ClassType(name="A")
+    assert array_of(INTEGER, 2) is ArrayType("array", INTEGER, 2)
+    assert index_result(array_of(INTEGER, 2), INTEGER) is array_of(INTEGER)
+    assert function_type([INTEGER], VOID) is function_type([INTEGER], VOID)
+    assert ClassType("A") is not ClassType("B") and ClassType("A") != ClassType("B")
+    t = array_of(ClassType("A"))
+    assert copy.deepcopy(t) is t and pickle.loads(pickle.dumps(t)) is t
+    assert {array_of(ClassType("A")): 1}[t] == 1
+
+def test_interned_types_are_released_when_unused():
+    import gc, weakref
+    t = array_of(ClassType("SoloEnEsteTest"), 3)
+    ref = weakref.ref(t)
+    del t
+    gc.collect()
+    # la tabla no mantiene vivo el tipo: ya no lo usa nadie
+    assert ref() is None
+    assert ClassType("SoloEnEsteTest") is ClassType("SoloEnEsteTest")
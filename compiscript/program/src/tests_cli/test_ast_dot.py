@@ -0,0 +1,53 @@
+import cli
+from src.frontend.parser_util import parse_code
+from src.ast.builder_visitor import ASTBuilder
+from src.ast.dot_export import ASTDotExporter
+
+OK_SRC = "let a: integer = 1;\nfunction f(x: integer): integer { return x + a; }\n"
+BAD_SRC = "let a: integer = \"x\";\n"
+
+
+def _standalone_dot(src):
+    _, tree = parse_code(src)
+    return ASTDotExporter().to_dot(ASTBuilder().visit(tree))
+
+
+def test_ast_dot_matches_standalone_export_and_reuses_ast(monkeypatch):
+    built = []
+    orig = ASTBuilder.visitProgram
+    monkeypatch.setattr(ASTBuilder, "visitProgram", lambda self, ctx: built.append(ctx) or orig(self, ctx))
+    payload = cli.build_payload(OK_SRC, emit_ir=True, emit_ast_dot=True)
+    assert len(built) == 1  # un solo AST para DOT + IR
+    monkeypatch.undo()
+    assert payload["ok"] and "ir" in payload
+    assert payload["ast_dot"] == _standalone_dot(OK_SRC)
+
+
+def test_ast_dot_emitted_even_with_semantic_errors():
+    payload = cli.build_payload(BAD_SRC, emit_ir=True, emit_ast_dot=True)
+    assert not payload["ok"] and "ir" not in payload
+    assert payload["ast_dot"].startswith("digraph")
+    assert "ast_dot" not in cli.build_payload(BAD_SRC)
+
+
+def test_ast_dot_served_from_cache(tmp_path):
+    cache = cli.ResultCache(str(tmp_path))
+    cli.build_payload(OK_SRC, emit_ir=True, cache=cache)
+    first = cli.build_payload(OK_SRC, emit_ir=True, emit_ast_dot=True, cache=cache)
+    assert cache.misses == 2  # la entrada sin DOT no alcanza
+    assert cli.build_payload(OK_SRC, emit_ir=True, emit_ast_dot=True, cache=cache) == first
+    assert cache.hits == 1
+
+
+def test_fast_frontend_same_payload():
+    for src in (OK_SRC, BAD_SRC, "class A { var v: integer; }\nlet a: A = new A();\na.v = 3;\n"):
+        ref = cli.build_payload(src, symbols=True, emit_ir=True, emit_ast_dot=True)
+        assert cli.build_payload(src, symbols=True, emit_ir=True, emit_ast_dot=True, frontend="fast") == ref
+
+
+def test_fast_frontend_falls_back_to_antlr():
+    stats = cli.CompileStats()
+    src = "let a: integer = 1;\na.b = a.c = 1;\n"
+    payload = cli.build_payload(src, emit_ast_dot=True, frontend="fast", stats=stats)
+    assert stats.counters["fast_fallback"] == 1
+    assert payload["ast_dot"] == _standalone_dot(src)
@@ -0,0 +1,65 @@
+import io
+import json
+
+import cli
+
+OK_SRC = "let a: integer = 1;\nfunction f(x: integer): integer { return x + a; }\n"
+BAD_SRC = "let a: integer = \"x\";\n"
+
+
+def _write_corpus(tmp_path):
+    (tmp_path / "sub").mkdir()
+    paths = []
+    for name, src in [("a.cps", OK_SRC), ("b.cps", BAD_SRC), ("sub/c.cps", OK_SRC)]:
+        p = tmp_path / name
+        p.write_text(src, encoding="utf-8")
+        paths.append(str(p))
+    (tmp_path / "notes.txt").write_text("no es cps", encoding="utf-8")
+    return paths
+
+
+def test_expand_batch_spec_dir_glob_and_listfile(tmp_path):
+    paths = _write_corpus(tmp_path)
+    assert cli.expand_batch_spec(str(tmp_path)) == sorted(paths)
+    assert cli.expand_batch_spec(str(tmp_path / "*.cps")) == sorted(paths[:2])
+
+    lst = tmp_path / "files.txt"
+    lst.write_text(f"# corpus\n{paths[2]}\n\n{paths[0]}\n", encoding="utf-8")
+    assert cli.expand_batch_spec(f"@{lst}") == [paths[2], paths[0]]
+
+
+def test_run_batch_streams_one_result_per_file_and_summary(tmp_path):
+    paths = _write_corpus(tmp_path) + [str(tmp_path / "missing.cps")]
+    out = io.StringIO()
+    rc = cli.run_batch(paths, jobs=2, emit_ir=True, out=out)
+    lines = [json.loads(ln) for ln in out.getvalue().splitlines()]
+
+    assert rc == 1
+    results, summary = lines[:-1], lines[-1]["summary"]
+    assert [r["file"] for r in results] == paths
+    assert [r["ok"] for r in results] == [True, False, True, False]
+    assert "ir" in results[0] and "ir" not in results[1]
+    assert results[1]["errors"][0]["code"] == "E200"
+    assert results[3]["errors"][0]["code"] == "IO"
+    assert {"parse", "sema", "ir", "total"} <= set(results[0]["timings"])
+    assert summary["files"] == 4 and summary["ok"] == 2 and summary["failed"] == 2
+
+
+def test_batch_matches_single_file_payload(tmp_path):
+    p = tmp_path / "a.cps"
+    p.write_text(OK_SRC, encoding="utf-8")
+    res = cli.compile_file(str(p), symbols=True, emit_ir=True)
+    res.pop("file"); res.pop("timings")
+    assert res == cli.build_payload(OK_SRC, symbols=True, emit_ir=True)
+
+
+def test_run_batch_honors_max_errors_parse_mode_and_sema_jobs(tmp_path):
+    p = tmp_path / "many.cps"
+    p.write_text("".join(f"let v{i}: integer = \"x\";\n" for i in range(5)), encoding="utf-8")
+    out = io.StringIO()
+    cli.run_batch([str(p)], jobs=2, symbols=True, out=out, max_errors=2, parse_mode="ll", sema_jobs=2)
+    res = json.loads(out.getvalue().splitlines()[0])
+    assert res["truncated"] is True and len(res["errors"]) == 2
+    res.pop("file"); res.pop("timings")
+    assert res == cli.build_payload(p.read_text(encoding="utf-8"), symbols=True, max_errors=2,
+                                parse_mode="ll", sema_jobs=2)
@@ -0,0 +1,89 @@
+import os
+
+import cli
+from src.tools.cache import ResultCache
+
+OK_SRC = "let a: integer = 1;\nfunction f(x: integer): integer { return x + a; }\n"
+BAD_SRC = "let a: integer = \"x\";\n"
+
+
+def test_cache_hit_skips_pipeline_and_matches_uncached(tmp_path, monkeypatch):
+    cache = ResultCache(str(tmp_path))
+    first = cli.build_payload(OK_SRC, symbols=True, emit_ir=True, cache=cache)
+    assert first == cli.build_payload(OK_SRC, symbols=True, emit_ir=True)
+
+    def _boom(*a, **k):
+        raise AssertionError("no debería re-analizar en un hit")
+    monkeypatch.setattr(cli, "analyze_source", _boom)
+    timings = {}
+    again = cli.build_payload(OK_SRC, symbols=True, emit_ir=True, cache=cache, timings=timings)
+    assert again == first
+    assert "cache" in timings and cache.hits == 1
+    # un hit también sirve pedidos con menos campos
+    assert cli.build_payload(OK_SRC, cache=cache) == {"ok": True, "errors": [], "symbols": None}
+
+
+def test_cache_misses_on_new_source_or_missing_ir(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    cli.build_payload(OK_SRC, cache=cache)
+    assert cache.misses == 1
+    # la entrada sin IR no sirve para --emit-ir
+    res = cli.build_payload(OK_SRC, emit_ir=True, cache=cache)
+    assert "ir" in res and cache.misses == 2
+    bad = cli.build_payload(BAD_SRC, emit_ir=True, cache=cache)
+    assert not bad["ok"] and "ir" not in bad
+    assert cli.build_payload(BAD_SRC, emit_ir=True, cache=cache) == bad
+    assert cache.misses == 3 and cache.hits == 1
+
+
+def test_no_fold_ir_is_cached_separately(tmp_path):
+    src = "function f(x: integer): integer { return x + 2 * 3; }\n"
+    cache = ResultCache(str(tmp_path))
+    folded = cli.build_payload(src, emit_ir=True, cache=cache)
+    plain = cli.build_payload(src, emit_ir=True, cache=cache, fold=False)
+    assert "t0 = x + 6" in folded["ir"]
+    assert "t0 = 2 * 3" in plain["ir"] and cache.misses == 2
+    assert cli.build_payload(src, emit_ir=True, cache=cache, fold=False) == plain
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    cache = ResultCache(str(tmp_path), max_bytes=10**9)
+    keys = [cache.key(f"src {i}") for i in range(3)]
+    for i, k in enumerate(keys):
+        cache.put(k, {"ok": True, "pad": "x" * 1000})
+        os.utime(cache._path(k), (1000 + i, 1000 + i))
+    cache.get(keys[0])  # refresca la más vieja
+    cache.max_bytes = 2500
+    assert cache.evict() == 1
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) is not None and cache.get(keys[2]) is not None
+
+
+def test_optimized_ir_is_cached_separately(tmp_path):
+    src = "const K: integer = 2;\nfunction f(x: integer): integer { if (K > 1) { return x; } return 0; }\n"
+    cache = ResultCache(str(tmp_path))
+    plain = cli.build_payload(src, emit_ir=True, cache=cache)
+    opt = cli.build_payload(src, emit_ir=True, cache=cache, optimize=True)
+    assert "return 0" in plain["ir"] and "return 0" not in opt["ir"]
+    assert cache.misses == 2
+    assert cli.build_payload(src, emit_ir=True, cache=cache, optimize=True) == opt
+    assert cli._ir_variant(False, True) == "nofold+O" and cli._ir_variant(True) == ""
+
+
+def test_syntax_errors_are_not_cached(tmp_path, capsys):
+    src = "let x: integer = ;\n"
+    cache = ResultCache(str(tmp_path))
+    for _ in range(2):
+        cli.build_payload(src, cache=cache)
+        assert "mismatched input" in capsys.readouterr().err
+    assert cache.hits == 0 and cache.misses == 2
+
+
+def test_overwriting_an_entry_does_not_count_it_twice(tmp_path):
+    cache = ResultCache(str(tmp_path), max_bytes=10**9)
+    k = cache.key("src")
+    cache.put(k, {"ok": True})      # primera escritura: recorre el disco
+    for _ in range(5):
+        cache.put(k, {"ok": True, "pad": "x" * 1000})
+    assert cache._approx_bytes == os.path.getsize(cache._path(k))
+    assert cache.get(k) is not None
@@ -0,0 +1,49 @@
+import os
+
+from src.tools.importtime import import_profile, PROGRAM_DIR
+
+SAMPLE = os.path.join(PROGRAM_DIR, "samples", "ok_all.cps")
+ANTLR = ("antlr4", "CompiscriptLexer", "CompiscriptParser")
+IR_BACKEND = ("src.ir.adapter", "src.ir.lower_from_ast", "src.ir.pretty")
+
+# Presupuesto relativo (independiente de la máquina): importar cli debe costar
+# menos de esta fracción de lo que cuesta cargar todo el pipeline.
+COLD_START_BUDGET = 0.5
+
+
+def test_import_cli_loads_no_pipeline_modules():
+    prof = import_profile(["-c", "import cli"])
+    loaded = set(prof)
+    assert not loaded & set(ANTLR + IR_BACKEND)
+    assert not {m for m in loaded if m.startswith(("src.sema", "concurrent.futures"))}
+
+
+def test_import_cli_within_cold_start_budget():
+    light = import_profile(["-c", "import cli"])["<total>"]
+    full = import_profile([
+        "-c",
+        "import cli, src.frontend.parser_util, src.sema.ast_typecheck, "
+        "src.sema.ast_decl_collector, src.sema.type_linker, src.ast.builder_visitor, "
+        "src.ast.dot_export, src.ir.lower_from_ast, src.ir.adapter, src.ir.pretty, concurrent.futures",
+    ])["<total>"]
+    assert light < COLD_START_BUDGET * full, (light, full)
+
+
+def test_diagnostics_only_skip_ir_backend():
+    prof = import_profile(["cli.py", "--json", "--no-cache", SAMPLE])
+    assert "src.sema.ast_typecheck" in prof and "CompiscriptParser" in prof
+    assert not set(prof) & set(IR_BACKEND)
+    # sin errores de sintaxis la semántica corre sobre el AST: los visitors del parse tree no se cargan
+    assert "src.sema.typecheck_visitor" not in prof
+
+
+def test_fast_frontend_diagnostics_skip_antlr():
+    prof = import_profile(["cli.py", "--json", "--no-cache", "--frontend", "fast", SAMPLE])
+    assert "src.sema.ast_typecheck" in prof
+    assert not set(prof) & set(ANTLR + IR_BACKEND)
+
+
+def test_cache_hit_does_not_load_antlr(tmp_path):
+    args = ["cli.py", "--json", "--emit-ir", "--cache-dir", str(tmp_path), SAMPLE]
+    assert "antlr4" in import_profile(args)
+    assert not set(import_profile(args)) & set(ANTLR + IR_BACKEND)
@@ -0,0 +1,72 @@
+import io
+import json
+
+import cli
+
+
+def _serve(*requests):
+    inp = io.StringIO("".join(json.dumps(r) + "\n" for r in requests))
+    out = io.StringIO()
+    assert cli.serve(inp, out) == 0
+    return [json.loads(ln) for ln in out.getvalue().splitlines()]
+
+
+def test_serve_answers_each_request_in_order():
+    resps = _serve(
+        {"id": 1, "cmd": "analyze", "source": "let a: integer = 1;"},
+        {"id": 2, "cmd": "symbols", "source": "let a: integer = 1;"},
+        {"id": 3, "cmd": "emit-ir", "source": "let a: integer = 1;"},
+    )
+    assert [r["id"] for r in resps] == [1, 2, 3]
+    assert all(r["ok"] for r in resps)
+    assert resps[0]["symbols"] is None and "ir" not in resps[0]
+    assert resps[1]["symbols"]["globals"][0]["name"] == "a"
+    assert "a = 1" in resps[2]["ir"]
+
+
+def test_serve_reports_semantic_errors_like_json_mode():
+    src = "let a: integer = \"x\";"
+    (resp,) = _serve({"id": 7, "source": src})
+    assert resp["id"] == 7
+    assert resp["ok"] is False
+    assert resp == {"id": 7, **cli.build_payload(src)}
+
+
+def test_serve_survives_bad_requests_and_stops_on_shutdown():
+    inp = io.StringIO(
+        "no es json\n"
+        + json.dumps({"id": 1, "cmd": "nope"}) + "\n"
+        + json.dumps({"id": 2, "file": "/no/existe.cps"}) + "\n"
+        + json.dumps({"id": 3, "cmd": "shutdown"}) + "\n"
+        + json.dumps({"id": 4, "cmd": "ping"}) + "\n"
+    )
+    out = io.StringIO()
+    cli.serve(inp, out)
+    resps = [json.loads(ln) for ln in out.getvalue().splitlines()]
+    assert [r["id"] for r in resps] == [None, 1, 2, 3]
+    assert [r["errors"][0]["code"] for r in resps[:3]] == ["REQUEST"] * 3
+    assert resps[3] == {"id": 3, "ok": True}
+
+
+def test_serve_session_reanalyzes_incrementally():
+    v1 = "function f(): integer { return 1; }\nfunction g(): integer { return f(); }\nprint(g());"
+    v2 = "\n" + v1.replace("return 1;", 'return "x";')
+    resps = _serve(
+        {"id": 1, "session": "doc", "source": v1, "symbols": True, "emit_ir": True},
+        {"id": 2, "session": "doc", "source": v2, "symbols": True, "stats": True},
+    )
+    assert resps[0] == {"id": 1, **cli.build_payload(v1, symbols=True, emit_ir=True)}
+    stats = resps[1].pop("stats")
+    assert resps[1] == {"id": 2, **cli.build_payload(v2, symbols=True)}
+    assert stats["counters"]["sema_reused"] == 1  # g no cambió ni cambió la firma de f
+
+
+def test_serve_streams_errors_and_honors_max_errors():
+    src = "let a: integer = \"x\";\nprint(zz);\nprint(qq);\nprint(ww);"
+    resps = _serve({"id": 5, "source": src, "stream": True, "max_errors": 2})
+    events, (final,) = resps[:-1], resps[-1:]
+    assert [ev["event"] for ev in events] == ["error", "error"] and all(ev["id"] == 5 for ev in events)
+    assert [ev["error"] for ev in events] == final["errors"]
+    assert final["truncated"] is True and len(final["errors"]) == 2
+    full = cli.build_payload(src)["errors"]
+    assert final["errors"] == full[:2] and len(full) == 4
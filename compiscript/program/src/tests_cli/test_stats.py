@@ -0,0 +1,64 @@
+import cli
+from src.tools.stats import CompileStats, count_ast_nodes
+from src.ast import nodes as A
+
+OK_SRC = "let a: integer = 1;\nfunction f(x: integer): integer { if (x > a) { return x; } return a; }\n"
+BAD_SRC = "let a: integer = \"x\";\n"
+
+
+def test_stats_cover_every_phase_and_counter():
+    st = CompileStats(trace_memory=True)
+    payload = cli.build_payload(OK_SRC, emit_ir=True, stats=st)
+    st.close()
+    stats = payload["stats"]
+    assert list(stats["phases"]) == ["lex", "parse", "ast", "decl", "link", "typecheck", "lower", "emit", "pretty"]
+    assert all("ms" in r and "peak_kb" in r for r in stats["phases"].values())
+    c = stats["counters"]
+    for k in ("tokens", "parse_tree_nodes", "scopes", "symbols", "ast_nodes", "temps", "labels", "ir_instrs"):
+        assert c[k] > 0, k
+    assert c["ir_instrs"] == sum(1 for ln in payload["ir"].splitlines() if not ln.startswith("function"))
+
+
+def test_stats_count_type_memo_hits():
+    # f(1), f(2), f(3): la firma se arma una vez y el tipo de la llamada f(integer) también
+    src = "function f(x: integer): integer { return x; }\nlet a: integer = f(1) + f(2) + f(3);\n"
+    c = cli.build_payload(src, stats=CompileStats())["stats"]["counters"]
+    assert c["type_memo_hits"] == 2 + 2
+    assert c["type_memo_misses"] == 1 + 1
+    # mismos argumentos en otra posición de la expresión: acierto en el memo de llamadas
+    # (la firma de g se reutiliza 1 vez; g(integer) y g(float) son llamadas distintas)
+    src = "function g(x: float): float { return x; }\nlet b: float = g(1) + g(1.5) + g(2);\n"
+    c = cli.build_payload(src, stats=CompileStats())["stats"]["counters"]
+    assert c["type_memo_hits"] == 2 + 1
+    assert c["type_memo_misses"] == 1 + 2
+
+
+def test_stats_without_ir_and_without_memory():
+    payload = cli.build_payload(BAD_SRC, emit_ir=True, stats=CompileStats())
+    phases = payload["stats"]["phases"]
+    assert "emit" not in phases and "peak_kb" not in phases["parse"]
+    assert "stats" not in cli.build_payload(BAD_SRC)
+
+
+def test_stats_on_cache_hit_skip_the_pipeline(tmp_path):
+    cache = cli.ResultCache(str(tmp_path))
+    cli.build_payload(OK_SRC, cache=cache)
+    payload = cli.build_payload(OK_SRC, cache=cache, stats=CompileStats())
+    assert list(payload["stats"]["phases"]) == ["cache"]
+    assert payload["stats"]["counters"] == {"cache_hit": 1}
+
+
+def test_count_ast_nodes_follows_lists_and_fields():
+    prog = A.Program(statements=[A.VarDecl(name="a", init=A.IntLiteral(value=1)), A.Block(statements=[])])
+    assert count_ast_nodes(prog) == 4
+
+
+def test_stats_report_sccp_removals():
+    src = "const LIMIT: integer = 10;\nif (LIMIT > 5) { print(\"big\"); } else { print(\"small\"); }\n"
+    payload = cli.build_payload(src, emit_ir=True, stats=CompileStats(), optimize=True)
+    stats = payload["stats"]
+    assert list(stats["phases"])[-2:] == ["opt", "pretty"]
+    c = stats["counters"]
+    assert c["opt_instrs_removed"] > 0 and c["opt_blocks_removed"] > 0
+    assert "small" not in payload["ir"] and "if " not in payload["ir"]
+    assert "opt_instrs_removed" not in cli.build_payload(src, emit_ir=True, stats=CompileStats())["stats"]["counters"]
@@ -0,0 +1,83 @@
+from src.ir.model import Program, Function, Label, Name, Const, Assign, Return, LabelInstr, Goto
+from src.ir.pretty import program_to_str
+from src.ir.context import IRGenContext
+from src.ir.temps import TempAllocator, LabelAllocator
+from src.ir.gen_stmt import gen_stmt
+
+
+def make_fn(stmt, params=()):
+    prog = Program()
+    ctx = IRGenContext(program=prog, temp_alloc=TempAllocator(), label_alloc=LabelAllocator())
+    fn = ctx.begin_function("f", list(params))
+    gen_stmt(stmt, ctx)
+    return fn, prog
+
+
+def labels(cfg, idxs):
+    return [cfg.blocks[i].label.name if i < len(cfg) else "exit" for i in idxs]
+
+
+def test_if_else_splits_into_blocks():
+    fn, prog = make_fn(('if', ('name', 'c'),
+                        ('block', [('return', ('name', 'a'))]),
+                        ('block', [('return', ('name', 'b'))])), ["c", "a", "b"])
+    assert len(fn.blocks) == 1            # el generador emite todo en línea
+    cfg = fn.cfg()
+    # L0 | goto L2_else | L1_then: return a | goto (muerto) | L2_else: return b | goto | L3_end
+    assert [bb.implicit for bb in cfg.blocks] == [False, True, False, True, False, True, False]
+    assert labels(cfg, cfg.succs[0]) == ["L1_then", "L0.1"]
+    assert labels(cfg, cfg.succs[2]) == ["exit"]
+    assert labels(cfg, cfg.preds[cfg.index["L3_end"]]) == ["L1_then.2", "L2_else.3"]
+    assert labels(cfg, cfg.rpo()) == ["L0", "L0.1", "L2_else", "L1_then", "exit"]
+    assert cfg.reachable() == {0, 1, 2, 4, cfg.exit}
+
+    before = program_to_str(prog)
+    cfg.commit()
+    assert len(fn.blocks) == 7
+    assert program_to_str(prog) == before  # los bloques implícitos no imprimen etiqueta
+
+
+def test_while_loop_back_edge():
+    fn, _ = make_fn(('while', ('name', 'c'), ('block', [('assign', ('name', 'x'), ('const', 1))])), ["c"])
+    cfg = fn.cfg()
+    head = cfg.index["L1_while_head"]
+    body = cfg.index["L2_while_body"]
+    assert body in cfg.preds[head]
+    assert labels(cfg, cfg.succs[head]) == ["L2_while_body", "L1_while_head.1"]
+    rpo = cfg.rpo()
+    assert rpo[0] == cfg.entry and rpo.index(head) < rpo.index(body) and cfg.exit in rpo
+
+
+def test_cfg_cached_until_mutation():
+    fn = Function(name="g")
+    bb = fn.new_block(Label("L0"))
+    bb.add(LabelInstr(Label("L0")))
+    bb.add(Assign(Name("x"), Const(1)))
+    cfg = fn.cfg()
+    assert fn.cfg() is cfg
+    assert cfg.succs[0] == [cfg.exit]     # cae al final de la función
+
+    bb.add(Goto(Label("L1")))
+    bb2 = fn.new_block(Label("L1"))
+    bb2.add(LabelInstr(Label("L1")))
+    bb2.add(Return(Name("x")))
+    cfg2 = fn.cfg()
+    assert cfg2 is not cfg
+    assert cfg2.blocks[0] is bb and cfg2.succs[0] == [1]   # sin cortes: se reutiliza el bloque
+
+    bb2.instrs.pop()
+    assert fn.cfg() is cfg2               # tocar instrs a mano no avisa...
+    fn.invalidate()
+    assert fn.cfg() is not cfg2
+
+
+def test_unknown_label_raises():
+    fn = Function(name="h")
+    bb = fn.new_block(Label("L0"))
+    bb.add(Goto(Label("nope")))
+    try:
+        fn.cfg()
+    except ValueError as e:
+        assert "nope" in str(e)
+    else:
+        raise AssertionError("debía fallar")
@@ -0,0 +1,64 @@
+from src.ir.model import Program, Return, Name, Const
+from src.ir.pretty import program_to_str
+from src.ir.context import IRGenContext
+from src.ir.temps import TempAllocator, LabelAllocator
+from src.ir.gen_expr import gen_expr
+from src.ir.fold import fold_binary, fold_unary
+
+
+def make_ctx(fold=True):
+    prog = Program()
+    ctx = IRGenContext(program=prog, temp_alloc=TempAllocator(), label_alloc=LabelAllocator(), fold=fold)
+    ctx.begin_function("f", ["x"])
+    return ctx, prog
+
+
+def test_constant_subexpressions_fold_while_emitting():
+    # 2 * 3 + x  →  t0 = 6 + x (un temporal en vez de dos)
+    ctx, prog = make_ctx()
+    t = gen_expr(('bin', '+', ('bin', '*', ('const', 2), ('const', 3)), ('name', 'x')), ctx)
+    ctx.emit(Return(t))
+    assert program_to_str(prog) == "function f(x):\nL0:\n  t0 = 6 + x\n  return t0"
+    assert ctx.folded == 1 and ctx.temp_alloc.allocated == 1
+
+
+def test_fold_off_keeps_literal_tac():
+    ctx, prog = make_ctx(fold=False)
+    gen_expr(('un', '!', ('const', True)), ctx)
+    assert "t0 = ! true" in program_to_str(prog) and ctx.folded == 0
+
+
+def test_typed_semantics():
+    c = lambda v: Const(v)
+    assert fold_binary("/", c(7), c(2)) == Const(3)
+    assert fold_binary("/", c(-7), c(2)) == Const(-3)        # trunca hacia cero
+    assert fold_binary("%", c(-7), c(2)) == Const(-1)        # signo del dividendo
+    assert fold_binary("/", c(7.0), c(2)) == Const(3.5)
+    assert fold_binary("+", c(1), c(2.5)) == Const(3.5)
+    assert fold_binary("+", c("a"), c("b")) == Const("ab")
+    assert fold_binary("<", c(1), c(1.5)) == Const(True)
+    assert fold_binary("==", c(None), c(None)) == Const(True)
+    assert fold_binary("&&", c(True), c(False)) == Const(False)
+    assert fold_unary("!", c(True)) == Const(False)
+    assert fold_unary("-", c(2.5)) == Const(-2.5)
+    # inválidas o que dependen de la ejecución: no se pliegan
+    assert fold_binary("+", c(1), c("a")) is None
+    assert fold_binary("==", c(True), c(1)) is None           # boolean vs integer
+    assert fold_binary("/", c(1), c(0)) is None
+    assert fold_binary("*", c(1 << 62), c(4)) is None          # se sale de 64 bits
+    assert fold_unary("!", c(1)) is None
+
+
+def test_algebraic_identities():
+    x, xi = Name("x"), Name("x", "integer")
+    assert fold_binary("+", x, Const(0)) is x
+    assert fold_binary("+", Const(0), x) is x
+    assert fold_binary("-", x, Const(0)) is x
+    assert fold_binary("*", Const(1), x) is x
+    assert fold_binary("/", x, Const(1)) is x
+    # x * 0 solo con x integer (con float daría 0.0 o NaN)
+    assert fold_binary("*", x, Const(0)) is None
+    assert fold_binary("*", xi, Const(0)) == Const(0)
+    assert fold_binary("&&", x, Const(True)) is x
+    assert fold_binary("||", x, Const(True)) == Const(True)
+    assert fold_binary("-", Const(0), x) is None
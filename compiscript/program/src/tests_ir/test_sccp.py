@@ -0,0 +1,113 @@
+from src.ir.model import IfGoto, Goto, Call
+from src.ir.pretty import function_to_str
+from src.ir.adapter import IRAdapter
+from src.ir.sccp import sccp
+from src.tests_ir.test_cfg import make_fn
+from src.tests_ir.test_ssa import run
+
+
+def instrs(fn):
+    return [ins for bb in fn.blocks for ins in bb.instrs]
+
+
+def test_constant_condition_prunes_else_branch():
+    # LIMIT = 10; if (5 < LIMIT) { r = LIMIT + n; } else { r = 0; } return r
+    fn = make_fn(('block', [
+        ('assign', ('name', 'LIMIT'), ('const', 10)),
+        ('if', ('bin', '<', ('const', 5), ('name', 'LIMIT')),
+         ('block', [('assign', ('name', 'r'), ('bin', '+', ('name', 'LIMIT'), ('name', 'n')))]),
+         ('block', [('assign', ('name', 'r'), ('const', 0))])),
+        ('return', ('name', 'r')),
+    ]), ["n"])[0]
+    expected = {n: run(fn, n=n) for n in range(3)}
+    n_instrs, n_blocks = sccp(fn)
+    text = function_to_str(fn)
+    assert not any(isinstance(ins, IfGoto) for ins in instrs(fn))
+    assert "r = 0" not in text and "L2_else" not in text
+    assert "t1 = 10 + n" in text
+    assert n_instrs > 0 and n_blocks > 0
+    assert {n: run(fn, n=n) for n in range(3)} == expected
+
+
+def test_loop_meet_drops_changing_values():
+    # i = 0; k = 3; while (i < n) { i = i + k; } return i + k
+    fn = make_fn(('block', [
+        ('assign', ('name', 'i'), ('const', 0)),
+        ('assign', ('name', 'k'), ('const', 3)),
+        ('while', ('bin', '<', ('name', 'i'), ('name', 'n')),
+         ('block', [('assign', ('name', 'i'), ('bin', '+', ('name', 'i'), ('name', 'k')))])),
+        ('return', ('bin', '+', ('name', 'i'), ('name', 'k'))),
+    ]), ["n"])[0]
+    expected = {n: run(fn, n=n) for n in range(5)}
+    sccp(fn)
+    text = function_to_str(fn)
+    # k no cambia en el bucle; i sí (la arista de vuelta la baja a "no constante")
+    assert "i + 3" in text and "i < n" in text
+    assert {n: run(fn, n=n) for n in range(5)} == expected
+
+
+def test_while_false_body_is_removed():
+    fn = make_fn(('block', [
+        ('assign', ('name', 'x'), ('const', 1)),
+        ('while', ('const', False), ('block', [('assign', ('name', 'x'), ('const', 2))])),
+        ('return', ('name', 'x')),
+    ]), [])[0]
+    assert sccp(fn) == (8, 4)
+    assert function_to_str(fn).splitlines() == ["function f():", "L0:", "  x = 1", "  return 1"]
+
+
+def test_calls_forget_globals_but_not_locals_or_consts():
+    body = ('block', [
+        ('assign', ('name', 'g'), ('const', 1)),
+        ('assign', ('name', 'K'), ('const', 2)),
+        ('assign', ('name', 'x'), ('const', 3)),
+        ('expr', ('call', 'bump', [])),
+        ('return', ('bin', '+', ('bin', '+', ('name', 'g'), ('name', 'K')), ('name', 'x'))),
+    ])
+    fn = make_fn(body, [])[0]
+    sccp(fn, locals=["x"], consts=["K"])
+    text = function_to_str(fn)
+    # bump() puede cambiar g; K es const y x es local
+    assert "g + 2" in text and "+ 3" in text
+    assert any(isinstance(ins, Call) for ins in instrs(fn))
+
+
+def test_adapter_optimize_reports_totals():
+    body = ('block', [
+        ('if', ('const', True), ('block', [('return', ('const', 1))]),
+         ('block', [('return', ('const', 2))])),
+    ])
+    ad = IRAdapter.new()
+    ad.emit_function("f", [], body)
+    ad.emit_function("g", [], body)
+    n_instrs, n_blocks = ad.optimize()
+    for fn in ad.program.functions:
+        assert [type(ins) for ins in instrs(fn)][-1:] != [Goto]
+        assert "return 2" not in function_to_str(fn)
+    assert n_instrs > 0 and n_blocks > 0
+    assert n_instrs % 2 == 0 and n_blocks % 2 == 0      # lo mismo en las dos funciones
+
+
+def optimized_ir(src):
+    import cli
+    payload = cli.build_payload(src, emit_ir=True, optimize=True)
+    assert payload["ok"], payload["errors"]
+    return payload["ir"]
+
+
+def test_local_written_by_nested_function_survives_no_call():
+    ir = optimized_ir(
+        "function outer(): integer { let x: integer = 1;"
+        " function inner(): void { x = 5; } inner();"
+        " if (x == 1) { return 10; } return x; }\n"
+        "print(outer());\n")
+    # inner() puede cambiar x: la condición se evalúa en ejecución
+    assert "x == 1" in ir and "return x" in ir
+
+
+def test_const_read_before_initializer_is_not_seeded():
+    ir = optimized_ir(
+        "function f(): integer { return LIMIT; }\nprint(f());\nconst LIMIT: integer = 10;\n")
+    assert "return LIMIT" in ir
+    ir = optimized_ir("const K: integer = 3;\nfunction g(): integer { return K; }\nprint(g());\n")
+    assert "return 3" in ir
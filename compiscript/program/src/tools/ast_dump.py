@@ -1,10 +1,6 @@
 # src/tools/ast_dump.py
 from __future__ import annotations
 import sys, subprocess
-from antlr4 import FileStream, CommonTokenStream
-from CompiscriptLexer import CompiscriptLexer
-from CompiscriptParser import CompiscriptParser
-from src.ast.builder_visitor import ASTBuilder
 from src.ast.dot_export import ASTDotExporter
 
 def _emit_dot_to_stdout(dot: str) -> None:
@@ -26,24 +22,42 @@ def _emit_png_via_dot(dot: str, png_path: str) -> int:
         sys.stderr.write(proc.stderr.decode("utf-8", errors="replace"))
     return proc.returncode
 
+def _build_ast(text: str, frontend: str):
+    if frontend == "fast":
+        from src.frontend.fast_parser import parse_program
+        from src.frontend.fast_lexer import FastSyntaxError
+        try:
+            return parse_program(text)
+        except FastSyntaxError:
+            pass  # ANTLR reporta el error de sintaxis
+    from src.frontend.parser_util import parse_code
+    from src.ast.builder_visitor import ASTBuilder
+    _, tree = parse_code(text)
+    return ASTBuilder().visit(tree)
+
 def main(argv):
+    frontend = "antlr"
+    if "--fast" in argv:
+        argv = [a for a in argv if a != "--fast"]
+        frontend = "fast"
     if len(argv) < 2 or argv[1].startswith("-"):
         sys.stderr.write("Uso:\n")
         sys.stderr.write("  python -m src.tools.ast_dump <archivo.cps>\n")
         sys.stderr.write("  python -m src.tools.ast_dump <archivo.cps> --png <salida.png>\n")
+        sys.stderr.write("  (--fast: construye el AST con el parser Pratt en vez de ANTLR)\n")
         sys.exit(1)
 
     path = argv[1]
     out_mode_png = (len(argv) >= 4 and argv[2] == "--png")
     out_png_path = argv[3] if out_mode_png else None
 
-    input_stream = FileStream(path, encoding="utf-8")
-    lexer = CompiscriptLexer(input_stream)
-    tokens = CommonTokenStream(lexer)
-    parser = CompiscriptParser(tokens)
-    tree = parser.program()
+    # DFAs del parser desde la caché en disco (opt-in, antes de importar parser_util)
+    from src.frontend import atn_cache
+    atn_cache.configure()
+
+    with open(path, "r", encoding="utf-8") as fh:
+        ast = _build_ast(fh.read(), frontend)
 
-    ast = ASTBuilder().visit(tree)
     dot = ASTDotExporter().to_dot(ast)
 
     if out_mode_png:
@@ -0,0 +1,72 @@
+# src/tools/bench_dataflow.py
+# Escalado del CFG y de los análisis de flujo de datos (src/ir/dataflow.py) sobre funciones
+# con miles de bloques: un while con un switch de N casos adentro (cadena de IfGoto, un
+# bloque por caso y una arista de vuelta). El tiempo por bloque debería quedar ~constante.
+# Uso (desde program/):  python -m src.tools.bench_dataflow [--cases 500 1000 2000 4000]
+from __future__ import annotations
+import argparse, time
+from typing import Callable, Dict, List
+
+from src.frontend.fast_parser import parse_program
+from src.ir.lower_from_ast import lower_program
+from src.ir.adapter import IRAdapter
+from src.ir.model import Function
+from src.ir import dataflow
+
+def make_program(cases: int) -> str:
+    out = ["function big(n: integer): integer {", "  let acc: integer = 0;", "  let i: integer = 0;",
+           "  while (i < n) {", "    switch (i % " + str(cases) + ") {"]
+    for c in range(cases):
+        out.append(f"      case {c}: {{ let t: integer = acc * {c + 1}; acc = t + i; }}")
+    out += ["      default: { acc = acc - 1; }", "    }", "    i = i + 1;", "  }", "  return acc;", "}"]
+    return "\n".join(out)
+
+def lower(src: str) -> Function:
+    ad = IRAdapter.new()
+    for name, params, body in lower_program(parse_program(src)):
+        ad.emit_function(name, params, body)
+    return next(fn for fn in ad.program.functions if fn.name == "big")
+
+ANALYSES: Dict[str, Callable[[Function], object]] = {
+    "liveness": dataflow.liveness,
+    "reaching": dataflow.reaching_definitions,
+    "avail": dataflow.available_expressions,
+    "dom": dataflow.dominators,
+}
+
+def measure(cases: int, repeat: int = 3) -> Dict[str, float]:
+    """ms (mejor de 'repeat') del CFG y de cada análisis; 'blocks' = bloques del CFG."""
+    fn = lower(make_program(cases))
+    res: Dict[str, float] = {}
+    best = float("inf")
+    for _ in range(repeat):
+        fn.invalidate()
+        t0 = time.perf_counter()
+        cfg = fn.cfg()
+        best = min(best, time.perf_counter() - t0)
+    res["cfg"] = best * 1000.0
+    res["blocks"] = float(len(cfg))
+    for name, run in ANALYSES.items():
+        best = float("inf")
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            run(fn)
+            best = min(best, time.perf_counter() - t0)
+        res[name] = best * 1000.0
+    return res
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Escalado de CFG + dataflow con switches grandes")
+    ap.add_argument("--cases", type=int, nargs="+", default=[500, 1000, 2000, 4000])
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+    cols: List[str] = ["cfg", *ANALYSES]
+    print(f"{'casos':>6} {'bloques':>8} " + " ".join(f"{c:>9}" for c in cols) + "   (ms)  µs/bloque")
+    for n in args.cases:
+        r = measure(n, args.repeat)
+        total = sum(r[c] for c in cols)
+        print(f"{n:6d} {int(r['blocks']):8d} " + " ".join(f"{r[c]:9.1f}" for c in cols)
+              + f"   {total * 1000.0 / r['blocks']:11.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+# src/tools/bench_parse.py
+# Compara los modos de parse_code (two-stage vs ll) sobre samples/ok_all.cps replicado N veces,
+# y el texto → AST completo: ANTLR + ASTBuilder contra el frontend rápido (fast_parser).
+# Uso (desde program/):  python -m src.tools.bench_parse [--scale 20] [--repeat 3] [--file X.cps]
+from __future__ import annotations
+import argparse, os, re, time
+from antlr4.dfa.DFA import DFA
+from antlr4.PredictionContext import PredictionContextCache
+from CompiscriptParser import CompiscriptParser
+from src.frontend.parser_util import parse_code, PARSE_MODES
+from src.frontend.fast_parser import parse_program
+from src.ast.builder_visitor import ASTBuilder
+
+_DEFAULT_FILE = os.path.join(os.path.dirname(__file__), "..", "..", "samples", "ok_all.cps")
+
+def _reset_dfa_cache() -> None:
+    # Los DFAs de predicción son estáticos en la clase: sin esto el segundo modo corre "caliente"
+    atn = CompiscriptParser.atn
+    CompiscriptParser.decisionsToDFA = [DFA(ds, i) for i, ds in enumerate(atn.decisionToState)]
+    CompiscriptParser.sharedContextCache = PredictionContextCache()
+
+def _time_parse(src: str, mode: str) -> tuple:
+    t0 = time.perf_counter()
+    parser, _ = parse_code(src, mode)
+    return (time.perf_counter() - t0) * 1000.0, parser.parse_stage
+
+def bench(src: str, repeat: int) -> None:
+    for mode in PARSE_MODES:
+        _reset_dfa_cache()
+        cold, stage = _time_parse(src, mode)
+        warm = min(_time_parse(src, mode)[0] for _ in range(repeat))
+        print(f"  {mode:<10} stage={stage:<3}  cold={cold:9.1f} ms  warm={warm:9.1f} ms")
+
+def _time_ast(src: str, frontend: str) -> float:
+    t0 = time.perf_counter()
+    if frontend == "fast":
+        parse_program(src)
+    else:
+        _, tree = parse_code(src)
+        ASTBuilder().visit(tree)
+    return (time.perf_counter() - t0) * 1000.0
+
+def bench_ast(src: str, repeat: int) -> None:
+    for frontend in ("antlr", "fast"):
+        _reset_dfa_cache()
+        cold = _time_ast(src, frontend)
+        warm = min(_time_ast(src, frontend) for _ in range(repeat))
+        print(f"  ast/{frontend:<6} {'':<9}  cold={cold:9.1f} ms  warm={warm:9.1f} ms")
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Benchmark de parseo SLL→LL vs LL")
+    ap.add_argument("--file", default=_DEFAULT_FILE, help="Programa base (default: samples/ok_all.cps)")
+    ap.add_argument("--scale", type=int, default=20, help="Veces que se replica el programa")
+    ap.add_argument("--repeat", type=int, default=3, help="Corridas en caliente (se reporta la mínima)")
+    args = ap.parse_args()
+
+    base = open(args.file, "r", encoding="utf-8").read()
+    # Variante sin `obj.p = v;`: esas sentencias fuerzan LL (ver parser_util)
+    no_prop = re.sub(r"\b\w+\.\w+\s*=[^=][^;]*;", "", base)
+    for label, text in (("original", base), ("sin asignación a propiedades", no_prop)):
+        src = text * args.scale
+        print(f"{os.path.basename(args.file)} x{args.scale} ({label}, {len(src)} chars)")
+        bench(src, args.repeat)
+        bench_ast(src, args.repeat)
+
+if __name__ == "__main__":
+    main()
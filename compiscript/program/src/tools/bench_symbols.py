@@ -0,0 +1,86 @@
+# src/tools/bench_symbols.py
+# Memoria de las tablas de símbolos: bytes por símbolo y por scope (objeto + __dict__ si lo
+# tiene + contenedores propios) y lo que retiene la semántica completa según tracemalloc.
+# Uso (desde program/):  python -m src.tools.bench_symbols [--functions 2000]
+from __future__ import annotations
+import argparse, gc, sys, tracemalloc
+from typing import Any, Iterable, List, Tuple
+
+from src.frontend.fast_parser import parse_program
+from src.sema.errors import ErrorReporter
+from src.sema.ast_decl_collector import ASTDeclarationCollector
+from src.sema.type_linker import TypeLinker
+from src.sema.ast_typecheck import ASTTypeChecker
+from src.sema.scopes import Scope
+from src.sema.symbols import Symbol
+
+def make_program(n: int) -> str:
+    out = ["let total: integer = 0;"]
+    for i in range(n):
+        out.append(f"function f{i}(a: integer, b: string): integer {{ let x: integer = a * 2; "
+                   f"let s: string = b + \"!\"; if (x > 0) {{ let y = x; return y; }} return x; }}")
+        if i % 10 == 0:
+            out.append(f"class C{i} {{ let v: integer; let w: string; "
+                       f"function constructor(v: integer) {{ this.v = v; }} "
+                       f"function get(): integer {{ return this.v; }} }}")
+    return "\n".join(out)
+
+def _sizeof(obj: Any) -> int:
+    """Objeto + __dict__ (si hay) + sets/listas/dicts que cuelgan directo de él."""
+    size = sys.getsizeof(obj)
+    d = getattr(obj, "__dict__", None)
+    attrs = d.values() if d is not None else (
+        getattr(obj, s, None) for k in type(obj).__mro__ for s in getattr(k, "__slots__", ()))
+    if d is not None:
+        size += sys.getsizeof(d)
+    for v in attrs:
+        if isinstance(v, (set, frozenset, list, dict)) and v is not obj:
+            size += sys.getsizeof(v)
+    return size
+
+def _scopes(dc, table) -> List[Scope]:
+    seen = {}
+    for sc in [dc.global_scope, *dc.class_scopes.values(), *dc.function_scopes.values()]:
+        seen[id(sc)] = sc
+    for _, res in table.items():
+        seen.setdefault(id(res.scope), res.scope)
+    return list(seen.values())
+
+def _analyze(src: str):
+    rep = ErrorReporter()
+    ast = parse_program(src)
+    dc = ASTDeclarationCollector(rep)
+    dc.visit_program(ast)
+    TypeLinker(rep, dc).link()
+    ASTTypeChecker(rep, dc).visit_program(ast)
+    return ast, dc
+
+def measure(src: str) -> Tuple[int, float, int, float, float]:
+    """(símbolos, bytes/símbolo, scopes, bytes/scope, KB retenidos por AST + semántica)."""
+    gc.collect()
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    ast, dc = _analyze(src)
+    gc.collect()
+    retained = (tracemalloc.get_traced_memory()[0] - base) / 1024.0
+    tracemalloc.stop()
+    scopes = _scopes(dc, dc.resolutions)
+    syms: Iterable[Symbol] = [s for sc in scopes for _, s in sc.items()]
+    syms = list({id(s): s for s in syms}.values())
+    sym_bytes = sum(_sizeof(s) for s in syms) / max(1, len(syms))
+    scope_bytes = sum(_sizeof(sc) for sc in scopes) / max(1, len(scopes))
+    return len(syms), sym_bytes, len(scopes), scope_bytes, retained
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Memoria de símbolos y scopes")
+    ap.add_argument("--functions", type=int, default=2000, help="Funciones del programa sintético")
+    args = ap.parse_args()
+    src = make_program(args.functions)
+    n_syms, sym_b, n_scopes, scope_b, kb = measure(src)
+    print(f"{args.functions} funciones ({len(src)} chars)")
+    print(f"  símbolos: {n_syms:7d}  {sym_b:7.1f} B/símbolo")
+    print(f"  scopes:   {n_scopes:7d}  {scope_b:7.1f} B/scope")
+    print(f"  retenido (AST + semántica, tracemalloc): {kb:9.1f} KB")
+
+if __name__ == "__main__":
+    main()
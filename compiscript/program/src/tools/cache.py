@@ -0,0 +1,150 @@
+# src/tools/cache.py
+# Caché en disco de resultados del compilador, direccionada por contenido.
+#   clave = sha256(huella del compilador + fuente)
+#   huella = hash de los .py del compilador (cli.py + src/, sin tests/tools) y de la gramática
+# Cada entrada es un JSON con el payload de build_payload (errors, symbols, ir, ...).
+# Expulsión LRU por mtime cuando el directorio supera max_bytes.
+from __future__ import annotations
+import hashlib, json, os
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+PROGRAM_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+DEFAULT_CACHE_DIR = os.environ.get("CPS_CACHE_DIR") or os.path.join(PROGRAM_DIR, ".cpscache")
+DEFAULT_MAX_MB = 64
+
+# bump si cambia el formato de las entradas
+_FORMAT = "1"
+
+_fingerprint: Optional[str] = None
+
+def _compiler_files() -> List[str]:
+    files = [os.path.join(PROGRAM_DIR, "cli.py"), os.path.join(PROGRAM_DIR, "Compiscript.g4")]
+    src = os.path.join(PROGRAM_DIR, "src")
+    for root, dirs, names in os.walk(src):
+        dirs[:] = sorted(d for d in dirs if d != "tools" and not d.startswith(("tests", "__")))
+        files.extend(os.path.join(root, n) for n in sorted(names) if n.endswith(".py"))
+    return files
+
+def compiler_fingerprint() -> str:
+    """Hash del código del compilador; cambia con cualquier edición del pipeline o la gramática."""
+    global _fingerprint
+    if _fingerprint is None:
+        h = hashlib.sha256(_FORMAT.encode())
+        for path in _compiler_files():
+            try:
+                with open(path, "rb") as fh:
+                    data = fh.read()
+            except OSError:
+                continue
+            h.update(os.path.relpath(path, PROGRAM_DIR).encode("utf-8") + b"\0")
+            h.update(data)
+        _fingerprint = h.hexdigest()
+    return _fingerprint
+
+class ResultCache:
+    def __init__(self, root: str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_MB * 1024 * 1024):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._approx_bytes: Optional[int] = None  # tamaño estimado; evita recorrer el dir en cada put
+
+    def key(self, source: str, variant: str = "") -> str:
+        """'variant': opciones que cambian el resultado (p. ej. "nofold"); "" = las de siempre."""
+        h = hashlib.sha256(compiler_fingerprint().encode())
+        if variant:
+            h.update(variant.encode("utf-8") + b"\0")
+        h.update(source.encode("utf-8"))
+        return h.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, key[:2], key + ".json")
+
+    def get(self, key: str, need: Iterable[str] = ()) -> Optional[Dict[str, Any]]:
+        """
+        Devuelve la entrada si existe y trae todos los campos de 'need'; si no, None (miss).
+        Un hit refresca el mtime (orden LRU).
+        """
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as fh:
+                entry = json.load(fh)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        if not isinstance(entry, dict) or any(f not in entry for f in need):
+            self.misses += 1
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self.hits += 1
+        return entry
+
+    def put(self, key: str, entry: Dict[str, Any]) -> None:
+        """Escribe la entrada de forma atómica (varios procesos de --batch pueden competir)."""
+        import tempfile
+        path = self._path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as fh:
+                json.dump(entry, fh, ensure_ascii=False)
+            size = os.path.getsize(tmp)
+            try:
+                old = os.path.getsize(path)     # se sobrescribe: ese tamaño ya estaba contado
+            except OSError:
+                old = 0
+            os.replace(tmp, path)
+        except OSError:
+            # la caché es best-effort: si el disco falla seguimos sin ella
+            return
+        if self._approx_bytes is None:
+            self._approx_bytes = sum(sz for _, sz, _ in self._entries())
+        else:
+            self._approx_bytes += size - old
+        if self._approx_bytes > self.max_bytes:
+            self.evict()
+
+    def _entries(self) -> List[Tuple[float, int, str]]:
+        out = []
+        for root, _dirs, names in os.walk(self.root):
+            for n in names:
+                if not n.endswith(".json"):
+                    continue
+                p = os.path.join(root, n)
+                try:
+                    st = os.stat(p)
+                except OSError:
+                    continue
+                out.append((st.st_mtime, st.st_size, p))
+        return out
+
+    def evict(self) -> int:
+        """Borra las entradas menos usadas hasta quedar bajo max_bytes. Devuelve cuántas borró."""
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        self._approx_bytes = total
+        if total <= self.max_bytes:
+            return 0
+        removed = 0
+        for _, size, p in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(p)
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        self._approx_bytes = total
+        return removed
+
+    def clear(self) -> None:
+        for _, _, p in self._entries():
+            try:
+                os.remove(p)
+            except OSError:
+                pass
+        self._approx_bytes = 0
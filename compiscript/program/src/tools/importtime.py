@@ -0,0 +1,55 @@
+# src/tools/importtime.py
+# Perfil de arranque en frío de cli.py con `python -X importtime`.
+# Uso (desde program/):  python -m src.tools.importtime [--top 15] [archivo.cps]
+from __future__ import annotations
+import argparse, os, subprocess, sys, tempfile
+from typing import Dict, List
+
+PROGRAM_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+def import_profile(args: List[str]) -> Dict[str, int]:
+    """
+    Corre `python -X importtime <args>` en program/ y devuelve {módulo: µs acumulados}.
+    La clave "<total>" suma los imports de primer nivel (costo total de imports del proceso).
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        cwd=PROGRAM_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True,
+    )
+    prof: Dict[str, int] = {"<total>": 0}
+    for ln in proc.stderr.splitlines():
+        if not ln.startswith("import time:") or "cumulative" in ln:
+            continue
+        _, cumulative, name = ln[len("import time:"):].split("|")
+        us = int(cumulative)
+        if not name.startswith("  "):
+            prof["<total>"] += us
+        name = name.strip()
+        prof[name] = max(prof.get(name, 0), us)
+    return prof
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Costo de imports de cli.py por escenario")
+    ap.add_argument("file", nargs="?", default=os.path.join(PROGRAM_DIR, "samples", "ok_all.cps"))
+    ap.add_argument("--top", type=int, default=12, help="Módulos más caros a listar por escenario")
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        scenarios = [
+            ("import cli", ["-c", "import cli"]),
+            ("--json (sin IR)", ["cli.py", "--json", "--no-cache", args.file]),
+            ("--json --emit-ir", ["cli.py", "--json", "--emit-ir", "--no-cache", args.file]),
+        ]
+        # primer run llena la caché, el segundo es el hit
+        import_profile(["cli.py", "--json", "--cache-dir", cache_dir, args.file])
+        scenarios.append(("--json (hit de caché)", ["cli.py", "--json", "--cache-dir", cache_dir, args.file]))
+
+        for label, argv in scenarios:
+            prof = import_profile(argv)
+            total = prof.pop("<total>")
+            print(f"{label}: {total / 1000.0:.1f} ms en imports")
+            for name, us in sorted(prof.items(), key=lambda kv: -kv[1])[: args.top]:
+                print(f"  {us / 1000.0:9.1f} ms  {name}")
+
+if __name__ == "__main__":
+    main()
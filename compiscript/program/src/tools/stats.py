@@ -0,0 +1,119 @@
+# src/tools/stats.py
+# Instrumentación del pipeline: tiempo de pared (y opcionalmente pico de memoria con
+# tracemalloc) por fase, más contadores de tamaño (tokens, nodos, símbolos, IR...).
+# Uso:
+#   st = CompileStats(trace_memory=True)
+#   with st.phase("parse"): ...
+#   st.count("tokens", n)
+#   st.to_dict() / st.format()
+from __future__ import annotations
+import contextlib, time
+from typing import Any, Dict, Iterator
+
+# Orden canónico de las fases (las que no corrieron no aparecen; "sema" = incremental)
+PHASES = ("cache", "lex", "parse", "ast", "sema", "decl", "link", "typecheck", "lower", "emit", "opt", "pretty")
+
+class CompileStats:
+    def __init__(self, trace_memory: bool = False) -> None:
+        self.trace_memory = trace_memory
+        self._tm = None
+        self.phases: Dict[str, Dict[str, float]] = {}
+        self.counters: Dict[str, int] = {}
+        self._own_tracing = False
+        if trace_memory:
+            import tracemalloc  # solo si se pide: arrastra pickle y encarece el arranque
+            self._tm = tracemalloc
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._own_tracing = True
+
+    def close(self) -> None:
+        if self._own_tracing:
+            self._tm.stop()
+            self._own_tracing = False
+
+    @contextlib.contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Mide una fase. Si se repite (p. ej. emit por función) se acumula. No anidar."""
+        tm = self._tm
+        if tm is not None:
+            tm.reset_peak()
+            base = tm.get_traced_memory()[0]
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            rec = self.phases.setdefault(name, {"ms": 0.0})
+            rec["ms"] = round(rec["ms"] + (time.perf_counter() - t0) * 1000.0, 3)
+            if tm is not None:
+                peak_kb = round((tm.get_traced_memory()[1] - base) / 1024.0, 1)
+                rec["peak_kb"] = max(rec.get("peak_kb", 0.0), peak_kb)
+
+    def count(self, name: str, n: int = 1) -> None:
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def to_dict(self) -> Dict[str, Any]:
+        order = {p: i for i, p in enumerate(PHASES)}
+        phases = dict(sorted(self.phases.items(), key=lambda kv: order.get(kv[0], len(order))))
+        return {
+            "phases": phases,
+            "total_ms": round(sum(r["ms"] for r in phases.values()), 3),
+            "counters": dict(self.counters),
+        }
+
+    def format(self) -> str:
+        """Tabla legible para el modo humano."""
+        d = self.to_dict()
+        lines = ["--- Stats ---"]
+        for name, rec in d["phases"].items():
+            mem = f"   peak {rec['peak_kb']:>10.1f} KB" if "peak_kb" in rec else ""
+            lines.append(f"  {name:<10} {rec['ms']:>10.3f} ms{mem}")
+        lines.append(f"  {'total':<10} {d['total_ms']:>10.3f} ms")
+        for name, n in d["counters"].items():
+            lines.append(f"  {name:<18} {n}")
+        return "\n".join(lines)
+
+class _NullStats:
+    """Sustituto sin costo cuando no se piden stats (evita ifs en el pipeline)."""
+    trace_memory = False
+
+    def phase(self, name: str):
+        return contextlib.nullcontext()
+
+    def count(self, name: str, n: int = 1) -> None:
+        pass
+
+NULL_STATS = _NullStats()
+
+# ---- contadores de estructuras ----
+
+def count_parse_tree(tree) -> int:
+    """Nodos del parse tree de ANTLR (reglas + hojas), sin recursión."""
+    n = 0
+    stack = [tree]
+    while stack:
+        node = stack.pop()
+        n += 1
+        for i in range(node.getChildCount()):
+            stack.append(node.getChild(i))
+    return n
+
+def count_ast_nodes(root) -> int:
+    """Nodos del AST (dataclasses de src.ast.nodes), siguiendo campos y listas."""
+    import dataclasses
+    from src.ast.nodes import Node
+    n = 0
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, (list, tuple)):
+            stack.extend(node)
+            continue
+        if not isinstance(node, Node):
+            continue
+        n += 1
+        for f in dataclasses.fields(node):
+            v = getattr(node, f.name)
+            if isinstance(v, (Node, list, tuple)):
+                stack.append(v)
+    return n